@@ -1,4 +1,8 @@
+from django import forms
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connection
+from django.utils.functional import cached_property
 
 from air_service.models import (
     Country,
@@ -15,23 +19,147 @@ from air_service.models import (
 )
 
 
-# class TicketInLine(admin.TabularInline):
-#     model = Ticket
-#     extra = 1
-#
+class EstimatedCountPaginator(Paginator):
+    """
+    Uses the planner's row estimate instead of COUNT(*) for unfiltered
+    changelists of large tables.
+    """
 
-# @admin.register(Order)
-# class OrderAdmin(admin.ModelAdmin):
-#     inlines = (TicketInLine,)
+    exact_count_limit = 10000
 
+    @cached_property
+    def count(self):
+        query = self.object_list.query
+        if not query.where and connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT reltuples FROM pg_class WHERE relname = %s",
+                    [self.object_list.model._meta.db_table],
+                )
+                row = cursor.fetchone()
+            if row and row[0] > self.exact_count_limit:
+                return int(row[0])
+        return super().count
 
-admin.site.register(Country)
-admin.site.register(City)
-admin.site.register(Airport)
-admin.site.register(AirplaneType)
-admin.site.register(Airplane)
-admin.site.register(Route)
-admin.site.register(Crew)
-admin.site.register(Flight)
-admin.site.register(Ticket)
-admin.site.register(Order)
+
+class LargeTableAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+@admin.register(Country)
+class CountryAdmin(admin.ModelAdmin):
+    search_fields = ("country_name",)
+
+
+@admin.register(City)
+class CityAdmin(admin.ModelAdmin):
+    list_display = ("city_name", "country")
+    list_select_related = ("country",)
+    search_fields = ("city_name", "country__country_name")
+    autocomplete_fields = ("country",)
+
+
+@admin.register(Airport)
+class AirportAdmin(admin.ModelAdmin):
+    list_display = ("airport_name", "city")
+    list_select_related = ("city",)
+    search_fields = ("airport_name", "city__city_name")
+    autocomplete_fields = ("city",)
+
+
+@admin.register(AirplaneType)
+class AirplaneTypeAdmin(admin.ModelAdmin):
+    search_fields = ("type_name",)
+
+
+@admin.register(Airplane)
+class AirplaneAdmin(admin.ModelAdmin):
+    list_display = (
+        "airplane_name",
+        "airplane_type",
+        "rows",
+        "seats_in_row",
+        "capacity",
+    )
+    list_select_related = ("airplane_type",)
+    list_filter = ("airplane_type",)
+    search_fields = ("airplane_name", "airplane_type__type_name")
+    autocomplete_fields = ("airplane_type",)
+
+
+@admin.register(Route)
+class RouteAdmin(admin.ModelAdmin):
+    list_display = ("__str__", "distance")
+    list_select_related = ("source", "destination")
+    search_fields = ("source__airport_name", "destination__airport_name")
+    autocomplete_fields = ("source", "destination")
+
+
+@admin.register(Crew)
+class CrewAdmin(admin.ModelAdmin):
+    search_fields = ("first_name", "last_name")
+
+
+@admin.register(Flight)
+class FlightAdmin(LargeTableAdmin):
+    list_display = (
+        "id",
+        "route",
+        "airplane",
+        "departure_datetime",
+        "arrival_datetime",
+    )
+    list_select_related = ("route__source", "route__destination", "airplane")
+    list_filter = (("departure_datetime", admin.DateFieldListFilter),)
+    search_fields = (
+        "route__source__airport_name",
+        "route__destination__airport_name",
+        "airplane__airplane_name",
+    )
+    autocomplete_fields = ("route", "airplane", "crew")
+
+
+@admin.register(Ticket)
+class TicketAdmin(LargeTableAdmin):
+    list_display = ("id", "seat_row", "seat_number", "flight", "order")
+    list_select_related = (
+        "flight__route__source",
+        "flight__route__destination",
+        "order__user",
+    )
+    raw_id_fields = ("flight", "order")
+    search_fields = ("=order__id", "=flight__id")
+
+
+class TicketInLine(admin.TabularInline):
+    model = Ticket
+    extra = 0
+    fields = ("seat_row", "seat_number", "flight", "flight_description")
+    readonly_fields = ("flight_description",)
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related(
+            "flight__route__source",
+            "flight__route__destination",
+        )
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        # A raw ID widget would look up every row's flight label again.
+        if db_field.name == "flight":
+            kwargs["widget"] = forms.TextInput
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+    @admin.display(description="Flight details")
+    def flight_description(self, obj):
+        return obj.flight if obj.flight_id else "-"
+
+
+@admin.register(Order)
+class OrderAdmin(LargeTableAdmin):
+    inlines = (TicketInLine,)
+    list_display = ("id", "user", "order_created_at")
+    list_select_related = ("user",)
+    list_filter = (("order_created_at", admin.DateFieldListFilter),)
+    raw_id_fields = ("user",)
+    search_fields = ("=id", "user__username")
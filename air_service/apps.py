@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class AirServiceConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "air_service"
+
+    def ready(self):
+        import air_service.autocomplete  # noqa: F401
+        import air_service.changes  # noqa: F401
+        import air_service.deletion  # noqa: F401
+        import air_service.geo  # noqa: F401
+        import air_service.slow_queries  # noqa: F401
+        import air_service.summaries  # noqa: F401
@@ -0,0 +1,148 @@
+import bisect
+import heapq
+import unicodedata
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from air_service.indexes import VersionedIndex, bump_version
+from air_service.models import Airport, City, Country
+
+# Ties between equally good matches are broken in this order.
+KINDS = ("airport", "city", "country")
+# Prefixes this short match a large part of the index, their results are
+# kept once computed.
+MEMOIZED_PREFIX_LENGTH = 2
+
+
+def normalize(text: str) -> str:
+    """Casefold, drop accents and collapse whitespace."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return " ".join(
+        "".join(
+            char for char in decomposed if not unicodedata.combining(char)
+        ).split()
+    )
+
+
+@receiver(post_save, sender=Airport)
+@receiver(post_delete, sender=Airport)
+@receiver(post_save, sender=City)
+@receiver(post_delete, sender=City)
+@receiver(post_save, sender=Country)
+@receiver(post_delete, sender=Country)
+def invalidate_autocomplete(sender, **kwargs):
+    transaction.on_commit(
+        lambda: bump_version(AutocompleteIndex.version_key)
+    )
+
+
+def load_entries():
+    entries = [
+        (
+            "airport",
+            airport_id,
+            name,
+            f"{city_name}, {country_name}",
+        )
+        for airport_id, name, city_name, country_name in (
+            Airport.objects.values_list(
+                "id",
+                "airport_name",
+                "city__city_name",
+                "city__country__country_name",
+            )
+        )
+    ]
+    entries += [
+        ("city", city_id, name, country_name)
+        for city_id, name, country_name in City.objects.values_list(
+            "id", "city_name", "country__country_name"
+        )
+    ]
+    entries += [
+        ("country", country_id, name, "")
+        for country_id, name in Country.objects.values_list(
+            "id", "country_name"
+        )
+    ]
+    return entries
+
+
+class PrefixIndex:
+    """
+    Sorted array of normalized names searched with bisect.
+
+    Every name is indexed from the start of each of its words, so "lviv"
+    finds "Danylo Halytskyi Lviv International" as well as "Lviv".
+    """
+
+    def __init__(self, entries):
+        self.entries = entries
+        keyed = []
+        for position, (_, _, name, _) in enumerate(entries):
+            key = normalize(name)
+            words = key.split(" ")
+            offset = 0
+            for word_number, word in enumerate(words):
+                keyed.append((key[offset:], word_number, position))
+                offset += len(word) + 1
+        keyed.sort()
+        self.keys = [key for key, _, _ in keyed]
+        self.postings = [
+            (word_number, position) for _, word_number, position in keyed
+        ]
+        self._memoized = {}
+
+    def search(self, query, limit):
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        if len(prefix) > MEMOIZED_PREFIX_LENGTH:
+            return self._search(prefix, limit)
+        results = self._memoized.get((prefix, limit))
+        if results is None:
+            results = self._search(prefix, limit)
+            self._memoized[prefix, limit] = results
+        return results
+
+    def _search(self, prefix, limit):
+        start = bisect.bisect_left(self.keys, prefix)
+        end = bisect.bisect_right(self.keys, prefix + "\U0010ffff", start)
+        best = {}
+        for index in range(start, end):
+            word_number, position = self.postings[index]
+            kind, _, name, _ = self.entries[position]
+            if word_number:
+                match = 2
+            else:
+                match = 0 if self.keys[index] == prefix else 1
+            rank = (match, KINDS.index(kind), len(name), name)
+            if position not in best or rank < best[position]:
+                best[position] = rank
+        return [
+            self.entries[position]
+            for _, position in heapq.nsmallest(
+                limit, ((rank, position) for position, rank in best.items())
+            )
+        ]
+
+
+class AutocompleteIndex(VersionedIndex):
+    version_key = "autocomplete_version"
+    settings_name = "AUTOCOMPLETE"
+
+    def build(self):
+        return PrefixIndex(load_entries())
+
+    def search(self, query, limit):
+        return [
+            {"type": kind, "id": entry_id, "name": name, "detail": detail}
+            for kind, entry_id, name, detail in self.get().search(
+                query, limit
+            )
+        ]
+
+
+autocomplete_index = AutocompleteIndex()
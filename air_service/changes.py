@@ -0,0 +1,238 @@
+import logging
+import os
+import threading
+import time
+from datetime import timedelta
+
+import psycopg
+from django.conf import settings
+from django.db import connection
+from django.db.models import Count, F, Max
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from air_service.models import Flight, SeatInventoryEvent
+from air_service.signals import flights_deleted, tickets_changed
+
+logger = logging.getLogger(__name__)
+
+# Notified by the trigger that assigns feed positions at commit, with the
+# position as payload.
+CHANNEL = "seat_inventory"
+
+
+@receiver(tickets_changed)
+def record_seat_changes(sender, order_id, deltas, **kwargs):
+    available = dict(
+        Flight.objects.filter(id__in=deltas)
+        .annotate(
+            tickets_available=F("airplane__capacity") - Count("tickets")
+        )
+        .values_list("id", "tickets_available")
+    )
+    SeatInventoryEvent.objects.bulk_create(
+        SeatInventoryEvent(
+            flight_id=flight_id,
+            order_id=order_id,
+            seats_delta=delta,
+            tickets_available=available.get(flight_id, 0),
+        )
+        for flight_id, delta in sorted(deltas.items())
+    )
+
+
+def record_flights_deleted(flight_ids):
+    SeatInventoryEvent.objects.bulk_create(
+        SeatInventoryEvent(
+            flight_id=flight_id,
+            seats_delta=0,
+            tickets_available=0,
+            flight_deleted=True,
+        )
+        for flight_id in sorted(flight_ids)
+    )
+
+
+# Streams and long-polling clients of a deleted flight are told it is gone,
+# however it went.
+@receiver(post_delete, sender=Flight)
+def record_flight_deleted(sender, instance, **kwargs):
+    record_flights_deleted([instance.pk])
+
+
+@receiver(flights_deleted)
+def record_cascaded_flights_deleted(sender, flight_ids, **kwargs):
+    record_flights_deleted(flight_ids)
+
+
+def events_since(cursor, limit, flight_id=None):
+    events = SeatInventoryEvent.objects.filter(position__gt=cursor)
+    if flight_id is not None:
+        events = events.filter(flight_id=flight_id)
+    return list(events.order_by("position")[:limit])
+
+
+def latest_cursor():
+    return (
+        SeatInventoryEvent.objects.aggregate(cursor=Max("position"))["cursor"]
+        or 0
+    )
+
+
+def listen_connection_params():
+    """Parameters for a dedicated psycopg connection that runs LISTEN."""
+    params = connection.get_connection_params()
+    return {
+        key: params[key]
+        for key in ("dbname", "user", "password", "host", "port")
+        if params.get(key)
+    }
+
+
+class ChangeListener:
+    """
+    Per-process LISTEN connection that wakes long-polling requests when a
+    booking commits, instead of each request polling the table.
+    """
+
+    reconnect_delay = 1
+    # How often the thread checks whether it was asked to stop.
+    poll_interval = 1
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._latest = 0
+        self._waiters = 0
+        self._thread = None
+        self._stopping = threading.Event()
+
+    def ensure_started(self):
+        with self._condition:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopping.clear()
+                self._thread = threading.Thread(
+                    target=self._listen,
+                    name="seat-inventory-listener",
+                    daemon=True,
+                )
+                self._thread.start()
+
+    def stop(self):
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def acquire_waiter(self):
+        """
+        Take one of the CHANGE_FEED["MAX_WAITERS"] slots of the process,
+        return False when they are all taken.
+        """
+        with self._condition:
+            if self._waiters >= settings.CHANGE_FEED["MAX_WAITERS"]:
+                return False
+            self._waiters += 1
+            return True
+
+    def release_waiter(self):
+        with self._condition:
+            self._waiters -= 1
+
+    def wait(self, cursor, timeout):
+        """
+        Wait until an event after `cursor` commits or `timeout` passes and
+        return the latest committed event id seen.
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._latest > cursor, timeout)
+            return self._latest
+
+    def _listen(self):
+        while not self._stopping.is_set():
+            try:
+                with psycopg.connect(
+                    **listen_connection_params(), autocommit=True
+                ) as listen_connection:
+                    listen_connection.execute(f"LISTEN {CHANNEL}")
+                    while not self._stopping.is_set():
+                        for notify in listen_connection.notifies(
+                            timeout=self.poll_interval
+                        ):
+                            with self._condition:
+                                self._latest = max(
+                                    self._latest, int(notify.payload)
+                                )
+                                self._condition.notify_all()
+            except psycopg.Error:
+                logger.exception("Seat inventory listener disconnected")
+                self._stopping.wait(self.reconnect_delay)
+
+
+_listener = ChangeListener()
+
+
+def _reset_listener():
+    # The listener thread doesn't survive fork(), each worker starts its own.
+    global _listener
+    _listener = ChangeListener()
+
+
+def stop_listener():
+    _listener.stop()
+
+
+os.register_at_fork(after_in_child=_reset_listener)
+
+
+def can_wait(request):
+    """
+    Whether `request` may block its worker waiting for events.
+
+    A sync worker serves one request at a time, waiting there would stall
+    every other client of the worker.
+    """
+    return request.META.get("wsgi.multithread", False)
+
+
+def acquire_waiter():
+    return _listener.acquire_waiter()
+
+
+def release_waiter():
+    _listener.release_waiter()
+
+
+def wait_for_events(cursor, timeout, flight_id=None):
+    """
+    Return events after `cursor`, waiting up to `timeout` seconds when
+    there are none and a waiter slot is free.
+    """
+    if timeout <= 0 or not acquire_waiter():
+        return events_since(
+            cursor, settings.CHANGE_FEED["MAX_EVENTS"], flight_id
+        )
+    try:
+        return poll_events(cursor, timeout, flight_id)
+    finally:
+        release_waiter()
+
+
+def poll_events(cursor, timeout, flight_id=None):
+    """`wait_for_events` for callers already holding a waiter slot."""
+    limit = settings.CHANGE_FEED["MAX_EVENTS"]
+    _listener.ensure_started()
+    events = events_since(cursor, limit, flight_id)
+    deadline = time.monotonic() + timeout
+    seen = cursor
+    while not events and time.monotonic() < deadline:
+        seen = _listener.wait(seen, deadline - time.monotonic())
+        events = events_since(cursor, limit, flight_id)
+    return events
+
+
+def purge_old_events() -> int:
+    retention = timedelta(days=settings.CHANGE_FEED["RETENTION_DAYS"])
+    deleted, _ = SeatInventoryEvent.objects.filter(
+        created_at__lt=timezone.now() - retention
+    ).delete()
+    return deleted
@@ -0,0 +1,117 @@
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.db.models.signals import post_delete, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from air_service.models import Airplane, Deletion, Flight, Route, Ticket
+from air_service.signals import flights_deleted
+from jobs.tasks import enqueue, enqueue_on_commit, task
+
+TARGETS = {
+    Deletion.Target.ROUTE: Route,
+    Deletion.Target.AIRPLANE: Airplane,
+}
+
+
+def flights_of(target: str, target_id: int):
+    return Flight.objects.filter(**{f"{target}_id": target_id})
+
+
+def being_deleted(route_ids, airplane_ids) -> bool:
+    """
+    Whether a background deletion is running for any of the routes or
+    airplanes, their flights take no new flights or tickets meanwhile.
+    """
+    return Deletion.objects.filter(
+        Q(target=Deletion.Target.ROUTE, target_id__in=route_ids)
+        | Q(target=Deletion.Target.AIRPLANE, target_id__in=airplane_ids),
+        status=Deletion.Status.RUNNING,
+    ).exists()
+
+
+def delete_flights(flight_ids: list) -> int:
+    """
+    Delete flights in one statement without loading them, the database
+    cascades to their tickets and crew assignments.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {connection.ops.quote_name(Flight._meta.db_table)} "
+            f"WHERE id = ANY(%s)",
+            [flight_ids],
+        )
+        deleted = cursor.rowcount
+    flights_deleted.send(sender=Flight, flight_ids=flight_ids)
+    return deleted
+
+
+@transaction.atomic
+def delete_or_schedule(instance):
+    """
+    Delete a route or airplane at once when its flights hold at most
+    `DELETION["SYNC_MAX_TICKETS"]` tickets. Otherwise start a chunked
+    deletion in the background, or join the one running, and return it.
+    """
+    target = instance._meta.model_name
+    limit = settings.DELETION["SYNC_MAX_TICKETS"]
+    tickets = Ticket.objects.filter(**{f"flight__{target}": instance})
+    if tickets[: limit + 1].count() <= limit:
+        instance.delete()
+        return None
+    deletion, created = Deletion.objects.get_or_create(
+        target=target,
+        target_id=instance.pk,
+        status=Deletion.Status.RUNNING,
+        defaults={"total_flights": flights_of(target, instance.pk).count()},
+    )
+    if created:
+        enqueue_on_commit(delete_next_chunk, deletion_id=deletion.id)
+    return deletion
+
+
+@task
+def delete_next_chunk(deletion_id: int) -> None:
+    """
+    Delete the next `DELETION["CHUNK_SIZE"]` flights and queue the next
+    chunk, each commits on its own. The object goes once none are left.
+    """
+    deletion = Deletion.objects.select_for_update().get(pk=deletion_id)
+    if deletion.status == Deletion.Status.DONE:
+        return
+    flight_ids = list(
+        flights_of(deletion.target, deletion.target_id)
+        .order_by("id")
+        .values_list("id", flat=True)[: settings.DELETION["CHUNK_SIZE"]]
+    )
+    if flight_ids:
+        deletion.deleted_flights += delete_flights(flight_ids)
+        deletion.save(update_fields=["deleted_flights"])
+        # Queued with this chunk, so a failed chunk is retried instead.
+        enqueue(delete_next_chunk, deletion_id=deletion.id)
+        return
+    TARGETS[deletion.target].objects.filter(pk=deletion.target_id).delete()
+    deletion.status = Deletion.Status.DONE
+    deletion.finished_at = timezone.now()
+    deletion.save(update_fields=["status", "finished_at"])
+
+
+# Routes and airplanes take their flights with them in the database, the
+# flight ids are collected before the rows go.
+@receiver(pre_delete, sender=Route)
+@receiver(pre_delete, sender=Airplane)
+def collect_cascaded_flights(sender, instance, **kwargs):
+    instance._cascaded_flight_ids = list(
+        flights_of(sender._meta.model_name, instance.pk).values_list(
+            "id", flat=True
+        )
+    )
+
+
+@receiver(post_delete, sender=Route)
+@receiver(post_delete, sender=Airplane)
+def send_cascaded_flights(sender, instance, **kwargs):
+    flight_ids = getattr(instance, "_cascaded_flight_ids", [])
+    if flight_ids:
+        flights_deleted.send(sender=Flight, flight_ids=flight_ids)
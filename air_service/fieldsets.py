@@ -0,0 +1,213 @@
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+
+def parse_paths(value):
+    if value is None:
+        return None
+    return {path.strip() for path in value.split(",") if path.strip()}
+
+
+def nested_paths(paths, name):
+    prefix = f"{name}."
+    return {path[len(prefix):] for path in paths if path.startswith(prefix)}
+
+
+class Fieldset:
+    """
+    Fields and relations requested with `?fields=` and `?expand=`.
+
+    Both take comma separated names, dotted names reach into nested
+    serializers (`?expand=tickets.flight`). `None` means the parameter was
+    not given: every field is returned and every relation stays expanded.
+    """
+
+    def __init__(self, fields=None, expand=None):
+        self.fields = fields
+        self.expand = expand
+
+    @classmethod
+    def from_query_params(cls, query_params):
+        return cls(
+            fields=parse_paths(query_params.get("fields")),
+            expand=parse_paths(query_params.get("expand")),
+        )
+
+    def includes(self, name):
+        return self.fields is None or any(
+            path == name or path.startswith(f"{name}.")
+            for path in self.fields
+        )
+
+    def expands(self, name):
+        return self.expand is None or any(
+            path == name or path.startswith(f"{name}.")
+            for path in self.expand
+        )
+
+    def nested(self, name):
+        fields = None
+        if self.fields is not None:
+            fields = nested_paths(self.fields, name) or None
+        expand = None
+        if self.expand is not None:
+            expand = nested_paths(self.expand, name)
+        return Fieldset(fields=fields, expand=expand)
+
+
+class Expandable:
+    """
+    A relation that is nested with `serializer` when expanded and is
+    collapsed to primary keys otherwise.
+    """
+
+    def __init__(self, serializer, select=(), many=False):
+        self.serializer = serializer
+        self.select = select
+        self.many = many
+
+    def collapsed(self):
+        return serializers.PrimaryKeyRelatedField(
+            read_only=True, many=self.many
+        )
+
+
+def prefix_lookups(prefix, select, prefetch):
+    return (
+        [f"{prefix}__{path}" for path in select],
+        [
+            Prefetch(
+                f"{prefix}__{lookup.prefetch_through}",
+                queryset=lookup.queryset,
+            )
+            for lookup in prefetch
+        ],
+    )
+
+
+def optimize(queryset, select, prefetch):
+    # An empty select_related() would follow every foreign key.
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    return queryset
+
+
+class SparseFieldsetMixin:
+    """
+    Trims serializer output to the requested fieldset.
+
+    `expandable_fields` maps relation names to `Expandable`, and
+    `related_fields` lists the `select_related` lookups other fields read
+    from, so `get_related_lookups` can tell the viewset exactly which
+    relations the response needs.
+    """
+
+    expandable_fields = {}
+    related_fields = {}
+
+    def get_fieldset(self):
+        path = []
+        node = self
+        while getattr(node, "parent", None) is not None:
+            if node.field_name:
+                path.append(node.field_name)
+            node = node.parent
+        fieldset = self.context.get("fieldset") or Fieldset()
+        for name in reversed(path):
+            fieldset = fieldset.nested(name)
+        return fieldset
+
+    def get_fields(self):
+        fields = super().get_fields()
+        fieldset = self.get_fieldset()
+        for name in list(fields):
+            if not fieldset.includes(name):
+                del fields[name]
+            elif (
+                name in self.expandable_fields
+                and not fieldset.expands(name)
+            ):
+                fields[name] = self.expandable_fields[name].collapsed()
+        return fields
+
+    @classmethod
+    def get_related_lookups(cls, fieldset):
+        """Return the `select_related` and `prefetch_related` lookups."""
+        select = []
+        prefetch = []
+        for name in cls.Meta.fields:
+            if not fieldset.includes(name):
+                continue
+            select.extend(cls.related_fields.get(name, ()))
+            expandable = cls.expandable_fields.get(name)
+            if expandable is None:
+                continue
+            related_model = cls.Meta.model._meta.get_field(
+                name
+            ).related_model
+            if not fieldset.expands(name):
+                if expandable.many:
+                    prefetch.append(
+                        Prefetch(
+                            name,
+                            queryset=related_model.objects.only("pk"),
+                        )
+                    )
+                continue
+            nested_select, nested_prefetch = (
+                expandable.serializer.get_related_lookups(
+                    fieldset.nested(name)
+                )
+                if issubclass(expandable.serializer, SparseFieldsetMixin)
+                else ((), ())
+            )
+            nested_select = [*expandable.select, *nested_select]
+            if expandable.many:
+                prefetch.append(
+                    Prefetch(
+                        name,
+                        queryset=optimize(
+                            related_model.objects.all(),
+                            nested_select,
+                            nested_prefetch,
+                        ),
+                    )
+                )
+            else:
+                select.append(name)
+                nested_select, nested_prefetch = prefix_lookups(
+                    name, nested_select, nested_prefetch
+                )
+                select.extend(nested_select)
+                prefetch.extend(nested_prefetch)
+        return select, prefetch
+
+    @classmethod
+    def optimize_queryset(cls, queryset, fieldset):
+        return optimize(queryset, *cls.get_related_lookups(fieldset))
+
+
+class SparseFieldsetViewMixin:
+    """Reads `?fields=` and `?expand=` for viewsets."""
+
+    def get_fieldset(self):
+        if not hasattr(self, "_fieldset"):
+            self._fieldset = Fieldset.from_query_params(
+                self.request.query_params
+            )
+        return self._fieldset
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["fieldset"] = self.get_fieldset()
+        return context
+
+    def optimize_queryset(self, queryset):
+        serializer_class = self.get_serializer_class()
+        if issubclass(serializer_class, SparseFieldsetMixin):
+            return serializer_class.optimize_queryset(
+                queryset, self.get_fieldset()
+            )
+        return queryset
@@ -0,0 +1,184 @@
+import math
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from air_service.indexes import VersionedIndex, bump_version
+from air_service.models import Airport
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_km(lat1, lon1, lat2, lon2) -> float:
+    """Great-circle distance between two points given in degrees."""
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def airport_distance_km(source: Airport, destination: Airport):
+    """Great-circle distance, None unless both airports are located."""
+    if source.latitude is None or destination.latitude is None:
+        return None
+    return haversine_km(
+        source.latitude,
+        source.longitude,
+        destination.latitude,
+        destination.longitude,
+    )
+
+
+def haversine_km_arrays(lat1, lon1, lat2, lon2):
+    """`haversine_km` over NumPy arrays, broadcasting like any ufunc."""
+    # Only the bulk commands need NumPy, API workers never import it.
+    import numpy as np
+
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def distance_matrix(latitudes, longitudes, block_size=1024):
+    """
+    All-pairs great-circle distances in km.
+
+    Rows are computed in blocks, so the temporaries stay at
+    `block_size * n` values instead of `n * n`.
+    """
+    import numpy as np
+
+    latitudes = np.radians(np.asarray(latitudes, dtype=np.float64))
+    longitudes = np.radians(np.asarray(longitudes, dtype=np.float64))
+    cos_latitudes = np.cos(latitudes)
+    size = len(latitudes)
+    matrix = np.empty((size, size), dtype=np.float64)
+    for start in range(0, size, block_size):
+        stop = min(start + block_size, size)
+        block = matrix[start:stop]
+        # The haversine of `haversine_km_arrays`, written into the output
+        # block in place to avoid allocating a temporary per term.
+        np.subtract(latitudes[start:stop, None], latitudes[None, :], out=block)
+        np.sin(block / 2, out=block)
+        np.square(block, out=block)
+        across = np.sin(
+            (longitudes[start:stop, None] - longitudes[None, :]) / 2
+        )
+        np.square(across, out=across)
+        across *= cos_latitudes[start:stop, None]
+        across *= cos_latitudes[None, :]
+        block += across
+        np.minimum(block, 1.0, out=block)
+        np.sqrt(block, out=block)
+        np.arcsin(block, out=block)
+        block *= 2 * EARTH_RADIUS_KM
+    return matrix
+
+
+class AirportGrid:
+    """
+    Located airports bucketed into cells of `cell_degrees`.
+
+    A radius search only measures the airports of the cells that can
+    intersect the circle.
+    """
+
+    def __init__(self, airports, cell_degrees):
+        self.cell_degrees = cell_degrees
+        self.columns = math.ceil(360 / cell_degrees)
+        self.cells = defaultdict(list)
+        for airport in airports:
+            _, _, latitude, longitude = airport
+            self.cells[self.cell_of(latitude, longitude)].append(airport)
+
+    def row_of(self, latitude):
+        return math.floor((latitude + 90) / self.cell_degrees)
+
+    def column_of(self, longitude):
+        return (
+            math.floor((longitude + 180) / self.cell_degrees) % self.columns
+        )
+
+    def cell_of(self, latitude, longitude):
+        return self.row_of(latitude), self.column_of(longitude)
+
+    def candidate_columns(self, latitude, longitude, angle):
+        # Widest longitude difference on a circle of angular radius
+        # `angle`, the circle covers a pole when there is none.
+        sin_angle = math.sin(angle)
+        cos_latitude = math.cos(math.radians(latitude))
+        if angle >= math.pi / 2 or sin_angle >= cos_latitude:
+            return range(self.columns)
+        span = math.degrees(math.asin(sin_angle / cos_latitude))
+        first = math.floor((longitude - span + 180) / self.cell_degrees)
+        last = math.floor((longitude + span + 180) / self.cell_degrees)
+        if last - first + 1 >= self.columns:
+            return range(self.columns)
+        return {column % self.columns for column in range(first, last + 1)}
+
+    def nearby(self, latitude, longitude, radius_km, limit):
+        """`(distance, airport)` pairs within the radius, closest first."""
+        angle = radius_km / EARTH_RADIUS_KM
+        span = math.degrees(angle)
+        rows = range(
+            self.row_of(max(latitude - span, -90)),
+            self.row_of(min(latitude + span, 90)) + 1,
+        )
+        columns = self.candidate_columns(latitude, longitude, angle)
+        found = []
+        for row in rows:
+            for column in columns:
+                for airport in self.cells.get((row, column), ()):
+                    distance = haversine_km(
+                        latitude, longitude, airport[2], airport[3]
+                    )
+                    if distance <= radius_km:
+                        found.append((distance, airport))
+        found.sort(key=lambda item: item[0])
+        return found[:limit]
+
+
+class AirportGridIndex(VersionedIndex):
+    version_key = "airport_grid_version"
+    settings_name = "GEO"
+
+    def build(self):
+        return AirportGrid(
+            Airport.objects.filter(latitude__isnull=False).values_list(
+                "id", "airport_name", "latitude", "longitude"
+            ),
+            settings.GEO["GRID_CELL_DEGREES"],
+        )
+
+    def nearby(self, latitude, longitude, radius_km, limit):
+        return [
+            {
+                "id": airport_id,
+                "airport_name": name,
+                "latitude": airport_latitude,
+                "longitude": airport_longitude,
+                "distance": round(distance, 1),
+            }
+            for distance, (
+                airport_id, name, airport_latitude, airport_longitude
+            ) in self.get().nearby(latitude, longitude, radius_km, limit)
+        ]
+
+
+airport_grid = AirportGridIndex()
+
+
+@receiver(post_save, sender=Airport)
+@receiver(post_delete, sender=Airport)
+def invalidate_airport_grid(sender, **kwargs):
+    transaction.on_commit(
+        lambda: bump_version(AirportGridIndex.version_key)
+    )
@@ -0,0 +1,147 @@
+import functools
+import hashlib
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import exceptions, status
+from rest_framework.response import Response
+
+from air_service.models import IdempotencyKey
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+
+class IdempotencyKeyInUse(exceptions.APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = (
+        "A request with this Idempotency-Key is still in progress, "
+        "retry later."
+    )
+    default_code = "idempotency_key_in_use"
+
+    def __init__(self, detail=None, code=None):
+        super().__init__(detail, code)
+        # Sent as Retry-After by the DRF exception handler.
+        self.wait = settings.IDEMPOTENCY["RETRY_AFTER"]
+
+
+class IdempotencyKeyMismatch(exceptions.APIException):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    default_detail = (
+        "This Idempotency-Key was already used for a different request."
+    )
+    default_code = "idempotency_key_mismatch"
+
+
+def request_fingerprint(request) -> str:
+    payload = json.dumps(request.data, sort_keys=True, default=str)
+    return hashlib.sha256(
+        f"{request.method} {request.path}\n{payload}".encode()
+    ).hexdigest()
+
+
+def claim(user, key, fingerprint):
+    """
+    Return the record for `key`. It is complete when the request already
+    ran, otherwise this request now owns it.
+
+    A request with the same key still in flight gets a 409 at once rather
+    than waiting on a worker thread.
+    """
+    config = settings.IDEMPOTENCY
+    while True:
+        now = timezone.now()
+        record = IdempotencyKey.objects.filter(
+            user=user, key=key, expires_at__gt=now
+        ).first()
+        if record is None:
+            IdempotencyKey.objects.filter(user=user, key=key).delete()
+            try:
+                with transaction.atomic():
+                    return IdempotencyKey.objects.create(
+                        user=user,
+                        key=key,
+                        fingerprint=fingerprint,
+                        locked_at=now,
+                        expires_at=now + timedelta(seconds=config["TTL"]),
+                    )
+            except IntegrityError:
+                # Another request claimed the key first, read its record.
+                continue
+
+        if record.fingerprint != fingerprint:
+            raise IdempotencyKeyMismatch()
+        if record.is_complete:
+            return record
+        stale = now - timedelta(seconds=config["LOCK_TIMEOUT"])
+        if record.locked_at <= stale and IdempotencyKey.objects.filter(
+            pk=record.pk, status_code=None, locked_at=record.locked_at
+        ).update(locked_at=now):
+            # The owner died before committing, so it booked nothing.
+            record.locked_at = now
+            return record
+        raise IdempotencyKeyInUse()
+
+
+def idempotent(view_method):
+    """
+    Make a viewset write action safe to retry with an Idempotency-Key.
+
+    The first successful response is stored per user and key in the
+    transaction of the action, retries with the same request get it back
+    without running the action again, and retries arriving while the first
+    request is still running get a 409.
+    """
+
+    @functools.wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key or not request.user.is_authenticated:
+            return view_method(self, request, *args, **kwargs)
+        if len(key) > IdempotencyKey._meta.get_field("key").max_length:
+            raise exceptions.ValidationError(
+                {IDEMPOTENCY_HEADER: "Key is too long."}
+            )
+
+        record = claim(request.user, key, request_fingerprint(request))
+        if record.is_complete:
+            return Response(
+                record.response_body,
+                status=record.status_code,
+                headers={REPLAYED_HEADER: "true"},
+            )
+
+        # Matches nothing once another request took the key over.
+        owned = IdempotencyKey.objects.filter(
+            pk=record.pk, status_code=None, locked_at=record.locked_at
+        )
+        try:
+            with transaction.atomic():
+                response = view_method(self, request, *args, **kwargs)
+                if status.is_success(response.status_code) and not (
+                    owned.update(
+                        status_code=response.status_code,
+                        response_body=response.data,
+                    )
+                ):
+                    # Roll the action back, the new owner runs it.
+                    raise IdempotencyKeyInUse()
+        except Exception:
+            owned.delete()
+            raise
+        if not status.is_success(response.status_code):
+            owned.delete()
+        return response
+
+    return wrapper
+
+
+def purge_expired_keys() -> int:
+    deleted, _ = IdempotencyKey.objects.filter(
+        expires_at__lte=timezone.now()
+    ).delete()
+    return deleted
@@ -0,0 +1,61 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+def bump_version(version_key):
+    """Make every worker rebuild the index on its next version check."""
+    cache.add(version_key, 0, timeout=None)
+    try:
+        cache.incr(version_key)
+    except ValueError:
+        # Evicted between add() and incr(), a missing version also rebuilds.
+        pass
+
+
+class VersionedIndex:
+    """
+    An in-memory index held by each worker.
+
+    It is built on first use and rebuilt when `version_key` in the shared
+    cache changes, which is checked at most every
+    `settings.<settings_name>["VERSION_CHECK_INTERVAL"]` seconds.
+    """
+
+    version_key = None
+    settings_name = None
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._index = None
+        self._version = None
+        self._checked_at = None
+
+    def build(self):
+        raise NotImplementedError
+
+    def get(self):
+        interval = getattr(settings, self.settings_name)[
+            "VERSION_CHECK_INTERVAL"
+        ]
+        now = time.monotonic()
+        if (
+            self._index is not None
+            and now - self._checked_at < interval
+        ):
+            return self._index
+        with self._lock:
+            version = cache.get(self.version_key)
+            if self._index is None or version != self._version:
+                # The version is read first, changes committed during the
+                # build bump it again and trigger another rebuild.
+                self._index = self.build()
+                self._version = version
+            self._checked_at = now
+            return self._index
+
+    def invalidate(self):
+        with self._lock:
+            self._index = None
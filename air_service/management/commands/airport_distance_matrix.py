@@ -0,0 +1,57 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from air_service.geo import distance_matrix
+from air_service.models import Airport
+
+
+class Command(BaseCommand):
+    help = (
+        "Compute the great-circle distance between every pair of located "
+        "airports and report how long it took."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            help="Save the matrix and airport ids to this .npz file.",
+        )
+        parser.add_argument(
+            "--synthetic",
+            type=int,
+            metavar="N",
+            help="Use N random points instead of the airports.",
+        )
+
+    def handle(self, *args, **options):
+        import numpy as np
+
+        if options["synthetic"]:
+            generator = np.random.default_rng(0)
+            size = options["synthetic"]
+            ids = np.arange(size)
+            latitudes = np.degrees(np.arcsin(generator.uniform(-1, 1, size)))
+            longitudes = generator.uniform(-180, 180, size)
+        else:
+            rows = list(
+                Airport.objects.filter(latitude__isnull=False)
+                .order_by("id")
+                .values_list("id", "latitude", "longitude")
+            )
+            if not rows:
+                raise CommandError("No airport has coordinates.")
+            ids, latitudes, longitudes = (
+                np.array(column) for column in zip(*rows)
+            )
+
+        started = time.perf_counter()
+        matrix = distance_matrix(latitudes, longitudes)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"{len(ids)}x{len(ids)} distances in {elapsed:.2f}s "
+            f"({matrix.nbytes / 2 ** 20:.0f} MiB)"
+        )
+        if options["output"]:
+            np.savez(options["output"], ids=ids, distances=matrix)
+            self.stdout.write(f"Saved to {options['output']}")
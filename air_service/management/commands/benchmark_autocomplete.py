@@ -0,0 +1,70 @@
+import random
+import statistics
+import string
+import time
+
+from django.core.management.base import BaseCommand
+
+from air_service.autocomplete import PrefixIndex
+
+
+def build_entries(count, seed):
+    """Random airport-like names, no database needed."""
+    rng = random.Random(seed)
+
+    def word():
+        return "".join(
+            rng.choices(string.ascii_lowercase, k=rng.randint(3, 10))
+        ).capitalize()
+
+    return [
+        (
+            "airport",
+            number,
+            " ".join(word() for _ in range(rng.randint(1, 4))),
+            "",
+        )
+        for number in range(count)
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        "Report build time of the autocomplete prefix index and the "
+        "latency of searches for prefixes of its names."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--names",
+            type=int,
+            default=50000,
+            help="Number of names in the index.",
+        )
+        parser.add_argument("--searches", type=int, default=10000)
+        parser.add_argument("--limit", type=int, default=10)
+
+    def handle(self, *args, **options):
+        entries = build_entries(options["names"], seed=1)
+        started = time.perf_counter()
+        index = PrefixIndex(entries)
+        build = time.perf_counter() - started
+        self.stdout.write(
+            f"Indexed {len(entries)} names ({len(index.keys)} keys) "
+            f"in {build * 1000:.0f} ms"
+        )
+
+        rng = random.Random(2)
+        for length in (1, 2, 3, 5):
+            timings = []
+            for _ in range(options["searches"]):
+                name = rng.choice(entries)[2]
+                query = name[:length]
+                started = time.perf_counter()
+                index.search(query, options["limit"])
+                timings.append((time.perf_counter() - started) * 1e6)
+            timings.sort()
+            self.stdout.write(
+                f"{length} chars: p50 {statistics.median(timings):.0f} us "
+                f"p99 {timings[int((len(timings) - 1) * 0.99)]:.0f} us"
+            )
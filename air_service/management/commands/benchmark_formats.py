@@ -0,0 +1,92 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from air_service.middleware import available_encodings, compress
+from air_service.models import Airplane, Airport, Flight, Route
+from air_service.renderers import MessagePackRenderer
+from air_service.serializers import FlightListSerializer
+
+
+def build_flights(count):
+    """Unsaved flights with their relations attached, no database needed."""
+    departure = datetime(2025, 12, 10, tzinfo=timezone.utc)
+    flights = []
+    for number in range(count):
+        route = Route(
+            source=Airport(airport_name=f"Airport {number % 40}"),
+            destination=Airport(airport_name=f"Airport {number % 40 + 1}"),
+            distance=500 + number,
+        )
+        flight = Flight(
+            id=number + 1,
+            route=route,
+            airplane=Airplane(
+                airplane_name=f"Airplane {number % 25}",
+                rows=30,
+                seats_in_row=6,
+            ),
+            departure_datetime=departure + timedelta(minutes=15 * number),
+            arrival_datetime=departure + timedelta(minutes=15 * number + 90),
+        )
+        flight.tickets_available = 180 - number % 180
+        flights.append(flight)
+    return flights
+
+
+class Command(BaseCommand):
+    help = (
+        "Report payload size and encode time of a flight list page for "
+        "each response format and content coding."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--flights",
+            type=int,
+            default=500,
+            help="Number of flights on the page.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=20,
+            help="Number of encodes to average over.",
+        )
+
+    def handle(self, *args, **options):
+        data = {
+            "count": options["flights"],
+            "next": None,
+            "previous": None,
+            "results": FlightListSerializer(
+                build_flights(options["flights"]), many=True
+            ).data,
+        }
+        renderers = (
+            ("json", JSONRenderer()),
+            ("msgpack", MessagePackRenderer()),
+        )
+        self.stdout.write(
+            f"{'format':<10}{'coding':<10}{'bytes':>10}{'encode ms':>12}"
+        )
+        for name, renderer in renderers:
+            for encoding in ("identity", *available_encodings()):
+                size, seconds = self.measure(
+                    renderer, encoding, data, options["repeat"]
+                )
+                self.stdout.write(
+                    f"{name:<10}{encoding:<10}{size:>10}"
+                    f"{seconds * 1000:>12.2f}"
+                )
+
+    @staticmethod
+    def measure(renderer, encoding, data, repeat):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            content = renderer.render(data)
+            if encoding != "identity":
+                content = compress(content, encoding)
+        return len(content), (time.perf_counter() - started) / repeat
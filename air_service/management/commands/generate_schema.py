@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from air_service.schema import code_fingerprint, schema_cache
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate the OpenAPI schema into API_SCHEMA_FILE. Run at build "
+        "time so workers start with a schema that matches the code."
+    )
+
+    def handle(self, *args, **options):
+        schema = schema_cache.load(force=True)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Generated schema with {len(schema['paths'])} paths for "
+                f"code fingerprint {code_fingerprint()[:12]}."
+            )
+        )
@@ -0,0 +1,208 @@
+import asyncio
+import re
+import statistics
+import time
+from collections import Counter
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from air_service.management.commands.measure_serving import memory_kb
+from air_service.models import Flight, Order, Ticket
+
+WORKER_COMMENT = re.compile(rb"^: worker (\d+)$", re.MULTILINE)
+
+
+class StreamClient:
+    """One SSE connection that records its worker and pushed events."""
+
+    def __init__(self):
+        self.worker = None
+        self.connected = asyncio.Event()
+        self.events = []
+        self.heartbeats = 0
+        self.error = None
+
+    async def run(self, host, port, path, token, duration):
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+        except OSError as error:
+            self.error = str(error)
+            self.connected.set()
+            return
+        writer.write(
+            f"GET {path} HTTP/1.1\r\nHost: {host}\r\n"
+            f"Authorization: Bearer {token}\r\n"
+            "Accept: text/event-stream\r\n\r\n".encode()
+        )
+        try:
+            await asyncio.wait_for(self.read(reader), timeout=duration)
+        except asyncio.TimeoutError:
+            pass
+        except (OSError, asyncio.IncompleteReadError) as error:
+            self.error = str(error) or type(error).__name__
+        finally:
+            self.connected.set()
+            writer.close()
+
+    async def read(self, reader):
+        status_line = await reader.readline()
+        if b" 200 " not in status_line:
+            raise OSError(status_line.decode().strip() or "no response")
+        await reader.readuntil(b"\r\n\r\n")
+        while True:
+            # Chunked transfer encoding: size line, chunk, blank line.
+            size = int((await reader.readline()).strip() or b"0", 16)
+            if size == 0:
+                return
+            chunk = await reader.readexactly(size + 2)
+            match = WORKER_COMMENT.search(chunk)
+            if match:
+                self.worker = int(match.group(1))
+            if b"event: snapshot" in chunk:
+                self.connected.set()
+            if b"event: seats" in chunk:
+                self.events.append(time.perf_counter())
+            if b": heartbeat" in chunk:
+                self.heartbeats += 1
+
+
+def worker_rss(pid):
+    # Only known when the server runs on this machine.
+    if Path(f"/proc/{pid}/smaps_rollup").exists():
+        return memory_kb(pid)["rss"]
+    return "-"
+
+
+def free_seat(flight):
+    taken = set(flight.tickets.values_list("seat_row", "seat_number"))
+    for row in range(1, flight.airplane.rows + 1):
+        for seat in range(1, flight.airplane.seats_in_row + 1):
+            if (row, seat) not in taken:
+                return row, seat
+    raise CommandError(f"Flight {flight.id} is sold out.")
+
+
+def book_and_release(flight, user):
+    """Book a seat and return the commit time, then cancel it."""
+    row, seat = free_seat(flight)
+    with transaction.atomic():
+        order = Order.objects.create(user=user)
+        ticket = Ticket.objects.create(
+            order=order, flight=flight, seat_row=row, seat_number=seat
+        )
+    committed = time.perf_counter()
+    ticket.delete()
+    order.delete()
+    return committed
+
+
+class Command(BaseCommand):
+    help = (
+        "Open many seat streams against a running ASGI server (`manage.py "
+        "serve --asgi`), book a seat and report the connections held per "
+        "worker and how fast the booking reached every stream."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("flight", type=int)
+        parser.add_argument("--url", default="http://127.0.0.1:8000")
+        parser.add_argument("--connections", type=int, default=1000)
+        parser.add_argument(
+            "--username",
+            required=True,
+            help="User the streams authenticate as and the seat is "
+                 "booked for.",
+        )
+        parser.add_argument(
+            "--duration",
+            type=float,
+            default=30,
+            help="Seconds to keep the streams open.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            flight = Flight.objects.select_related("airplane").get(
+                pk=options["flight"]
+            )
+            user = get_user_model().objects.get(
+                username=options["username"]
+            )
+        except (Flight.DoesNotExist, get_user_model().DoesNotExist) as e:
+            raise CommandError(str(e))
+        asyncio.run(self.load_test(flight, user, options))
+
+    async def load_test(self, flight, user, options):
+        url = urlsplit(options["url"])
+        path = reverse("air_service:flight-seat-stream", args=[flight.id])
+        token = str(AccessToken.for_user(user))
+        clients = [StreamClient() for _ in range(options["connections"])]
+
+        started = time.perf_counter()
+        tasks = [
+            asyncio.create_task(
+                client.run(
+                    url.hostname,
+                    url.port or 80,
+                    path,
+                    token,
+                    options["duration"],
+                )
+            )
+            for client in clients
+        ]
+        await asyncio.gather(
+            *(client.connected.wait() for client in clients)
+        )
+        connect_time = time.perf_counter() - started
+
+        # Measured while every stream is still open.
+        memory = {
+            client.worker: worker_rss(client.worker)
+            for client in clients
+            if client.worker is not None
+        }
+        committed = await sync_to_async(book_and_release)(flight, user)
+        await asyncio.gather(*tasks)
+        self.report(clients, connect_time, committed, memory)
+
+    def report(self, clients, connect_time, committed, memory):
+        held = [client for client in clients if client.worker is not None]
+        failed = Counter(
+            client.error for client in clients if client.error is not None
+        )
+        self.stdout.write(
+            f"{len(held)}/{len(clients)} streams open after "
+            f"{connect_time:.2f}s"
+        )
+        for error, count in failed.most_common():
+            self.stdout.write(f"  {count} failed: {error}")
+
+        per_worker = Counter(client.worker for client in held)
+        self.stdout.write(f"{'worker':<10}{'streams':>10}{'rss kB':>12}")
+        for worker, count in sorted(per_worker.items()):
+            self.stdout.write(f"{worker:<10}{count:>10}{memory[worker]:>12}")
+
+        latencies = sorted(
+            (client.events[0] - committed) * 1000
+            for client in held
+            if client.events
+        )
+        self.stdout.write(
+            f"Booking reached {len(latencies)}/{len(held)} streams"
+        )
+        if latencies:
+            self.stdout.write(
+                f"Fan-out ms: p50 {statistics.median(latencies):.1f} "
+                f"p99 {latencies[int((len(latencies) - 1) * 0.99)]:.1f} "
+                f"max {latencies[-1]:.1f}"
+            )
+        heartbeats = sum(client.heartbeats for client in held)
+        self.stdout.write(f"Heartbeats received: {heartbeats}")
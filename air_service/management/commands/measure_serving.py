@@ -0,0 +1,129 @@
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def child_pids(pid):
+    children = Path(f"/proc/{pid}/task/{pid}/children")
+    return [int(child) for child in children.read_text().split()]
+
+
+def memory_kb(pid):
+    """Rss, Pss and private memory of a process from smaps_rollup."""
+    values = {}
+    for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines():
+        name, _, rest = line.partition(":")
+        if rest.strip().endswith("kB"):
+            values[name] = int(rest.split()[0])
+    return {
+        "rss": values["Rss"],
+        "pss": values["Pss"],
+        "private": values["Private_Clean"] + values["Private_Dirty"],
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Start `manage.py serve`, report the time until it answers requests "
+        "and the memory of the master and each worker. Linux only."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=4)
+        parser.add_argument("--asgi", action="store_true")
+        parser.add_argument(
+            "--startup-timeout",
+            type=float,
+            default=60,
+            help="Seconds to wait for the server to answer.",
+        )
+
+    def handle(self, *args, **options):
+        if not Path("/proc/self/smaps_rollup").exists():
+            raise CommandError("measure_serving needs Linux /proc.")
+
+        port = free_port()
+        command = [
+            sys.executable,
+            str(Path(settings.BASE_DIR) / "manage.py"),
+            "serve",
+            "--bind", f"127.0.0.1:{port}",
+            "--workers", str(options["workers"]),
+        ]
+        if options["asgi"]:
+            command.append("--asgi")
+
+        started = time.perf_counter()
+        server = subprocess.Popen(
+            command,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            env=os.environ.copy(),
+        )
+        try:
+            startup = self.wait_until_serving(
+                server, port, started, options["startup_timeout"]
+            )
+            workers = self.wait_for_workers(server.pid, options["workers"])
+            self.report(server.pid, workers, startup)
+        finally:
+            server.send_signal(signal.SIGTERM)
+            server.wait(timeout=30)
+
+    @staticmethod
+    def wait_until_serving(server, port, started, timeout):
+        url = f"http://127.0.0.1:{port}/api/v1/"
+        while time.perf_counter() - started < timeout:
+            if server.poll() is not None:
+                raise CommandError("The server exited during startup.")
+            try:
+                urllib.request.urlopen(url, timeout=1)
+            except urllib.error.HTTPError:
+                pass
+            except OSError:
+                time.sleep(0.1)
+                continue
+            return time.perf_counter() - started
+        raise CommandError("The server did not answer in time.")
+
+    @staticmethod
+    def wait_for_workers(pid, count):
+        deadline = time.monotonic() + 10
+        workers = child_pids(pid)
+        while len(workers) < count and time.monotonic() < deadline:
+            time.sleep(0.1)
+            workers = child_pids(pid)
+        return workers
+
+    def report(self, master, workers, startup):
+        self.stdout.write(f"Serving after {startup:.2f}s")
+        self.stdout.write(
+            f"{'process':<12}{'rss kB':>10}{'pss kB':>10}{'private kB':>12}"
+        )
+        processes = [("master", master)] + [
+            (f"worker {pid}", pid) for pid in workers
+        ]
+        total_pss = 0
+        for name, pid in processes:
+            memory = memory_kb(pid)
+            total_pss += memory["pss"]
+            self.stdout.write(
+                f"{name:<12}{memory['rss']:>10}{memory['pss']:>10}"
+                f"{memory['private']:>12}"
+            )
+        self.stdout.write(f"Total pss: {total_pss} kB")
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from air_service.idempotency import purge_expired_keys
+
+
+class Command(BaseCommand):
+    help = "Delete stored idempotency keys whose TTL has passed."
+
+    def handle(self, *args, **options):
+        deleted = purge_expired_keys()
+        self.stdout.write(
+            self.style.SUCCESS(f"Deleted {deleted} expired idempotency keys.")
+        )
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from air_service.changes import purge_old_events
+
+
+class Command(BaseCommand):
+    help = "Delete seat inventory events older than the feed retention."
+
+    def handle(self, *args, **options):
+        deleted = purge_old_events()
+        self.stdout.write(
+            self.style.SUCCESS(f"Deleted {deleted} seat inventory events.")
+        )
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from air_service.summaries import rebuild_all
+
+
+class Command(BaseCommand):
+    help = "Recompute the order history summaries from the tickets."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of orders read and written per batch.",
+        )
+
+    def handle(self, *args, **options):
+        total = rebuild_all(batch_size=options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt summaries for {total} orders.")
+        )
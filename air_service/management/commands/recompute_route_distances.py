@@ -0,0 +1,62 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from air_service.geo import haversine_km_arrays
+from air_service.models import Route
+
+
+class Command(BaseCommand):
+    help = (
+        "Set the distance of every route between located airports to the "
+        "great-circle distance of its airports."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report the routes that would change without saving.",
+        )
+
+    def handle(self, *args, **options):
+        import numpy as np
+
+        rows = list(
+            Route.objects.filter(
+                source__latitude__isnull=False,
+                destination__latitude__isnull=False,
+            ).values_list(
+                "id",
+                "distance",
+                "source__latitude",
+                "source__longitude",
+                "destination__latitude",
+                "destination__longitude",
+            )
+        )
+        if not rows:
+            self.stdout.write("No routes between located airports.")
+            return
+        ids, distances, *coordinates = (
+            np.array(column) for column in zip(*rows)
+        )
+        computed = np.rint(haversine_km_arrays(*coordinates)).astype(int)
+        changed = computed != distances
+
+        routes = [
+            Route(id=route_id, distance=distance)
+            for route_id, distance in zip(
+                ids[changed].tolist(), computed[changed].tolist()
+            )
+        ]
+        if not options["dry_run"]:
+            with transaction.atomic():
+                Route.objects.bulk_update(
+                    routes, ["distance"], batch_size=1000
+                )
+        verb = "Would update" if options["dry_run"] else "Updated"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} {len(routes)} of {len(rows)} route distances."
+            )
+        )
@@ -0,0 +1,236 @@
+import http.client
+import json
+import statistics
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode, urlsplit
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.tokens import AccessToken
+
+from air_service.traffic import body_from_shape
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+def read_records(path):
+    try:
+        with open(path, encoding="utf-8") as file:
+            for line in file:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    # A worker killed mid-write leaves a partial last line.
+                    continue
+    except OSError as error:
+        raise CommandError(str(error))
+
+
+def percentile(values, fraction):
+    return values[int((len(values) - 1) * fraction)]
+
+
+class Replayer:
+    """Sends records over one keep-alive connection per thread."""
+
+    def __init__(self, url, tokens, timeout):
+        self.url = urlsplit(url)
+        self.tokens = tokens
+        self.timeout = timeout
+        self.local = threading.local()
+
+    def connection(self):
+        if getattr(self.local, "connection", None) is None:
+            connection_class = (
+                http.client.HTTPSConnection
+                if self.url.scheme == "https"
+                else http.client.HTTPConnection
+            )
+            self.local.connection = connection_class(
+                self.url.hostname, self.url.port, timeout=self.timeout
+            )
+        return self.local.connection
+
+    def send(self, record, scheduled):
+        lag = time.perf_counter() - scheduled
+        path = record["path"]
+        if record["query"]:
+            path += "?" + urlencode(record["query"], doseq=True)
+        headers = {}
+        token = self.tokens.get(record["user"])
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        body = None
+        if isinstance(record["body"], (dict, list)):
+            body = json.dumps(body_from_shape(record["body"]))
+            headers["Content-Type"] = "application/json"
+
+        started = time.perf_counter()
+        try:
+            connection = self.connection()
+            connection.request(record["method"], path, body, headers)
+            response = connection.getresponse()
+            response.read()
+            status = response.status
+        except (OSError, http.client.HTTPException):
+            self.local.connection = None
+            status = None
+        return status, (time.perf_counter() - started) * 1000, lag
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay traffic recorded by TrafficRecordingMiddleware against a "
+        "running server and report latency percentiles and error rates "
+        "per endpoint."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "file",
+            nargs="?",
+            help="Traffic file, TRAFFIC_RECORDING['FILE'] by default.",
+        )
+        parser.add_argument("--url", default="http://127.0.0.1:8000")
+        parser.add_argument("--concurrency", type=int, default=10)
+        parser.add_argument(
+            "--speed",
+            type=float,
+            default=1.0,
+            help="Time scaling of the recorded gaps, 2 replays twice as "
+                 "fast.",
+        )
+        parser.add_argument(
+            "--rate",
+            type=float,
+            help="Send this many requests per second instead of following "
+                 "the recorded timing.",
+        )
+        parser.add_argument("--limit", type=int)
+        parser.add_argument(
+            "--as",
+            dest="users",
+            action="append",
+            default=[],
+            metavar="CLASS=USERNAME",
+            help="Replay records of a user class (user, staff) as this "
+                 "user. Records of classes without one are skipped.",
+        )
+        parser.add_argument(
+            "--include-writes",
+            action="store_true",
+            help="Also replay unsafe methods, with placeholder bodies of "
+                 "the recorded shape.",
+        )
+        parser.add_argument("--timeout", type=float, default=30)
+
+    def handle(self, *args, **options):
+        if options["speed"] <= 0 or (
+            options["rate"] is not None and options["rate"] <= 0
+        ):
+            raise CommandError("--speed and --rate must be positive.")
+        tokens = self.tokens(options["users"])
+        records, skipped = self.select(
+            read_records(
+                options["file"] or settings.TRAFFIC_RECORDING["FILE"]
+            ),
+            tokens,
+            options,
+        )
+        if not records:
+            raise CommandError("No records to replay.")
+
+        replayer = Replayer(options["url"], tokens, options["timeout"])
+        first = records[0]["time"]
+        started = time.perf_counter()
+        with ThreadPoolExecutor(options["concurrency"]) as executor:
+            futures = []
+            for number, record in enumerate(records):
+                if options["rate"]:
+                    offset = number / options["rate"]
+                else:
+                    offset = (record["time"] - first) / options["speed"]
+                scheduled = started + offset
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                futures.append(
+                    (record, executor.submit(replayer.send, record, scheduled))
+                )
+        elapsed = time.perf_counter() - started
+        self.report(
+            [(record, future.result()) for record, future in futures],
+            skipped,
+            elapsed,
+        )
+
+    @staticmethod
+    def tokens(users):
+        tokens = {}
+        for mapping in users:
+            user_class, _, username = mapping.partition("=")
+            try:
+                user = get_user_model().objects.get(username=username)
+            except get_user_model().DoesNotExist:
+                raise CommandError(f"User {username!r} does not exist.")
+            tokens[user_class] = str(AccessToken.for_user(user))
+        return tokens
+
+    @staticmethod
+    def select(records, tokens, options):
+        selected, skipped = [], defaultdict(int)
+        for record in records:
+            if options["limit"] and len(selected) >= options["limit"]:
+                break
+            if (
+                record["method"] not in SAFE_METHODS
+                and not options["include_writes"]
+            ):
+                skipped["write"] += 1
+            elif (
+                record["user"] != "anonymous"
+                and record["user"] not in tokens
+            ):
+                skipped[f"no user for {record['user']}"] += 1
+            else:
+                selected.append(record)
+        selected.sort(key=lambda record: record["time"])
+        return selected, skipped
+
+    def report(self, results, skipped, elapsed):
+        by_endpoint = defaultdict(list)
+        for record, result in results:
+            by_endpoint[record["endpoint"] or record["path"]].append(result)
+
+        self.stdout.write(
+            f"Replayed {len(results)} requests in {elapsed:.1f}s "
+            f"({len(results) / elapsed:.1f}/s), max lag "
+            f"{max(lag for _, (_, _, lag) in results) * 1000:.0f} ms"
+        )
+        for reason, count in sorted(skipped.items()):
+            self.stdout.write(f"  skipped {count}: {reason}")
+        self.stdout.write(
+            f"{'endpoint':<32}{'count':>7}{'4xx':>6}{'errors':>8}"
+            f"{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}"
+        )
+        for endpoint, endpoint_results in sorted(by_endpoint.items()):
+            latencies = sorted(latency for _, latency, _ in endpoint_results)
+            statuses = [status for status, _, _ in endpoint_results]
+            client_errors = sum(
+                1 for status in statuses if status and 400 <= status < 500
+            )
+            errors = sum(
+                1 for status in statuses if status is None or status >= 500
+            )
+            self.stdout.write(
+                f"{endpoint:<32}{len(statuses):>7}{client_errors:>6}"
+                f"{errors / len(statuses):>8.1%}"
+                f"{statistics.median(latencies):>9.1f}"
+                f"{percentile(latencies, 0.95):>9.1f}"
+                f"{percentile(latencies, 0.99):>9.1f}"
+                f"{latencies[-1]:>9.1f}"
+            )
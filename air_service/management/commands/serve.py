@@ -0,0 +1,160 @@
+import gc
+import multiprocessing
+import os
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.urls import get_resolver
+from gunicorn.app.base import BaseApplication
+from rest_framework.generics import GenericAPIView
+
+
+def iter_url_callbacks(patterns):
+    for pattern in patterns:
+        if hasattr(pattern, "url_patterns"):
+            yield from iter_url_callbacks(pattern.url_patterns)
+        else:
+            yield pattern.callback
+
+
+def warm_serializers(callback):
+    view_class = getattr(callback, "cls", None)
+    actions = getattr(callback, "actions", None)
+    if not actions or not issubclass(view_class, GenericAPIView):
+        return
+    for action in set(actions.values()):
+        view = view_class(**callback.initkwargs)
+        view.action = action
+        view.request = None
+        view.format_kwarg = None
+        view.kwargs = {}
+        try:
+            view.get_serializer_class()(context={}).fields
+        except Exception:
+            # Serializers that need a real request are built on first use.
+            continue
+
+
+def warm_up():
+    """
+    Do the work every worker would otherwise repeat on its first requests,
+    so it happens once in the master and is shared copy-on-write.
+    """
+    for model in apps.get_models():
+        model._meta.get_fields()
+    resolver = get_resolver()
+    resolver.reverse_dict
+    for callback in iter_url_callbacks(resolver.url_patterns):
+        warm_serializers(callback)
+    if settings.API_DOCS_ENABLED:
+        from air_service.schema import schema_cache
+
+        schema_cache.load()
+
+
+def close_connections(server, worker):
+    # Forked workers must not share the master's database sockets.
+    connections.close_all()
+
+
+class DjangoApplication(BaseApplication):
+    def __init__(self, application, options):
+        self.application = application
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            if value is not None:
+                self.cfg.set(key, value)
+
+    def load(self):
+        return self.application
+
+
+class Command(BaseCommand):
+    help = (
+        "Serve the project with pre-forked gunicorn workers. Django is "
+        "loaded and warmed in the master before forking. Send HUP to "
+        "restart workers gracefully and USR2 then QUIT to the old master "
+        "to reload code without dropping connections."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--bind",
+            default=os.environ.get("GUNICORN_BIND", "0.0.0.0:8000"),
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=int(
+                os.environ.get(
+                    "WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1
+                )
+            ),
+            help="Number of worker processes.",
+        )
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=int(os.environ.get("GUNICORN_THREADS", 1)),
+            help="Threads per WSGI worker, more than one uses gthread.",
+        )
+        parser.add_argument(
+            "--timeout",
+            type=int,
+            default=int(os.environ.get("GUNICORN_TIMEOUT", 30)),
+        )
+        parser.add_argument(
+            "--graceful-timeout",
+            type=int,
+            default=int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", 30)),
+            help="Seconds workers get to finish requests on restart.",
+        )
+        parser.add_argument(
+            "--max-requests",
+            type=int,
+            default=int(os.environ.get("GUNICORN_MAX_REQUESTS", 0)),
+            help="Recycle workers after this many requests, 0 disables.",
+        )
+        parser.add_argument(
+            "--asgi",
+            action="store_true",
+            help="Serve config.asgi with uvicorn workers.",
+        )
+
+    def handle(self, *args, **options):
+        if options["asgi"]:
+            from config.asgi import application
+            worker_class = "uvicorn.workers.UvicornWorker"
+        else:
+            from config.wsgi import application
+            worker_class = "gthread" if options["threads"] > 1 else "sync"
+            # Workers size their password hashing pool from it.
+            settings.SERVER_THREADS = options["threads"]
+
+        warm_up()
+        connections.close_all()
+        # Keep warmed objects out of the collector so it doesn't touch, and
+        # unshare, their pages in the workers.
+        gc.freeze()
+
+        DjangoApplication(
+            application,
+            {
+                "bind": options["bind"],
+                "workers": options["workers"],
+                "threads": options["threads"],
+                "worker_class": worker_class,
+                "timeout": options["timeout"],
+                "graceful_timeout": options["graceful_timeout"],
+                "max_requests": options["max_requests"],
+                "max_requests_jitter": options["max_requests"] // 10,
+                "preload_app": True,
+                "pre_fork": close_connections,
+                "accesslog": "-",
+            },
+        ).run()
@@ -0,0 +1,144 @@
+import os
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.handlers.exception import convert_exception_to_response
+from django.core.management.base import BaseCommand
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+from django.utils.module_loading import import_string
+
+# Loads the app the way a worker does, including the URLconf and views that
+# are otherwise imported on the first request.
+STARTUP_SCRIPT = """
+import time
+started = time.perf_counter()
+from config.wsgi import application
+from django.urls import get_resolver
+get_resolver().url_patterns
+print(time.perf_counter() - started)
+"""
+
+
+def parse_importtime(output):
+    """Return (module, self_us, cumulative_us) rows from -X importtime."""
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split(
+            "|"
+        )
+        rows.append((module.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+class TimedMiddleware:
+    """Records the time spent in a middleware and everything inside it."""
+
+    def __init__(self, name, handler, timings):
+        self.name = name
+        self.handler = handler
+        self.timings = timings
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        response = self.handler(request)
+        self.timings[self.name] += time.perf_counter() - started
+        return response
+
+
+class Command(BaseCommand):
+    help = (
+        "Report import time per module of a cold worker start and the "
+        "per-request cost of each configured middleware. Run with "
+        "--settings to profile another settings module."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--top",
+            type=int,
+            default=20,
+            help="Number of slowest modules to list.",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=1000,
+            help="Number of requests sent through the middleware.",
+        )
+        parser.add_argument("--path", default="/api/v1/flights/")
+
+    def handle(self, *args, **options):
+        self.profile_imports(options["top"])
+        self.profile_middleware(options["requests"], options["path"])
+
+    def profile_imports(self, top):
+        env = {
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": settings.SETTINGS_MODULE,
+        }
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", STARTUP_SCRIPT],
+            capture_output=True,
+            text=True,
+            env=env,
+            cwd=settings.BASE_DIR,
+            check=True,
+        )
+        rows = parse_importtime(result.stderr)
+        startup = float(result.stdout.split()[-1])
+        self.stdout.write(
+            f"Settings {settings.SETTINGS_MODULE}: {len(rows)} modules, "
+            f"app loaded in {startup * 1000:.0f} ms"
+        )
+        self.stdout.write(f"{'self ms':>9}{'total ms':>10}  module")
+        for module, self_us, cumulative_us in sorted(
+            rows, key=lambda row: row[1], reverse=True
+        )[:top]:
+            self.stdout.write(
+                f"{self_us / 1000:>9.1f}{cumulative_us / 1000:>10.1f}  "
+                f"{module}"
+            )
+
+    def profile_middleware(self, requests, path):
+        timings = {}
+        handler = convert_exception_to_response(
+            lambda request: HttpResponse(b"{}")
+        )
+        names = []
+        for name in reversed(settings.MIDDLEWARE):
+            try:
+                middleware = import_string(name)(handler)
+            except MiddlewareNotUsed:
+                # Django leaves these out of the chain as well.
+                continue
+            names.append(name)
+            timings[name] = 0.0
+            handler = TimedMiddleware(
+                name,
+                convert_exception_to_response(middleware),
+                timings,
+            )
+
+        factory = RequestFactory()
+        # Production settings may not allow any host for the test client.
+        with override_settings(ALLOWED_HOSTS=["testserver"]):
+            for _ in range(requests):
+                handler(factory.get(path))
+
+        self.stdout.write(f"\nMiddleware cost per request on {path}")
+        self.stdout.write(f"{'self us':>9}  middleware")
+        inner = 0.0
+        for name in names:
+            own = timings[name] - inner
+            inner = timings[name]
+            timings[name] = own
+        for name in reversed(names):
+            self.stdout.write(
+                f"{timings[name] / requests * 1e6:>9.1f}  {name}"
+            )
@@ -0,0 +1,212 @@
+import gzip
+import random
+import time
+
+from asgiref.sync import (
+    iscoroutinefunction,
+    markcoroutinefunction,
+    sync_to_async,
+)
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+from air_service.slow_queries import current_request
+from air_service.traffic import (
+    QueryCounter,
+    anonymize_query,
+    request_body_shape,
+    user_class,
+    write_record,
+)
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def available_encodings():
+    """Content codings the server can produce, most preferred first."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate_encoding(accept_encoding):
+    accepted = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+
+    best, best_quality = None, 0.0
+    for coding in available_encodings():
+        quality = accepted.get(coding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def compress(content, encoding):
+    config = settings.COMPRESSION
+    if encoding == "br":
+        return brotli.compress(content, quality=config["BROTLI_QUALITY"])
+    return gzip.compress(
+        content, compresslevel=config["GZIP_LEVEL"], mtime=0
+    )
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Compress responses with brotli or gzip, whichever the client prefers.
+
+    Unlike Django's GZipMiddleware it leaves streaming responses alone and
+    only compresses bodies of at least COMPRESSION["MIN_SIZE"] bytes, where
+    the saving is worth the CPU time.
+    """
+
+    def process_response(self, request, response):
+        if (
+            response.streaming
+            or response.has_header("Content-Encoding")
+            or len(response.content) < settings.COMPRESSION["MIN_SIZE"]
+        ):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = negotiate_encoding(
+            request.META.get("HTTP_ACCEPT_ENCODING", "")
+        )
+        if encoding is None:
+            return response
+
+        compressed = compress(response.content, encoding)
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response["Content-Length"] = str(len(compressed))
+        response["Content-Encoding"] = encoding
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            # The compressed body is no longer byte-for-byte the original.
+            response["ETag"] = "W/" + etag
+        return response
+
+
+class TrafficRecordingMiddleware:
+    """
+    Record a sample of requests for `manage.py replay_traffic`.
+
+    Only the shape of the traffic is kept: the query string without
+    credentials, the structure of JSON bodies and whether the user is
+    anonymous, a user or staff. Streaming responses are not recorded.
+    Statements are counted in the sync stack only, under ASGI they run
+    on other threads' connections and `queries` is null.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.TRAFFIC_RECORDING["ENABLED"]:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    @staticmethod
+    def sampled():
+        return random.random() < settings.TRAFFIC_RECORDING["SAMPLE_RATE"]
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not self.sampled():
+            return self.get_response(request)
+        body = request_body_shape(request)
+        counter = QueryCounter()
+        started = time.perf_counter()
+        with connection.execute_wrapper(counter):
+            response = self.get_response(request)
+        latency = time.perf_counter() - started
+        if not response.streaming:
+            self.record(
+                request, response, body, user_class(request), latency,
+                counter.count,
+            )
+        return response
+
+    async def __acall__(self, request):
+        if not self.sampled():
+            return await self.get_response(request)
+        body = request_body_shape(request)
+        started = time.perf_counter()
+        response = await self.get_response(request)
+        latency = time.perf_counter() - started
+        if not response.streaming:
+            self.record(
+                request, response, body,
+                await sync_to_async(user_class)(request), latency, None,
+            )
+        return response
+
+    @staticmethod
+    def record(request, response, body, user, latency, queries):
+        match = request.resolver_match
+        write_record(
+            {
+                "time": time.time(),
+                "method": request.method,
+                "path": request.path,
+                "query": anonymize_query(request.GET),
+                "body": body,
+                "user": user,
+                "endpoint": match.view_name if match else None,
+                "status": response.status_code,
+                "latency_ms": round(latency * 1000, 2),
+                "queries": queries,
+            }
+        )
+
+
+class SlowQueryMiddleware:
+    """
+    Tell slow query capture which request runs the statements, see
+    `air_service.slow_queries`.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.SLOW_QUERIES["ENABLED"]:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        token = current_request.set(request)
+        try:
+            return self.get_response(request)
+        finally:
+            current_request.reset(token)
+
+    async def __acall__(self, request):
+        # Sync views run in a copy of this context and see the request.
+        token = current_request.set(request)
+        try:
+            return await self.get_response(request)
+        finally:
+            current_request.reset(token)
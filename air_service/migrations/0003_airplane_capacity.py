@@ -0,0 +1,26 @@
+# Generated by Django 5.1.5 on 2026-10-19 01:02
+
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("air_service", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="airplane",
+            name="capacity",
+            field=models.GeneratedField(
+                db_index=True,
+                db_persist=True,
+                expression=django.db.models.expressions.CombinedExpression(
+                    models.F("rows"), "*", models.F("seats_in_row")
+                ),
+                output_field=models.IntegerField(),
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.5 on 2026-10-19 01:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("air_service", "0003_airplane_capacity"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="flight",
+            name="departure_datetime",
+            field=models.DateTimeField(db_index=True),
+        ),
+        migrations.AlterField(
+            model_name="order",
+            name="order_created_at",
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+    ]
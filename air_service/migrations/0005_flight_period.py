@@ -0,0 +1,42 @@
+# Generated by Django 5.1.5 on 2026-10-19 01:12
+
+import air_service.models
+import django.contrib.postgres.fields.ranges
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("air_service", "0004_admin_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="flight",
+            name="flight_period",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=air_service.models.TsTzRange(
+                    "departure_datetime", "arrival_datetime"
+                ),
+                output_field=django.contrib.postgres.fields.ranges.DateTimeRangeField(),
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="flight",
+            index=django.contrib.postgres.indexes.GistIndex(
+                fields=["flight_period"], name="flight_period_gist"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="flight",
+            constraint=models.CheckConstraint(
+                condition=models.Q(
+                    ("arrival_datetime__gt", models.F("departure_datetime"))
+                ),
+                name="flight_arrival_after_departure",
+            ),
+        ),
+    ]
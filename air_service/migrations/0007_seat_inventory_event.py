@@ -0,0 +1,35 @@
+# Generated by Django 5.1.5 on 2026-10-19 01:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("air_service", "0006_idempotency_key"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SeatInventoryEvent",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("flight_id", models.BigIntegerField()),
+                ("order_id", models.BigIntegerField(blank=True, null=True)),
+                ("seats_delta", models.IntegerField()),
+                ("tickets_available", models.IntegerField()),
+                ("created_at", models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                "ordering": ["id"],
+            },
+        ),
+    ]
@@ -0,0 +1,95 @@
+# Generated by Django 5.1.5 on 2026-10-19 02:09
+
+import django.contrib.postgres.fields
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+from air_service.summaries import batched, summarize
+
+
+def backfill_order_summaries(apps, schema_editor):
+    Order = apps.get_model("air_service", "Order")
+    OrderSummary = apps.get_model("air_service", "OrderSummary")
+    Ticket = apps.get_model("air_service", "Ticket")
+    order_ids = Order.objects.order_by("id").values_list("id", flat=True)
+    for batch in batched(order_ids.iterator(), 1000):
+        OrderSummary.objects.bulk_create(
+            OrderSummary(**fields)
+            for fields in summarize(
+                Order.objects.filter(id__in=batch).values_list(
+                    "id", "user_id", "order_created_at"
+                ),
+                Ticket.objects.filter(order_id__in=batch)
+                .order_by("flight__departure_datetime", "flight_id", "id")
+                .values_list(
+                    "order_id",
+                    "flight_id",
+                    "flight__departure_datetime",
+                    "flight__route__source__airport_name",
+                    "flight__route__destination__airport_name",
+                ),
+            )
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("air_service", "0008_airport_coordinates"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OrderSummary",
+            fields=[
+                (
+                    "order",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="summary",
+                        serialize=False,
+                        to="air_service.order",
+                    ),
+                ),
+                ("order_created_at", models.DateTimeField()),
+                ("ticket_count", models.IntegerField(default=0)),
+                ("first_departure", models.DateTimeField(blank=True, null=True)),
+                ("source_names", models.TextField(blank=True)),
+                ("destination_names", models.TextField(blank=True)),
+                (
+                    "flight_ids",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.BigIntegerField(), default=list, size=None
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-order_created_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["user", "-order_created_at"],
+                        name="order_summary_user_created",
+                    ),
+                    models.Index(
+                        fields=["user", "first_departure"],
+                        name="order_summary_user_departure",
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(
+            backfill_order_summaries, migrations.RunPython.noop
+        ),
+    ]
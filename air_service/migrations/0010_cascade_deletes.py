@@ -0,0 +1,139 @@
+# Generated by Django 5.1.5 on 2026-10-19 02:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# (model, foreign key) pairs whose rows the database deletes with the row
+# they point to.
+CASCADES = [
+    ("ticket", "flight"),
+    ("flight", "route"),
+    ("flight", "airplane"),
+    ("flight_crew", "flight"),
+]
+
+
+def set_on_delete(action):
+    def alter(apps, schema_editor):
+        connection = schema_editor.connection
+        quote = schema_editor.quote_name
+        flight = apps.get_model("air_service", "Flight")
+        models_by_name = {
+            "ticket": apps.get_model("air_service", "Ticket"),
+            "flight": flight,
+            "flight_crew": flight.crew.through,
+        }
+        for model_name, field_name in CASCADES:
+            model = models_by_name[model_name]
+            field = model._meta.get_field(field_name)
+            table = model._meta.db_table
+            with connection.cursor() as cursor:
+                constraints = connection.introspection.get_constraints(
+                    cursor, table
+                )
+            [name] = [
+                name
+                for name, constraint in constraints.items()
+                if constraint["foreign_key"]
+                and constraint["columns"] == [field.column]
+            ]
+            # NOT VALID skips the scan under the exclusive lock, VALIDATE
+            # then checks the rows without blocking writes.
+            schema_editor.execute(
+                f"ALTER TABLE {quote(table)} "
+                f"DROP CONSTRAINT {quote(name)}, "
+                f"ADD CONSTRAINT {quote(name)} "
+                f"FOREIGN KEY ({quote(field.column)}) "
+                f"REFERENCES {quote(field.related_model._meta.db_table)} "
+                f"({quote(field.target_field.column)}) "
+                f"ON DELETE {action} DEFERRABLE INITIALLY DEFERRED NOT VALID"
+            )
+            schema_editor.execute(
+                f"ALTER TABLE {quote(table)} VALIDATE CONSTRAINT {quote(name)}"
+            )
+
+    return alter
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("air_service", "0009_order_summary"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="flight",
+            name="airplane",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="flights",
+                to="air_service.airplane",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="flight",
+            name="route",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="flights",
+                to="air_service.route",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="ticket",
+            name="flight",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="tickets",
+                to="air_service.flight",
+            ),
+        ),
+        migrations.RunPython(
+            set_on_delete("CASCADE"), set_on_delete("NO ACTION")
+        ),
+        migrations.CreateModel(
+            name="Deletion",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "target",
+                    models.CharField(
+                        choices=[("route", "Route"), ("airplane", "Airplane")],
+                        max_length=10,
+                    ),
+                ),
+                ("target_id", models.BigIntegerField()),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[("running", "Running"), ("done", "Done")],
+                        default="running",
+                        max_length=10,
+                    ),
+                ),
+                ("total_flights", models.PositiveIntegerField()),
+                ("deleted_flights", models.PositiveIntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "ordering": ["-created_at"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        condition=models.Q(("status", "running")),
+                        fields=("target", "target_id"),
+                        name="unique_running_deletion",
+                    )
+                ],
+            },
+        ),
+    ]
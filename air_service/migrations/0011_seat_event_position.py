@@ -0,0 +1,60 @@
+# Generated by Django 5.1.5 on 2026-10-19 09:12
+
+from django.db import migrations, models
+
+# Feed positions are handed out at commit by a deferred constraint trigger.
+# The advisory lock it takes is held from there to the end of the commit,
+# so positions become visible in the order they are handed out while
+# bookings only serialize on the commit itself.
+CREATE_TRIGGER = """
+CREATE SEQUENCE air_service_seatinventoryevent_position_seq;
+UPDATE air_service_seatinventoryevent SET position = id;
+SELECT setval(
+    'air_service_seatinventoryevent_position_seq',
+    COALESCE((SELECT max(position) FROM air_service_seatinventoryevent), 0)
+    + 1,
+    false
+);
+
+CREATE FUNCTION air_service_seat_event_position() RETURNS trigger AS $$
+DECLARE
+    next_position bigint;
+BEGIN
+    PERFORM pg_advisory_xact_lock(4100);
+    next_position := nextval('air_service_seatinventoryevent_position_seq');
+    UPDATE air_service_seatinventoryevent
+    SET position = next_position
+    WHERE id = NEW.id;
+    PERFORM pg_notify('seat_inventory', next_position::text);
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE CONSTRAINT TRIGGER air_service_seat_event_position
+AFTER INSERT ON air_service_seatinventoryevent
+DEFERRABLE INITIALLY DEFERRED
+FOR EACH ROW EXECUTE FUNCTION air_service_seat_event_position();
+"""
+
+DROP_TRIGGER = """
+DROP TRIGGER air_service_seat_event_position
+ON air_service_seatinventoryevent;
+DROP FUNCTION air_service_seat_event_position();
+DROP SEQUENCE air_service_seatinventoryevent_position_seq;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("air_service", "0010_cascade_deletes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="seatinventoryevent",
+            name="position",
+            field=models.BigIntegerField(editable=False, null=True, unique=True),
+        ),
+        migrations.RunSQL(CREATE_TRIGGER, DROP_TRIGGER),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.5 on 2026-10-19 03:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("air_service", "0011_seat_event_position"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="seatinventoryevent",
+            name="flight_deleted",
+            field=models.BooleanField(default=False),
+        ),
+    ]
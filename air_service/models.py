@@ -1,6 +1,11 @@
+from django.contrib.postgres.fields import ArrayField, DateTimeRangeField
+from django.contrib.postgres.indexes import GistIndex
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 from rest_framework.exceptions import ValidationError
 
+from air_service.signals import send_tickets_changed
 from config.settings.base import AUTH_USER_MODEL
 
 
@@ -22,6 +27,29 @@ class City(models.Model):
 class Airport(models.Model):
     airport_name = models.CharField(max_length=100, unique=True)
     city = models.ForeignKey(City, on_delete=models.CASCADE, related_name="airports")
+    latitude = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-90), MaxValueValidator(90)],
+    )
+    longitude = models.FloatField(
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(-180), MaxValueValidator(180)],
+    )
+
+    class Meta:
+        constraints = [
+            models.CheckConstraint(
+                condition=(
+                    models.Q(latitude__isnull=True, longitude__isnull=True)
+                    | models.Q(
+                        latitude__isnull=False, longitude__isnull=False
+                    )
+                ),
+                name="airport_coordinates_together",
+            ),
+        ]
 
     def __str__(self):
         return self.airport_name
@@ -43,6 +71,12 @@ class Airplane(models.Model):
     airplane_name = models.CharField(max_length=100, unique=True)
     rows = models.IntegerField()
     seats_in_row = models.IntegerField()
+    capacity = models.GeneratedField(
+        expression=models.F("rows") * models.F("seats_in_row"),
+        output_field=models.IntegerField(),
+        db_persist=True,
+        db_index=True,
+    )
     airplane_type = models.ForeignKey(
         AirplaneType, on_delete=models.CASCADE, related_name="airplanes"
     )
@@ -96,14 +130,42 @@ class Crew(models.Model):
         ordering = ["last_name", "first_name"]
 
 
+class TsTzRange(models.Func):
+    function = "TSTZRANGE"
+    output_field = DateTimeRangeField()
+
+
 class Flight(models.Model):
-    route = models.ForeignKey(Route, on_delete=models.CASCADE, related_name="flights")
+    # Flights, their tickets and crew assignments are deleted by ON DELETE
+    # CASCADE in the database (migration 0010), Django never loads them;
+    # `air_service.deletion` sends `flights_deleted` for them.
+    route = models.ForeignKey(
+        Route, on_delete=models.DO_NOTHING, related_name="flights"
+    )
     airplane = models.ForeignKey(
-        Airplane, on_delete=models.CASCADE, related_name="flights"
+        Airplane, on_delete=models.DO_NOTHING, related_name="flights"
     )
     crew = models.ManyToManyField(Crew, related_name="flights")
-    departure_datetime = models.DateTimeField()
+    departure_datetime = models.DateTimeField(db_index=True)
     arrival_datetime = models.DateTimeField()
+    flight_period = models.GeneratedField(
+        expression=TsTzRange("departure_datetime", "arrival_datetime"),
+        output_field=DateTimeRangeField(),
+        db_persist=True,
+    )
+
+    class Meta:
+        indexes = [
+            GistIndex(fields=["flight_period"], name="flight_period_gist"),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(
+                    arrival_datetime__gt=models.F("departure_datetime")
+                ),
+                name="flight_arrival_after_departure",
+            ),
+        ]
 
     def __str__(self):
         return (
@@ -111,9 +173,55 @@ class Flight(models.Model):
             f"({self.departure_datetime}-{self.arrival_datetime})"
         )
 
+    @staticmethod
+    def validate_schedule(
+        departure,
+        arrival,
+        airplane,
+        crew,
+        error_to_raise,
+        flight_id=None,
+    ):
+        if arrival <= departure:
+            raise error_to_raise(
+                {"arrival_datetime": "arrival must be after departure"}
+            )
+
+        overlapping = Flight.objects.filter(
+            flight_period__overlap=(departure, arrival)
+        ).exclude(pk=flight_id)
+
+        airplane_conflict = (
+            overlapping.filter(airplane=airplane)
+            .values_list("id", flat=True)
+            .first()
+        )
+        if airplane_conflict:
+            raise error_to_raise(
+                {
+                    "airplane": f"airplane is already assigned to "
+                                f"flight {airplane_conflict} at that time"
+                }
+            )
+
+        crew_conflicts = Crew.objects.filter(
+            id__in=[member.id for member in crew],
+            flights__in=overlapping,
+        ).distinct()
+        if crew_conflicts:
+            raise error_to_raise(
+                {
+                    "crew": [
+                        f"{member} is already assigned to "
+                        f"an overlapping flight"
+                        for member in crew_conflicts
+                    ]
+                }
+            )
+
 
 class Order(models.Model):
-    order_created_at = models.DateTimeField(auto_now_add=True)
+    order_created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     user = models.ForeignKey(
         AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="orders"
     )
@@ -125,7 +233,10 @@ class Order(models.Model):
 class Ticket(models.Model):
     seat_row = models.IntegerField()
     seat_number = models.IntegerField()
-    flight = models.ForeignKey(Flight, on_delete=models.CASCADE, related_name="tickets")
+    # ON DELETE CASCADE in the database, like the flight's own keys.
+    flight = models.ForeignKey(
+        Flight, on_delete=models.DO_NOTHING, related_name="tickets"
+    )
     order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name="tickets")
 
     def __str__(self):
@@ -162,4 +273,157 @@ class Ticket(models.Model):
 
     def save(self, *args, **kwargs):
         self.full_clean()
+        deltas = {self.flight_id: 1}
+        if not self._state.adding:
+            previous_flight_id = (
+                Ticket.objects.filter(pk=self.pk)
+                .values_list("flight_id", flat=True)
+                .first()
+            )
+            if previous_flight_id is not None:
+                deltas = {previous_flight_id: -1}
+                deltas[self.flight_id] = deltas.get(self.flight_id, 0) + 1
         super().save(*args, **kwargs)
+        send_tickets_changed(Ticket, self.order_id, deltas)
+
+    def delete(self, *args, **kwargs):
+        flight_id, order_id = self.flight_id, self.order_id
+        result = super().delete(*args, **kwargs)
+        send_tickets_changed(Ticket, order_id, {flight_id: -1})
+        return result
+
+
+class OrderSummary(models.Model):
+    """
+    What the order history shows, one row per order.
+
+    Kept in step with the order's tickets by `air_service.summaries`, so
+    listing orders never joins tickets, flights or airports.
+    """
+
+    order = models.OneToOneField(
+        Order,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="summary",
+    )
+    user = models.ForeignKey(
+        AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="+",
+        db_index=False,
+    )
+    order_created_at = models.DateTimeField()
+    ticket_count = models.IntegerField(default=0)
+    first_departure = models.DateTimeField(null=True, blank=True)
+    # Distinct names in departure order, joined with ", ".
+    source_names = models.TextField(blank=True)
+    destination_names = models.TextField(blank=True)
+    flight_ids = ArrayField(models.BigIntegerField(), default=list)
+
+    class Meta:
+        ordering = ["-order_created_at"]
+        indexes = [
+            models.Index(
+                fields=["user", "-order_created_at"],
+                name="order_summary_user_created",
+            ),
+            models.Index(
+                fields=["user", "first_departure"],
+                name="order_summary_user_departure",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.order_id}: {self.ticket_count} tickets"
+
+
+class IdempotencyKey(models.Model):
+    user = models.ForeignKey(
+        AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="idempotency_keys"
+    )
+    key = models.CharField(max_length=255)
+    fingerprint = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    response_body = models.JSONField(
+        null=True, blank=True, encoder=DjangoJSONEncoder
+    )
+    locked_at = models.DateTimeField()
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "key"], name="unique_user_idempotency_key"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.user_id}:{self.key}"
+
+    @property
+    def is_complete(self):
+        return self.status_code is not None
+
+
+class SeatInventoryEvent(models.Model):
+    """
+    Outbox row written in the booking transaction. The position is the
+    feed cursor, a database trigger assigns it when the transaction
+    commits so positions become visible in increasing order.
+    """
+
+    position = models.BigIntegerField(null=True, unique=True, editable=False)
+    flight_id = models.BigIntegerField()
+    order_id = models.BigIntegerField(null=True, blank=True)
+    seats_delta = models.IntegerField()
+    tickets_available = models.IntegerField()
+    # Last event of a deleted flight, its tickets went with it.
+    flight_deleted = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ["id"]
+
+    def __str__(self):
+        return f"{self.id}: flight {self.flight_id} {self.seats_delta:+d}"
+
+
+class Deletion(models.Model):
+    """
+    Progress of a route or airplane whose flights are deleted in chunks
+    by background jobs. Holds a plain id, the object is gone at the end.
+    """
+
+    class Target(models.TextChoices):
+        ROUTE = "route"
+        AIRPLANE = "airplane"
+
+    class Status(models.TextChoices):
+        RUNNING = "running"
+        DONE = "done"
+
+    target = models.CharField(max_length=10, choices=Target.choices)
+    target_id = models.BigIntegerField()
+    status = models.CharField(
+        max_length=10, choices=Status.choices, default=Status.RUNNING
+    )
+    total_flights = models.PositiveIntegerField()
+    deleted_flights = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["target", "target_id"],
+                condition=models.Q(status="running"),
+                name="unique_running_deletion",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.target} {self.target_id}: {self.status}"
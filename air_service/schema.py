@@ -0,0 +1,137 @@
+import hashlib
+import json
+import threading
+from pathlib import Path
+
+import drf_spectacular
+import rest_framework
+from django.apps import apps
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+from django.utils.module_loading import import_string
+from django.views.decorators.http import condition, require_safe
+
+RENDERERS = {
+    "yaml": (
+        "drf_spectacular.renderers.OpenApiYamlRenderer",
+        "application/vnd.oai.openapi",
+    ),
+    "json": (
+        "drf_spectacular.renderers.OpenApiJsonRenderer",
+        "application/vnd.oai.openapi+json",
+    ),
+}
+
+
+def source_files():
+    base_dir = Path(settings.BASE_DIR)
+    roots = {base_dir / settings.ROOT_URLCONF.split(".")[0]}
+    roots.update(
+        Path(app.path)
+        for app in apps.get_app_configs()
+        if Path(app.path).is_relative_to(base_dir)
+    )
+    for root in sorted(roots):
+        for path in sorted(root.rglob("*.py")):
+            if not {"migrations", "tests"} & set(path.parts) and (
+                path.name != "tests.py"
+            ):
+                yield path
+
+
+def code_fingerprint() -> str:
+    """Hash of everything the generated schema depends on."""
+    digest = hashlib.sha256()
+    digest.update(
+        f"{drf_spectacular.__version__} {rest_framework.VERSION}".encode()
+    )
+    digest.update(
+        json.dumps(settings.SPECTACULAR_SETTINGS, sort_keys=True).encode()
+    )
+    for path in source_files():
+        digest.update(str(path.relative_to(settings.BASE_DIR)).encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def generate_schema() -> dict:
+    from drf_spectacular.generators import SchemaGenerator
+
+    schema = SchemaGenerator().get_schema(request=None, public=True)
+    # Resolve lazy strings so a fresh schema matches one read from the file.
+    return json.loads(json.dumps(schema, cls=DjangoJSONEncoder))
+
+
+class SchemaCache:
+    """
+    The OpenAPI schema, generated once per code version.
+
+    The schema is read from `API_SCHEMA_FILE` when its fingerprint matches
+    the code and is regenerated and written back otherwise, each format is
+    rendered once and then served from memory.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._schema = None
+        self._rendered = {}
+
+    def load(self, force=False):
+        with self._lock:
+            if self._schema is not None and not force:
+                return self._schema
+            path = Path(settings.API_SCHEMA_FILE)
+            fingerprint = code_fingerprint()
+            cached = None
+            if path.exists() and not force:
+                cached = json.loads(path.read_text())
+            if cached and cached.get("fingerprint") == fingerprint:
+                schema = cached["schema"]
+            else:
+                schema = generate_schema()
+                try:
+                    path.write_text(
+                        json.dumps(
+                            {"fingerprint": fingerprint, "schema": schema}
+                        )
+                    )
+                except OSError:
+                    # Read-only images still serve the schema from memory.
+                    pass
+            self._schema = schema
+            self._rendered = {}
+            return schema
+
+    def render(self, schema_format):
+        rendered = self._rendered.get(schema_format)
+        if rendered is None:
+            renderer_path, content_type = RENDERERS[schema_format]
+            content = import_string(renderer_path)().render(
+                self.load(), renderer_context={}
+            )
+            rendered = (
+                content,
+                content_type,
+                hashlib.sha256(content).hexdigest(),
+            )
+            self._rendered[schema_format] = rendered
+        return rendered
+
+
+schema_cache = SchemaCache()
+
+
+def get_format(request):
+    return "json" if request.GET.get("format") == "json" else "yaml"
+
+
+def schema_etag(request):
+    return schema_cache.render(get_format(request))[2]
+
+
+@require_safe
+@condition(etag_func=schema_etag)
+def cached_schema_view(request):
+    content, content_type, _ = schema_cache.render(get_format(request))
+    return HttpResponse(content, content_type=content_type)
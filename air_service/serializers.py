@@ -1,8 +1,16 @@
+from collections import Counter
 from typing import Union
 
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
 from django.db import transaction
+from django.db.models import Count
 from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS
 
+from air_service.deletion import being_deleted
+from air_service.fieldsets import Expandable, SparseFieldsetMixin
+from air_service.geo import airport_distance_km
 from air_service.models import (
     Country,
     City,
@@ -11,10 +19,69 @@ from air_service.models import (
     AirplaneType,
     Route,
     Crew,
+    Deletion,
     Flight,
     Ticket,
     Order,
+    OrderSummary,
+    SeatInventoryEvent,
 )
+from air_service.signals import send_tickets_changed
+
+
+class BulkManyRelatedField(serializers.ManyRelatedField):
+    """Resolves every primary key of the list with one query."""
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, "__iter__"):
+            self.fail("not_a_list", input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail("empty")
+        child = self.child_relation
+        queryset = child.get_queryset()
+        pks = []
+        for item in data:
+            if isinstance(item, bool):
+                child.fail("incorrect_type", data_type=type(item).__name__)
+            try:
+                pks.append(queryset.model._meta.pk.to_python(item))
+            except DjangoValidationError:
+                child.fail("incorrect_type", data_type=type(item).__name__)
+        objects = queryset.in_bulk(pks)
+        for pk, item in zip(pks, data):
+            if pk not in objects:
+                child.fail("does_not_exist", pk_value=item)
+        return [objects[pk] for pk in pks]
+
+
+class BulkPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """`PrimaryKeyRelatedField` whose `many=True` form runs one query."""
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {"child_relation": cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return BulkManyRelatedField(**list_kwargs)
+
+
+class PrefetchedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    Takes objects from `context[prefetch_key]`, an {id: object} mapping a
+    parent serializer fills for all of its items at once, and queries only
+    for ids missing there.
+    """
+
+    def __init__(self, prefetch_key, **kwargs):
+        self.prefetch_key = prefetch_key
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        prefetched = self.context.get(self.prefetch_key, {})
+        if type(data) is int and data in prefetched:
+            return prefetched[data]
+        return super().to_internal_value(data)
 
 
 class CountrySerializer(serializers.ModelSerializer):
@@ -65,7 +132,27 @@ class AirportRetrieveSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Airport
-        fields = ["id", "airport_name", "city", "country"]
+        fields = [
+            "id",
+            "airport_name",
+            "city",
+            "country",
+            "latitude",
+            "longitude",
+        ]
+
+    def validate(self, attrs):
+        latitude = attrs.get(
+            "latitude", getattr(self.instance, "latitude", None)
+        )
+        longitude = attrs.get(
+            "longitude", getattr(self.instance, "longitude", None)
+        )
+        if (latitude is None) != (longitude is None):
+            raise serializers.ValidationError(
+                "Latitude and longitude must be set together."
+            )
+        return attrs
 
 
 class AirplaneTypeSerializer(serializers.ModelSerializer):
@@ -135,7 +222,7 @@ class AirplaneListSerializer(serializers.ModelSerializer):
         ]
 
 
-class AirplaneRetrieveSerializer(AirplaneListSerializer):
+class AirplaneRetrieveSerializer(SparseFieldsetMixin, AirplaneListSerializer):
     airplane_type = AirplaneTypeSerializer()
 
     class Meta:
@@ -149,6 +236,10 @@ class AirplaneRetrieveSerializer(AirplaneListSerializer):
         ]
 
 
+class AirplaneQuerySerializer(serializers.Serializer):
+    min_capacity = serializers.IntegerField(min_value=0, required=False)
+
+
 class RouteSerializer(serializers.ModelSerializer):
     source = serializers.CharField()
     destination = serializers.CharField()
@@ -156,6 +247,39 @@ class RouteSerializer(serializers.ModelSerializer):
     class Meta:
         model = Route
         fields = ["id", "source", "destination", "distance"]
+        extra_kwargs = {"distance": {"required": False}}
+
+    @staticmethod
+    def get_distance(
+            source: Airport,
+            destination: Airport,
+            distance: Union[int, None],
+            default: Union[int, None] = None
+    ) -> int:
+        """
+        Check a given distance against the great-circle distance of the
+        airports, or use the great-circle distance when none is given.
+        Without coordinates the given distance, then `default`, is kept.
+        """
+        great_circle = airport_distance_km(source, destination)
+        if great_circle is None:
+            distance = distance if distance is not None else default
+            if distance is None:
+                raise serializers.ValidationError(
+                    {"distance": "Distance is required unless both "
+                                 "airports have coordinates."}
+                )
+            return distance
+        if distance is None:
+            return round(great_circle)
+        tolerance = settings.GEO["ROUTE_DISTANCE_TOLERANCE"]
+        if abs(distance - great_circle) > great_circle * tolerance:
+            raise serializers.ValidationError(
+                {"distance": f"Distance differs from the great-circle "
+                             f"distance of {round(great_circle)} km by "
+                             f"more than {tolerance:.0%}."}
+            )
+        return distance
 
     @staticmethod
     def get_airport_by_id_or_name(
@@ -200,6 +324,11 @@ class RouteSerializer(serializers.ModelSerializer):
         ).exists():
             raise serializers.ValidationError("This route already exists.")
 
+        validated_data["distance"] = self.get_distance(
+            source_airport,
+            destination_airport,
+            validated_data.get("distance"),
+        )
         route = Route.objects.create(
             source=source_airport,
             destination=destination_airport,
@@ -223,23 +352,48 @@ class RouteSerializer(serializers.ModelSerializer):
             )
             instance.destination = destination_airport
 
-        instance.distance = validated_data.get("distance", instance.distance)
+        distance = validated_data.get("distance")
+        if distance is not None or source_input or destination_input:
+            instance.distance = self.get_distance(
+                instance.source,
+                instance.destination,
+                distance,
+                default=instance.distance,
+            )
         instance.save()
         return instance
 
 
-class RouteListRetrieveSerializer(RouteSerializer):
+class RouteListRetrieveSerializer(SparseFieldsetMixin, RouteSerializer):
     source = AirportRetrieveSerializer()
     destination = AirportRetrieveSerializer()
 
+    expandable_fields = {
+        "source": Expandable(
+            AirportRetrieveSerializer, select=("city__country",)
+        ),
+        "destination": Expandable(
+            AirportRetrieveSerializer, select=("city__country",)
+        ),
+    }
+
 
-class CrewRetrieveSerializer(serializers.ModelSerializer):
+class FlightRouteSerializer(SparseFieldsetMixin, RouteSerializer):
+    """
+    Route nested in flights. `RouteSerializer` itself stays untrimmed, it
+    validates route writes.
+    """
+
+
+class CrewRetrieveSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Crew
         fields = ["id", "first_name", "last_name", "full_name"]
 
 
 class FlightSerializer(serializers.ModelSerializer):
+    serializer_related_field = BulkPrimaryKeyRelatedField
+
     class Meta:
         model = Flight
         fields = [
@@ -251,14 +405,124 @@ class FlightSerializer(serializers.ModelSerializer):
             "arrival_datetime"
         ]
 
+    def validate(self, attrs):
+        data = super(FlightSerializer, self).validate(attrs)
+        self.validate_not_being_deleted(attrs)
+        self.validate_schedule(attrs)
+        return data
+
+    def validate_not_being_deleted(self, attrs):
+        route = attrs.get("route", getattr(self.instance, "route", None))
+        airplane = attrs.get(
+            "airplane", getattr(self.instance, "airplane", None)
+        )
+        if being_deleted([route.pk], [airplane.pk]):
+            raise serializers.ValidationError(
+                "The route or airplane of this flight is being deleted."
+            )
 
-class FlightRetrieveSerializer(FlightSerializer):
-    route = RouteSerializer()
+    def get_schedule(self, attrs) -> dict:
+        instance = self.instance
+        if "crew" in attrs:
+            crew = attrs["crew"]
+        else:
+            crew = list(instance.crew.all()) if instance else []
+        return {
+            "departure": attrs.get(
+                "departure_datetime",
+                getattr(instance, "departure_datetime", None)
+            ),
+            "arrival": attrs.get(
+                "arrival_datetime",
+                getattr(instance, "arrival_datetime", None)
+            ),
+            "airplane": attrs.get(
+                "airplane",
+                getattr(instance, "airplane", None)
+            ),
+            "crew": crew,
+        }
+
+    def validate_schedule(self, attrs):
+        Flight.validate_schedule(
+            error_to_raise=serializers.ValidationError,
+            flight_id=getattr(self.instance, "id", None),
+            **self.get_schedule(attrs)
+        )
+
+    def lock_schedule(self, validated_data):
+        """
+        Lock the airplane and crew rows and re-check the schedule, so two
+        concurrent requests can't both book the same airplane or crew.
+        """
+        schedule = self.get_schedule(validated_data)
+        list(
+            Airplane.objects.select_for_update()
+            .filter(pk=schedule["airplane"].pk)
+            .values_list("pk")
+        )
+        list(
+            Crew.objects.select_for_update()
+            .filter(pk__in=[member.pk for member in schedule["crew"]])
+            .order_by("pk")
+            .values_list("pk")
+        )
+        self.validate_schedule(validated_data)
+
+    @transaction.atomic
+    def create(self, validated_data):
+        self.lock_schedule(validated_data)
+        return super().create(validated_data)
+
+    @transaction.atomic
+    def update(self, instance, validated_data):
+        self.lock_schedule(validated_data)
+        return super().update(instance, validated_data)
+
+
+class ScheduleWindowSerializer(serializers.Serializer):
+    start = serializers.DateTimeField()
+    end = serializers.DateTimeField()
+
+    def validate(self, attrs):
+        if attrs["end"] <= attrs["start"]:
+            raise serializers.ValidationError(
+                {"end": "end must be after start"}
+            )
+        return attrs
+
+
+class FlightQuerySerializer(serializers.Serializer):
+    airborne_at = serializers.DateTimeField(required=False)
+    overlaps = serializers.CharField(required=False)
+    min_capacity = serializers.IntegerField(min_value=0, required=False)
+    min_available = serializers.IntegerField(min_value=0, required=False)
+
+    def validate_overlaps(self, value):
+        start, _, end = value.partition(",")
+        window = ScheduleWindowSerializer(data={"start": start, "end": end})
+        if not window.is_valid():
+            raise serializers.ValidationError(window.errors)
+        return window.validated_data["start"], window.validated_data["end"]
+
+
+class FlightRetrieveSerializer(SparseFieldsetMixin, FlightSerializer):
+    route = FlightRouteSerializer()
     airplane = AirplaneRetrieveSerializer()
     crew = CrewRetrieveSerializer(many=True)
 
+    expandable_fields = {
+        "route": Expandable(
+            FlightRouteSerializer, select=("source", "destination")
+        ),
+        "airplane": Expandable(
+            AirplaneRetrieveSerializer, select=("airplane_type",)
+        ),
+        "crew": Expandable(CrewRetrieveSerializer, many=True),
+    }
+
 
-class FlightListSerializer(serializers.ModelSerializer):
+class FlightListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     route = serializers.CharField(source="route.__str__", read_only=True, )
     airplane = serializers.SlugRelatedField(
         slug_field="airplane_name", read_only=True, )
@@ -268,6 +532,12 @@ class FlightListSerializer(serializers.ModelSerializer):
     )
     tickets_available = serializers.IntegerField(read_only=True)
 
+    related_fields = {
+        "route": ("route__source", "route__destination"),
+        "airplane": ("airplane",),
+        "airplane_num_seats": ("airplane",),
+    }
+
     class Meta:
         model = Flight
         fields = [
@@ -282,9 +552,17 @@ class FlightListSerializer(serializers.ModelSerializer):
 
 
 class TicketSerializer(serializers.ModelSerializer):
+    flight = PrefetchedPrimaryKeyRelatedField(
+        prefetch_key="flights",
+        queryset=Flight.objects.select_related("airplane"),
+    )
+
     class Meta:
         model = Ticket
         fields = ["id", "seat_row", "seat_number", "flight"]
+        # Taken seats are checked by `OrderSerializer` for all tickets at
+        # once.
+        validators = []
 
     def validate(self, attrs):
         data = super(TicketSerializer, self).validate(attrs)
@@ -298,18 +576,46 @@ class TicketSerializer(serializers.ModelSerializer):
         return data
 
 
-class TicketRetrieveSerializer(TicketSerializer):
+class TicketRetrieveSerializer(SparseFieldsetMixin, TicketSerializer):
     flight = FlightListSerializer()
 
+    expandable_fields = {"flight": Expandable(FlightListSerializer)}
 
-class OrderListRetrieveSerializer(serializers.ModelSerializer):
+
+class OrderListRetrieveSerializer(
+    SparseFieldsetMixin,
+    serializers.ModelSerializer
+):
     tickets = TicketRetrieveSerializer(many=True)
 
+    expandable_fields = {
+        "tickets": Expandable(TicketRetrieveSerializer, many=True),
+    }
+
     class Meta:
         model = Order
         fields = ["id", "order_created_at", "tickets"]
 
 
+class OrderSummarySerializer(
+    SparseFieldsetMixin,
+    serializers.ModelSerializer
+):
+    id = serializers.IntegerField(source="order_id", read_only=True)
+
+    class Meta:
+        model = OrderSummary
+        fields = [
+            "id",
+            "order_created_at",
+            "ticket_count",
+            "first_departure",
+            "source_names",
+            "destination_names",
+            "flight_ids",
+        ]
+
+
 class OrderSerializer(serializers.ModelSerializer):
     tickets = TicketSerializer(many=True)
 
@@ -317,17 +623,74 @@ class OrderSerializer(serializers.ModelSerializer):
         model = Order
         fields = ["id", "order_created_at", "tickets"]
 
+    def to_internal_value(self, data):
+        # The flights of every ticket, with the airplanes their seats are
+        # checked against, in one query.
+        tickets = data.get("tickets") if hasattr(data, "get") else None
+        if isinstance(tickets, list):
+            self.context["flights"] = (
+                Flight.objects.select_related("airplane").in_bulk(
+                    ticket["flight"]
+                    for ticket in tickets
+                    if isinstance(ticket, dict)
+                    and type(ticket.get("flight")) is int
+                )
+            )
+        return super().to_internal_value(data)
+
+    def validate_tickets(self, tickets):
+        flights = [ticket["flight"] for ticket in tickets]
+        if flights and being_deleted(
+            {flight.route_id for flight in flights},
+            {flight.airplane_id for flight in flights},
+        ):
+            raise serializers.ValidationError(
+                "Tickets can't be booked on flights that are being deleted."
+            )
+        self.validate_seats_are_free(tickets)
+        return tickets
+
+    def validate_seats_are_free(self, tickets):
+        seats = [
+            (ticket["flight"].id, ticket["seat_number"]) for ticket in tickets
+        ]
+        # The order's own tickets are replaced on update.
+        taken = set(
+            Ticket.objects.filter(
+                flight_id__in={flight_id for flight_id, _ in seats},
+                seat_number__in={seat_number for _, seat_number in seats},
+            )
+            .exclude(order_id=getattr(self.instance, "id", None))
+            .values_list("flight_id", "seat_number")
+        )
+        errors = []
+        for seat in seats:
+            if seat in taken:
+                errors.append({"non_field_errors": [
+                    "The fields seat_number, flight must make a unique set."
+                ]})
+            else:
+                errors.append({})
+            taken.add(seat)
+        if any(errors):
+            raise serializers.ValidationError(errors, code="unique")
+
     @transaction.atomic
     def create(self, validated_data):
         tickets_data = validated_data.pop("tickets", [])
         order = Order.objects.create(**validated_data)
-        Ticket.objects.bulk_create(
+        tickets = Ticket.objects.bulk_create(
             [
                 Ticket(
                     order=order, **ticket_data)
                 for ticket_data in tickets_data
             ]
         )
+        send_tickets_changed(
+            Order,
+            order.id,
+            Counter(ticket.flight_id for ticket in tickets)
+        )
         return order
 
     @transaction.atomic
@@ -337,11 +700,102 @@ class OrderSerializer(serializers.ModelSerializer):
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
         instance.save()
+        deltas = Counter({
+            flight_id: -seats
+            for flight_id, seats in tickets_by_flight(instance).items()
+        })
         instance.tickets.all().delete()
-        Ticket.objects.bulk_create(
+        tickets = Ticket.objects.bulk_create(
             [
                 Ticket(order=instance, **ticket_data)
                 for ticket_data in tickets_data
             ]
         )
+        deltas.update(ticket.flight_id for ticket in tickets)
+        send_tickets_changed(Order, instance.id, deltas)
         return instance
+
+
+def tickets_by_flight(order: Order) -> dict:
+    return dict(
+        order.tickets.values_list("flight_id")
+        .annotate(seats=Count("id"))
+        .order_by()
+    )
+
+
+class BatchSerializer(serializers.Serializer):
+    requests = serializers.ListField(
+        child=serializers.RegexField(r"^/", max_length=2000),
+        allow_empty=False,
+    )
+    concurrent = serializers.BooleanField(default=False)
+
+    def validate_requests(self, value):
+        limit = settings.BATCH["MAX_REQUESTS"]
+        if len(value) > limit:
+            raise serializers.ValidationError(
+                f"A batch can contain at most {limit} requests"
+            )
+        return value
+
+
+class SeatInventoryEventSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SeatInventoryEvent
+        fields = (
+            "id",
+            "position",
+            "flight_id",
+            "order_id",
+            "seats_delta",
+            "tickets_available",
+            "flight_deleted",
+            "created_at",
+        )
+
+
+class ChangesQuerySerializer(serializers.Serializer):
+    since = serializers.IntegerField(min_value=0, required=False)
+    timeout = serializers.FloatField(min_value=0, default=0)
+
+    def validate_timeout(self, value):
+        return min(value, settings.CHANGE_FEED["MAX_TIMEOUT"])
+
+
+class AutocompleteQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=100, trim_whitespace=False)
+    limit = serializers.IntegerField(min_value=1, required=False)
+
+    def validate_limit(self, value):
+        return min(value, settings.AUTOCOMPLETE["MAX_LIMIT"])
+
+
+class NearbyAirportsQuerySerializer(serializers.Serializer):
+    latitude = serializers.FloatField(min_value=-90, max_value=90)
+    longitude = serializers.FloatField(min_value=-180, max_value=180)
+    radius = serializers.FloatField(min_value=0, default=300)
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=20)
+
+    def validate_radius(self, value):
+        limit = settings.GEO["NEARBY_MAX_RADIUS_KM"]
+        if value > limit:
+            raise serializers.ValidationError(
+                f"Radius can be at most {limit} km"
+            )
+        return value
+
+
+class DeletionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Deletion
+        fields = (
+            "id",
+            "target",
+            "target_id",
+            "status",
+            "total_flights",
+            "deleted_flights",
+            "created_at",
+            "finished_at",
+        )
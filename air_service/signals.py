@@ -0,0 +1,48 @@
+from django.db.models import Count
+from django.db.models.signals import post_delete, pre_delete
+from django.dispatch import Signal, receiver
+
+# Sent whenever tickets are added to or removed from an order.
+# Receivers get `order_id` and `deltas`, a {flight_id: seats} mapping where
+# positive numbers are seats taken and negative numbers seats released.
+tickets_changed = Signal()
+
+
+def send_tickets_changed(sender, order_id: int, deltas: dict) -> None:
+    deltas = {
+        flight_id: delta
+        for flight_id, delta in deltas.items()
+        if delta
+    }
+    if deltas:
+        tickets_changed.send(sender=sender, order_id=order_id, deltas=deltas)
+
+
+# However an order goes, through the API, the admin or with its user, its
+# seats are released once. The seats are counted before its tickets go.
+@receiver(pre_delete, sender="air_service.Order")
+def count_released_seats(sender, instance, **kwargs):
+    instance._released_seats = dict(
+        instance.tickets.values_list("flight_id")
+        .annotate(seats=Count("id"))
+        .order_by()
+    )
+
+
+@receiver(post_delete, sender="air_service.Order")
+def send_released_seats(sender, instance, **kwargs):
+    send_tickets_changed(
+        sender,
+        instance.pk,
+        {
+            flight_id: -seats
+            for flight_id, seats in getattr(
+                instance, "_released_seats", {}
+            ).items()
+        },
+    )
+
+
+# Sent with `flight_ids` when flights are deleted by the database, which
+# cascades to their tickets without `post_delete` or `tickets_changed`.
+flights_deleted = Signal()
@@ -0,0 +1,238 @@
+import contextvars
+import hashlib
+import itertools
+import logging
+import os
+import queue
+import random
+import re
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# The request whose view issued the statement, set by SlowQueryMiddleware.
+current_request = contextvars.ContextVar("current_request", default=None)
+# Set on the explain thread, whose own statements are never captured.
+_explaining = threading.local()
+
+STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+WHITESPACE = re.compile(r"\s+")
+# Plain EXPLAIN does not run the statement, ANALYZE only runs reads.
+EXPLAINED = re.compile(r"\s*(SELECT|WITH)\b", re.IGNORECASE)
+ANALYZED = re.compile(r"\s*SELECT\b", re.IGNORECASE)
+# Reads that take locks or have side effects, running them again for a
+# plan would block bookings, wake listeners or burn sequence values.
+NOT_ANALYZED = re.compile(
+    r"\bFOR\s+(NO\s+KEY\s+UPDATE|UPDATE|KEY\s+SHARE|SHARE)\b"
+    r"|\b(pg_(try_)?advisory\w*|pg_notify|nextval|setval|set_config"
+    r"|pg_sleep\w*|pg_cancel_backend|pg_terminate_backend)\s*\(",
+    re.IGNORECASE,
+)
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    Replace literals and placeholders by `?` and collapse `IN` lists, so
+    the same statement with other values has the same text.
+    """
+    sql = STRING_LITERAL.sub("?", sql)
+    sql = NUMBER_LITERAL.sub("?", sql)
+    sql = sql.replace("%s", "?")
+    sql = IN_LIST.sub("IN (...)", sql)
+    return WHITESPACE.sub(" ", sql).strip()
+
+
+def fingerprint(normalized_sql: str) -> str:
+    return hashlib.sha1(normalized_sql.encode()).hexdigest()[:16]
+
+
+def view_name():
+    request = current_request.get()
+    match = getattr(request, "resolver_match", None)
+    return match.view_name if match else None
+
+
+class SlowQueryLog:
+    """
+    Ring buffer of the last `SLOW_QUERIES["BUFFER_SIZE"]` slow statements
+    of this worker.
+
+    Plans are captured by a background thread, at most once per
+    fingerprint every `EXPLAIN_INTERVAL` seconds, and shared by every
+    entry with that fingerprint.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = deque(maxlen=settings.SLOW_QUERIES["BUFFER_SIZE"])
+        self._ids = itertools.count(1)
+        self._plans = {}
+        self._explained_at = {}
+        self._queue = None
+        self._thread = None
+
+    def record(self, sql, params, many, duration, alias):
+        normalized = normalize_sql(sql)
+        key = fingerprint(normalized)
+        entry = {
+            "id": next(self._ids),
+            "time": timezone.now(),
+            "worker": os.getpid(),
+            "view": view_name(),
+            "database": alias,
+            "duration_ms": round(duration * 1000, 2),
+            "fingerprint": key,
+            "sql": normalized,
+        }
+        config = settings.SLOW_QUERIES
+        now = time.monotonic()
+        with self._lock:
+            self._entries.append(entry)
+            explain = (
+                not many
+                and EXPLAINED.match(sql)
+                and now - self._explained_at.get(key, -1e9)
+                >= config["EXPLAIN_INTERVAL"]
+            )
+            if explain:
+                self._explained_at[key] = now
+        if explain:
+            analyze = (
+                bool(ANALYZED.match(sql))
+                and not NOT_ANALYZED.search(sql)
+                and random.random() < config["EXPLAIN_ANALYZE_SAMPLE_RATE"]
+            )
+            self._enqueue((key, alias, sql, params, analyze))
+
+    def _enqueue(self, job):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._queue = queue.Queue(
+                        maxsize=settings.SLOW_QUERIES["EXPLAIN_QUEUE_SIZE"]
+                    )
+                    self._thread = threading.Thread(
+                        target=self._run,
+                        name="slow-query-explain",
+                        daemon=True,
+                    )
+                    self._thread.start()
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            pass
+
+    def _run(self):
+        _explaining.active = True
+        while True:
+            key, alias, sql, params, analyze = self._queue.get()
+            try:
+                plan = self.explain(alias, sql, params, analyze)
+                with self._lock:
+                    self._plans[key] = {"plan": plan, "analyzed": analyze}
+            except Exception:
+                logger.warning("Could not explain %s", key, exc_info=True)
+            finally:
+                if self._queue.empty():
+                    # Slow queries are rare, do not hold a connection.
+                    connections.close_all()
+                self._queue.task_done()
+
+    @staticmethod
+    def explain(alias, sql, params, analyze):
+        """
+        Plan `sql` in a read-only transaction that is rolled back, so
+        whatever ANALYZE runs can't write.
+        """
+        options = "ANALYZE, BUFFERS" if analyze else "COSTS"
+        with transaction.atomic(using=alias):
+            with connections[alias].cursor() as cursor:
+                cursor.execute("SET TRANSACTION READ ONLY")
+                cursor.execute(
+                    "SELECT set_config('statement_timeout', %s, true)",
+                    [str(settings.SLOW_QUERIES["EXPLAIN_TIMEOUT_MS"])],
+                )
+                cursor.execute(f"EXPLAIN ({options}) {sql}", params)
+                plan = "\n".join(row[0] for row in cursor.fetchall())
+            transaction.set_rollback(True, using=alias)
+        return plan
+
+    def wait_for_plans(self):
+        if self._queue is not None:
+            self._queue.join()
+
+    def entries(self):
+        """Newest first, each with the latest plan of its fingerprint."""
+        with self._lock:
+            entries = list(reversed(self._entries))
+            fingerprints = {entry["fingerprint"] for entry in entries}
+            # Plans of statements that left the buffer are not kept.
+            for key in list(self._plans):
+                if key not in fingerprints:
+                    del self._plans[key]
+                    self._explained_at.pop(key, None)
+            return [
+                {**entry, **self._plans.get(
+                    entry["fingerprint"], {"plan": None, "analyzed": False}
+                )}
+                for entry in entries
+            ]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._plans.clear()
+            self._explained_at.clear()
+
+
+slow_query_log = None
+
+
+def get_log():
+    global slow_query_log
+    if slow_query_log is None:
+        slow_query_log = SlowQueryLog()
+    return slow_query_log
+
+
+def _reset_log():
+    # The explain thread does not survive a fork.
+    global slow_query_log
+    slow_query_log = None
+
+
+os.register_at_fork(after_in_child=_reset_log)
+
+
+def capture_slow_queries(execute, sql, params, many, context):
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = time.perf_counter() - started
+        if (
+            duration * 1000 >= settings.SLOW_QUERIES["THRESHOLD_MS"]
+            and not getattr(_explaining, "active", False)
+        ):
+            get_log().record(
+                sql, params, many, duration, context["connection"].alias
+            )
+
+
+@receiver(connection_created)
+def install_slow_query_capture(sender, connection, **kwargs):
+    if (
+        settings.SLOW_QUERIES["ENABLED"]
+        and capture_slow_queries not in connection.execute_wrappers
+    ):
+        connection.execute_wrappers.append(capture_slow_queries)
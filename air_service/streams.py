@@ -0,0 +1,310 @@
+import asyncio
+import json
+import logging
+import os
+from collections import defaultdict
+
+import psycopg
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connection
+from django.db.models import Count, F
+
+from air_service.changes import (
+    CHANNEL,
+    acquire_waiter,
+    events_since,
+    latest_cursor,
+    listen_connection_params,
+    poll_events,
+    release_waiter,
+)
+from air_service.models import Flight
+
+logger = logging.getLogger(__name__)
+
+# Queued in place of events when a subscriber falls too far behind.
+LAGGED = object()
+
+
+async def run_query(func, *args):
+    """
+    Run ORM code for a stream on the shared executor and close the
+    connection it used.
+
+    The thread sensitive default would give every open stream a thread and
+    a database connection for as long as it stays open.
+    """
+
+    def run():
+        try:
+            return func(*args)
+        finally:
+            connection.close()
+
+    return await sync_to_async(run, thread_sensitive=False)()
+
+
+class Subscription:
+    def __init__(self, flight_id, queue_size):
+        self.flight_id = flight_id
+        self.queue = asyncio.Queue(maxsize=queue_size)
+
+    def push(self, event):
+        """Queue `event`, return False when the subscriber is too slow."""
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Free the queue for the marker, the client reconnects with
+            # Last-Event-ID and catches up from the outbox instead.
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(LAGGED)
+            return False
+        return True
+
+
+class SeatStreamHub:
+    """
+    Per-process fan-out of seat inventory events to open streams.
+
+    A single LISTEN connection and a single outbox query per notification
+    serve every subscriber in the process, whatever their number. The hub
+    runs on the event loop of the first subscriber and stops when the last
+    one leaves.
+    """
+
+    reconnect_delay = 1
+
+    def __init__(self):
+        self._subscribers = defaultdict(set)
+        self._task = None
+        self._ready = None
+        self._cursor = None
+
+    @property
+    def subscriber_count(self):
+        return sum(len(group) for group in self._subscribers.values())
+
+    def subscribe(self, flight_id):
+        subscription = Subscription(
+            flight_id, settings.SEAT_STREAM["QUEUE_SIZE"]
+        )
+        self._subscribers[flight_id].add(subscription)
+        if self._task is None or self._task.done():
+            self._ready = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return subscription
+
+    async def wait_until_listening(self, timeout):
+        """
+        Wait up to `timeout` seconds for the LISTEN connection and return
+        whether it is up. Events committed after it is reach every
+        subscriber.
+        """
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def unsubscribe(self, subscription):
+        group = self._subscribers.get(subscription.flight_id)
+        if group is not None:
+            group.discard(subscription)
+            if not group:
+                del self._subscribers[subscription.flight_id]
+        if not self._subscribers and self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def publish(self, events):
+        for event in events:
+            for subscription in list(
+                self._subscribers.get(event.flight_id, ())
+            ):
+                if not subscription.push(event):
+                    self.unsubscribe(subscription)
+
+    async def _catch_up(self):
+        limit = settings.CHANGE_FEED["MAX_EVENTS"]
+        while True:
+            events = await run_query(events_since, self._cursor, limit)
+            if events:
+                self._cursor = events[-1].position
+                self.publish(events)
+            if len(events) < limit:
+                return
+
+    async def _run(self):
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(
+                    **listen_connection_params(), autocommit=True
+                ) as listen_connection:
+                    await listen_connection.execute(f"LISTEN {CHANNEL}")
+                    # Read the cursor after LISTEN, events committed in
+                    # between are picked up by the first notification.
+                    if self._cursor is None:
+                        self._cursor = await run_query(latest_cursor)
+                    await self._catch_up()
+                    self._ready.set()
+                    async for _ in listen_connection.notifies():
+                        await self._catch_up()
+            except Exception:
+                # Database errors from the ORM queries as well, the task
+                # must outlive them or no stream would ever start.
+                logger.exception("Seat stream listener failed")
+                await asyncio.sleep(self.reconnect_delay)
+
+
+hub = SeatStreamHub()
+
+
+def _reset_hub():
+    # The hub belongs to the event loop of the process that created it.
+    global hub
+    hub = SeatStreamHub()
+
+
+os.register_at_fork(after_in_child=_reset_hub)
+
+
+def snapshot(flight_id):
+    # The cursor is read first: events committed in between are sent again,
+    # which is harmless as they carry the absolute availability.
+    cursor = latest_cursor()
+    available = (
+        Flight.objects.filter(pk=flight_id)
+        .annotate(
+            tickets_available=F("airplane__capacity") - Count("tickets")
+        )
+        .values_list("tickets_available", flat=True)
+        .get()
+    )
+    return cursor, available
+
+
+def format_event(data, event=None, event_id=None):
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event is not None:
+        lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data)}")
+    return "\n".join(lines) + "\n\n"
+
+
+def seat_event(event):
+    if event.flight_deleted:
+        return format_event(
+            {"flight": event.flight_id},
+            event="deleted",
+            event_id=event.position,
+        )
+    return format_event(
+        {
+            "flight": event.flight_id,
+            "seats_delta": event.seats_delta,
+            "tickets_available": event.tickets_available,
+            "created_at": event.created_at.isoformat(),
+        },
+        event="seats",
+        event_id=event.position,
+    )
+
+
+def snapshot_event(flight_id, cursor, available):
+    return format_event(
+        {"flight": flight_id, "tickets_available": available},
+        event="snapshot",
+        event_id=cursor,
+    )
+
+
+def retry_line():
+    return (
+        f"retry: {settings.SEAT_STREAM['RETRY']}\n"
+        f": worker {os.getpid()}\n\n"
+    )
+
+
+async def seat_stream(flight_id, last_event_id=None):
+    """
+    Server-sent events for one flight.
+
+    New clients get a `snapshot` with the current availability, clients
+    reconnecting with Last-Event-ID get the events they missed instead.
+    Comment lines keep idle connections open through proxies. While the
+    listener is down, streams end after the retry line and the client
+    reconnects. A `deleted` event ends the stream of a deleted flight.
+    """
+    config = settings.SEAT_STREAM
+    subscription = hub.subscribe(flight_id)
+    try:
+        yield retry_line()
+        if not await hub.wait_until_listening(config["LISTEN_TIMEOUT"]):
+            return
+        if last_event_id is None:
+            sent, available = await run_query(snapshot, flight_id)
+            yield snapshot_event(flight_id, sent, available)
+        else:
+            sent = last_event_id
+            limit = settings.CHANGE_FEED["MAX_EVENTS"]
+            missed = [None] * limit
+            while len(missed) == limit:
+                missed = await run_query(events_since, sent, limit, flight_id)
+                for event in missed:
+                    yield seat_event(event)
+                    if event.flight_deleted:
+                        return
+                    sent = event.position
+        while True:
+            try:
+                event = await asyncio.wait_for(
+                    subscription.queue.get(), config["HEARTBEAT"]
+                )
+            except asyncio.TimeoutError:
+                yield ": heartbeat\n\n"
+                continue
+            if event is LAGGED:
+                return
+            if event.position > sent:
+                yield seat_event(event)
+                if event.flight_deleted:
+                    return
+                sent = event.position
+    finally:
+        hub.unsubscribe(subscription)
+
+
+def sync_seat_stream(flight_id, last_event_id=None):
+    """
+    `seat_stream` for WSGI workers, following the change feed listener.
+
+    An open stream holds a worker thread and one of the change feed waiter
+    slots. When they are all taken the stream ends at once and the client
+    reconnects after the retry delay.
+    """
+    yield retry_line()
+    if not acquire_waiter():
+        return
+    try:
+        if last_event_id is None:
+            sent, available = snapshot(flight_id)
+            yield snapshot_event(flight_id, sent, available)
+        else:
+            sent = last_event_id
+        while True:
+            events = poll_events(
+                sent, settings.SEAT_STREAM["HEARTBEAT"], flight_id
+            )
+            if not events:
+                yield ": heartbeat\n\n"
+            for event in events:
+                yield seat_event(event)
+                if event.flight_deleted:
+                    return
+                sent = event.position
+    finally:
+        release_waiter()
@@ -0,0 +1,196 @@
+from collections import defaultdict
+from functools import reduce
+from itertools import islice
+from operator import or_
+
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from air_service.models import (
+    Airport,
+    Flight,
+    Order,
+    OrderSummary,
+    Route,
+    Ticket,
+)
+from air_service.signals import flights_deleted, tickets_changed
+from jobs.tasks import enqueue_on_commit, task
+
+NAME_SEPARATOR = ", "
+SUMMARY_FIELDS = [
+    "user_id",
+    "order_created_at",
+    "ticket_count",
+    "first_departure",
+    "source_names",
+    "destination_names",
+    "flight_ids",
+]
+
+
+def summarize(orders, tickets):
+    """
+    Yield the summary fields of each order.
+
+    `orders` holds `(id, user_id, order_created_at)` rows and `tickets`
+    `(order_id, flight_id, departure, source_name, destination_name)`
+    rows sorted by departure.
+    """
+    legs = defaultdict(list)
+    for order_id, *leg in tickets:
+        legs[order_id].append(leg)
+    for order_id, user_id, order_created_at in orders:
+        order_legs = legs.get(order_id, [])
+        yield {
+            "order_id": order_id,
+            "user_id": user_id,
+            "order_created_at": order_created_at,
+            "ticket_count": len(order_legs),
+            "first_departure": order_legs[0][1] if order_legs else None,
+            "source_names": NAME_SEPARATOR.join(
+                dict.fromkeys(leg[2] for leg in order_legs)
+            ),
+            "destination_names": NAME_SEPARATOR.join(
+                dict.fromkeys(leg[3] for leg in order_legs)
+            ),
+            "flight_ids": list(dict.fromkeys(leg[0] for leg in order_legs)),
+        }
+
+
+def ticket_rows(tickets):
+    return tickets.order_by(
+        "flight__departure_datetime", "flight_id", "id"
+    ).values_list(
+        "order_id",
+        "flight_id",
+        "flight__departure_datetime",
+        "flight__route__source__airport_name",
+        "flight__route__destination__airport_name",
+    )
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+@task
+@transaction.atomic
+def refresh_order_summaries(order_ids, batch_size=1000) -> int:
+    """Recompute the summaries of `order_ids`, returns how many exist."""
+    refreshed = 0
+    for batch in batched(sorted(set(order_ids)), batch_size):
+        summaries = [
+            OrderSummary(**fields)
+            for fields in summarize(
+                Order.objects.filter(id__in=batch).values_list(
+                    "id", "user_id", "order_created_at"
+                ),
+                ticket_rows(Ticket.objects.filter(order_id__in=batch)),
+            )
+        ]
+        OrderSummary.objects.bulk_create(
+            summaries,
+            update_conflicts=True,
+            unique_fields=["order"],
+            update_fields=SUMMARY_FIELDS,
+        )
+        refreshed += len(summaries)
+    return refreshed
+
+
+def rebuild_all(batch_size=1000) -> int:
+    return refresh_order_summaries(
+        Order.objects.values_list("id", flat=True), batch_size=batch_size
+    )
+
+
+def orders_on(flights: Q) -> list:
+    return list(
+        Ticket.objects.filter(flights)
+        .values_list("order_id", flat=True)
+        .distinct()
+    )
+
+
+@task
+def refresh_summaries_on(lookups: list) -> int:
+    """Refresh the orders with tickets matching any of the ticket lookups."""
+    return refresh_order_summaries(
+        orders_on(reduce(or_, (Q(**lookup) for lookup in lookups)))
+    )
+
+
+@task
+def refresh_summaries_of_flights(flight_ids: list) -> int:
+    """Refresh the orders summarized with any of the flights."""
+    return refresh_order_summaries(
+        OrderSummary.objects.filter(flight_ids__overlap=flight_ids)
+        .values_list("order_id", flat=True)
+    )
+
+
+@receiver(post_save, sender=Order)
+def create_order_summary(sender, instance, created, **kwargs):
+    if created:
+        OrderSummary.objects.create(
+            order=instance,
+            user_id=instance.user_id,
+            order_created_at=instance.order_created_at,
+        )
+
+
+# The order's own tickets are summarized in the booking transaction, so
+# the history is up to date as soon as the booking returns.
+@receiver(tickets_changed)
+def update_order_summary(sender, order_id, **kwargs):
+    refresh_order_summaries([order_id])
+
+
+# Schedule and airport changes can touch many orders, those are refreshed
+# by background jobs like the reports; `rebuild_order_summaries` repairs
+# drift.
+@receiver(post_save, sender=Flight)
+def update_flight_order_summaries(sender, instance, created, **kwargs):
+    if not created:
+        enqueue_on_commit(
+            refresh_summaries_on, lookups=[{"flight": instance.pk}]
+        )
+
+
+@receiver(post_save, sender=Route)
+def update_route_order_summaries(sender, instance, created, **kwargs):
+    if not created:
+        enqueue_on_commit(
+            refresh_summaries_on, lookups=[{"flight__route": instance.pk}]
+        )
+
+
+@receiver(post_save, sender=Airport)
+def update_airport_order_summaries(sender, instance, created, **kwargs):
+    if not created:
+        enqueue_on_commit(
+            refresh_summaries_on,
+            lookups=[
+                {"flight__route__source": instance.pk},
+                {"flight__route__destination": instance.pk},
+            ],
+        )
+
+
+# Deleting flights cascades to their tickets without sending
+# `tickets_changed`, the orders are found by the flights in their summary.
+@receiver(post_delete, sender=Flight)
+def update_deleted_flight_order_summaries(sender, instance, **kwargs):
+    enqueue_on_commit(
+        refresh_summaries_of_flights, flight_ids=[instance.pk]
+    )
+
+
+@receiver(flights_deleted)
+def update_cascaded_flight_order_summaries(sender, flight_ids, **kwargs):
+    enqueue_on_commit(refresh_summaries_of_flights, flight_ids=flight_ids)
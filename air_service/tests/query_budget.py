@@ -0,0 +1,58 @@
+from collections import Counter
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from air_service.slow_queries import normalize_sql
+
+
+def repeated_statements(queries, limit=5):
+    """The statements run more than once, as a readable report."""
+    counts = Counter(normalize_sql(query["sql"]) for query in queries)
+    return "\n".join(
+        f"  {count}x {sql[:300]}"
+        for sql, count in counts.most_common(limit)
+        if count > 1
+    )
+
+
+class QueryBudgetMixin:
+    """
+    Assertions on the number of statements a block runs, for TestCase.
+
+    `assertQueryBudget` caps a single run. `assertConstantQueries` grows
+    the data between runs and fails when the count grows with it, which
+    is how an N+1 shows up.
+    """
+
+    def assertQueryBudget(self, budget, func, *args, **kwargs):
+        with CaptureQueriesContext(connection) as context:
+            result = func(*args, **kwargs)
+        if len(context) > budget:
+            self.fail(
+                f"{len(context)} queries, over the budget of {budget}:\n"
+                + "\n".join(
+                    f"  {query['sql'][:300]}"
+                    for query in context.captured_queries
+                )
+            )
+        return result
+
+    def assertConstantQueries(self, request, seed, sizes=(1, 3, 9)):
+        """
+        Call `seed(size)` for each size, which grows the data to that size,
+        then `request()`. Every request must run as many statements.
+        """
+        counts = []
+        for size in sizes:
+            seed(size)
+            with CaptureQueriesContext(connection) as context:
+                request()
+            counts.append(len(context))
+            if counts[-1] != counts[0]:
+                self.fail(
+                    f"Query count grows with the data: "
+                    f"{dict(zip(sizes, counts))}\n"
+                    + repeated_statements(context.captured_queries)
+                )
+        return counts[0]
@@ -0,0 +1,98 @@
+from datetime import datetime, timedelta, timezone
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from air_service.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    City,
+    Country,
+    Flight,
+    Order,
+    Route,
+    Ticket,
+)
+
+
+class AdminTestCase(TestCase):
+    def setUp(self):
+        self.admin = get_user_model().objects.create_superuser(
+            username="admin", password="password123"
+        )
+        self.client.force_login(self.admin)
+        country = Country.objects.create(country_name="Ukraine")
+        city = City.objects.create(city_name="Kyiv", country=country)
+        self.route = Route.objects.create(
+            source=Airport.objects.create(airport_name="Kyiv", city=city),
+            destination=Airport.objects.create(
+                airport_name="Lviv", city=city
+            ),
+            distance=500,
+        )
+        self.airplane = Airplane.objects.create(
+            airplane_name="Airplane1",
+            rows=10,
+            seats_in_row=10,
+            airplane_type=AirplaneType.objects.create(type_name="A320"),
+        )
+        self.order = Order.objects.create(user=self.admin)
+        self.seat = 0
+
+    def add_tickets(self, count):
+        for _ in range(count):
+            departure = datetime(2025, 12, 10, tzinfo=timezone.utc)
+            flight = Flight.objects.create(
+                route=self.route,
+                airplane=self.airplane,
+                departure_datetime=departure,
+                arrival_datetime=departure + timedelta(hours=1),
+            )
+            self.seat += 1
+            Ticket.objects.create(
+                seat_row=1,
+                seat_number=self.seat,
+                flight=flight,
+                order=self.order,
+            )
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context)
+
+    def assert_constant_queries(self, url):
+        self.add_tickets(2)
+        # Warm up per-process caches such as content types.
+        self.count_queries(url)
+        queries = self.count_queries(url)
+        self.add_tickets(8)
+        self.assertEqual(self.count_queries(url), queries)
+
+    def test_ticket_changelist_queries_are_constant(self):
+        self.assert_constant_queries(
+            reverse("admin:air_service_ticket_changelist")
+        )
+
+    def test_flight_changelist_queries_are_constant(self):
+        self.assert_constant_queries(
+            reverse("admin:air_service_flight_changelist")
+        )
+
+    def test_order_change_form_queries_are_constant(self):
+        self.assert_constant_queries(
+            reverse("admin:air_service_order_change", args=[self.order.id])
+        )
+
+    def test_ticket_change_form_does_not_list_flights(self):
+        self.add_tickets(1)
+        ticket = Ticket.objects.get()
+        url = reverse("admin:air_service_ticket_change", args=[ticket.id])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, "<select name=\"flight\"")
@@ -0,0 +1,101 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from air_service.autocomplete import autocomplete_index, normalize
+from air_service.models import Airport, City, Country
+
+AUTOCOMPLETE_URL = reverse("air_service:autocomplete")
+
+AUTOCOMPLETE = {
+    "LIMIT": 10,
+    "MAX_LIMIT": 50,
+    "VERSION_CHECK_INTERVAL": 0,
+}
+
+
+@override_settings(AUTOCOMPLETE=AUTOCOMPLETE)
+class AutocompleteTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        autocomplete_index.invalidate()
+        self.user = get_user_model().objects.create_user(
+            username="testuser", password="password123"
+        )
+        self.ukraine = Country.objects.create(country_name="Ukraine")
+        self.kyiv = City.objects.create(
+            city_name="Kyiv", country=self.ukraine
+        )
+        self.lviv = City.objects.create(
+            city_name="Lviv", country=self.ukraine
+        )
+        self.boryspil = Airport.objects.create(
+            airport_name="Boryspil International", city=self.kyiv
+        )
+        self.lviv_airport = Airport.objects.create(
+            airport_name="Danylo Halytskyi Lviv International",
+            city=self.lviv,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def search(self, q, **params):
+        response = self.client.get(AUTOCOMPLETE_URL, {"q": q, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [
+            (result["type"], result["id"])
+            for result in response.data["results"]
+        ]
+
+    def test_normalize(self):
+        self.assertEqual(normalize("  Zürich   Airport "), "zurich airport")
+
+    def test_prefix_of_any_word(self):
+        self.assertEqual(
+            self.search("LVI"),
+            [("city", self.lviv.id), ("airport", self.lviv_airport.id)],
+        )
+        self.assertEqual(
+            self.search("intern"),
+            [
+                ("airport", self.boryspil.id),
+                ("airport", self.lviv_airport.id),
+            ],
+        )
+
+    def test_results_have_context(self):
+        response = self.client.get(AUTOCOMPLETE_URL, {"q": "bory"})
+        self.assertEqual(
+            response.data["results"],
+            [
+                {
+                    "type": "airport",
+                    "id": self.boryspil.id,
+                    "name": "Boryspil International",
+                    "detail": "Kyiv, Ukraine",
+                }
+            ],
+        )
+
+    def test_limit(self):
+        self.assertEqual(len(self.search("i", limit=1)), 1)
+
+    def test_query_is_required(self):
+        response = self.client.get(AUTOCOMPLETE_URL)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_searches_run_no_queries(self):
+        self.search("ky")
+        with self.assertNumQueries(0):
+            self.search("kyi")
+
+    def test_index_is_refreshed_after_changes(self):
+        self.assertEqual(self.search("odes"), [])
+        with self.captureOnCommitCallbacks(execute=True):
+            odesa = City.objects.create(
+                city_name="Odesa", country=self.ukraine
+            )
+        self.assertEqual(self.search("odes"), [("city", odesa.id)])
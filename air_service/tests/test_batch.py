@@ -0,0 +1,188 @@
+from datetime import datetime, timezone
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import TestCase, TransactionTestCase, override_settings
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from air_service.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    City,
+    Country,
+    Flight,
+    Route,
+)
+from air_service.throttling import SlidingWindowRateThrottle
+from air_service.views import FlightViewSet
+
+BATCH_URL = reverse("air_service:batch")
+
+
+def create_flight():
+    country = Country.objects.create(country_name="Ukraine")
+    city = City.objects.create(city_name="Kyiv", country=country)
+    return Flight.objects.create(
+        route=Route.objects.create(
+            source=Airport.objects.create(airport_name="Kyiv", city=city),
+            destination=Airport.objects.create(
+                airport_name="Lviv", city=city
+            ),
+            distance=500,
+        ),
+        airplane=Airplane.objects.create(
+            airplane_name="Airplane1",
+            rows=10,
+            seats_in_row=6,
+            airplane_type=AirplaneType.objects.create(type_name="A320"),
+        ),
+        departure_datetime=datetime(2025, 12, 10, 8, tzinfo=timezone.utc),
+        arrival_datetime=datetime(2025, 12, 10, 10, tzinfo=timezone.utc),
+    )
+
+
+class BatchTestCase(TestCase):
+    def setUp(self):
+        caches["throttle"].clear()
+        self.user = get_user_model().objects.create_user(
+            username="testuser", password="password123"
+        )
+        self.flight = create_flight()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def batch(self, urls, **data):
+        return self.client.post(
+            BATCH_URL, {"requests": urls, **data}, format="json"
+        )
+
+    def test_batch_returns_every_response(self):
+        urls = [
+            reverse("air_service:flight-detail", args=[self.flight.id]),
+            reverse("air_service:route-detail", args=[self.flight.route_id]),
+            reverse("air_service:order-list") + "?source=Kyiv",
+        ]
+        response = self.batch(urls)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        for url, item in zip(urls, response.data["responses"]):
+            direct = self.client.get(url)
+            self.assertEqual(item["url"], url)
+            self.assertEqual(item["status"], status.HTTP_200_OK)
+            self.assertEqual(item["body"], direct.data)
+
+    def test_permissions_apply_per_request(self):
+        response = self.batch([
+            reverse("air_service:flight-conflicts")
+            + "?start=2025-12-10T00:00:00Z&end=2025-12-11T00:00:00Z",
+            reverse("air_service:flight-list"),
+        ])
+        self.assertEqual(
+            [item["status"] for item in response.data["responses"]],
+            [status.HTTP_403_FORBIDDEN, status.HTTP_200_OK]
+        )
+
+    def test_only_air_service_endpoints_can_be_batched(self):
+        response = self.batch([
+            reverse("user:manage_user"),
+            "/api/v1/unknown/",
+        ])
+        self.assertEqual(
+            [item["status"] for item in response.data["responses"]],
+            [status.HTTP_404_NOT_FOUND, status.HTTP_404_NOT_FOUND]
+        )
+
+    def test_streams_can_not_be_batched(self):
+        response = self.batch([
+            reverse("air_service:flight-seat-stream", args=[self.flight.id]),
+            reverse("air_service:flight-list"),
+        ])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item["status"] for item in response.data["responses"]],
+            [status.HTTP_400_BAD_REQUEST, status.HTTP_200_OK]
+        )
+
+    def test_failing_request_does_not_fail_the_batch(self):
+        urls = [
+            reverse("air_service:flight-detail", args=[self.flight.id]),
+            reverse("air_service:route-detail", args=[self.flight.route_id]),
+            reverse("air_service:flight-list") + "?min_capacity=abc",
+        ]
+        with mock.patch.object(
+            FlightViewSet, "retrieve", side_effect=Flight.DoesNotExist
+        ), self.assertLogs("air_service.batch", "ERROR"):
+            response = self.batch(urls)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item["status"] for item in response.data["responses"]],
+            [
+                status.HTTP_500_INTERNAL_SERVER_ERROR,
+                status.HTTP_200_OK,
+                status.HTTP_400_BAD_REQUEST,
+            ]
+        )
+
+    @override_settings(BATCH={"MAX_REQUESTS": 2, "MAX_WORKERS": 1})
+    def test_batch_size_is_limited(self):
+        url = reverse("air_service:flight-list")
+        response = self.batch([url] * 3)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_batch_requires_authentication(self):
+        response = APIClient().post(
+            BATCH_URL,
+            {"requests": [reverse("air_service:flight-list")]},
+            format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @mock.patch.object(
+        SlidingWindowRateThrottle,
+        "THROTTLE_RATES",
+        {"anon": "100/min", "user": "100/min", "reference": "2/min"}
+    )
+    def test_throttles_apply_per_request(self):
+        url = reverse("air_service:route-list")
+        response = self.batch([url] * 3)
+        self.assertEqual(
+            [item["status"] for item in response.data["responses"]],
+            [
+                status.HTTP_200_OK,
+                status.HTTP_200_OK,
+                status.HTTP_429_TOO_MANY_REQUESTS,
+            ]
+        )
+
+
+@override_settings(BATCH={"MAX_REQUESTS": 10, "MAX_WORKERS": 4})
+class ConcurrentBatchTestCase(TransactionTestCase):
+    def test_concurrent_batch_keeps_request_order(self):
+        caches["throttle"].clear()
+        flight = create_flight()
+        client = APIClient()
+        client.force_authenticate(
+            user=get_user_model().objects.create_user(
+                username="testuser", password="password123"
+            )
+        )
+        urls = [
+            reverse("air_service:flight-detail", args=[flight.id]),
+            reverse("air_service:airport-list"),
+            reverse("air_service:route-list"),
+        ]
+        response = client.post(
+            BATCH_URL,
+            {"requests": urls, "concurrent": True},
+            format="json"
+        )
+        self.assertEqual(
+            [item["url"] for item in response.data["responses"]], urls
+        )
+        self.assertEqual(
+            response.data["responses"][0]["body"]["id"], flight.id
+        )
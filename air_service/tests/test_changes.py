@@ -0,0 +1,272 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from air_service.changes import record_seat_changes, stop_listener
+from air_service.deletion import delete_flights
+from air_service.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    City,
+    Country,
+    Flight,
+    Order,
+    Route,
+    SeatInventoryEvent,
+)
+
+CHANGES_URL = reverse("air_service:changes")
+ORDER_LIST_URL = reverse("air_service:order-list")
+
+
+def order_url(order_id):
+    return reverse("air_service:order-detail", args=[order_id])
+
+
+class ChangeFeedMixin:
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="testuser", password="password123", is_staff=True
+        )
+        country = Country.objects.create(country_name="Ukraine")
+        city = City.objects.create(city_name="Kyiv", country=country)
+        self.flight = Flight.objects.create(
+            route=Route.objects.create(
+                source=Airport.objects.create(airport_name="Kyiv", city=city),
+                destination=Airport.objects.create(
+                    airport_name="Lviv", city=city
+                ),
+                distance=500,
+            ),
+            airplane=Airplane.objects.create(
+                airplane_name="Airplane1",
+                rows=10,
+                seats_in_row=6,
+                airplane_type=AirplaneType.objects.create(type_name="A320"),
+            ),
+            departure_datetime=datetime(2025, 12, 10, 8, tzinfo=timezone.utc),
+            arrival_datetime=datetime(2025, 12, 10, 10, tzinfo=timezone.utc),
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def create_order(self, *seat_numbers):
+        response = self.client.post(
+            ORDER_LIST_URL,
+            {"tickets": [
+                {"seat_row": 1, "seat_number": seat_number,
+                 "flight": self.flight.id}
+                for seat_number in seat_numbers
+            ]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response.data["id"]
+
+
+class ChangeFeedTestCase(ChangeFeedMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        # The test transaction never commits, assign feed positions on
+        # insert instead.
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SET CONSTRAINTS air_service_seat_event_position IMMEDIATE"
+            )
+
+    def test_booking_records_an_event(self):
+        order_id = self.create_order(1, 2)
+        event = SeatInventoryEvent.objects.get()
+        self.assertEqual(event.flight_id, self.flight.id)
+        self.assertEqual(event.order_id, order_id)
+        self.assertEqual(event.seats_delta, 2)
+        self.assertEqual(event.tickets_available, 58)
+
+    def test_cancelling_an_order_releases_seats(self):
+        order_id = self.create_order(1, 2)
+        self.client.delete(order_url(order_id))
+        self.assertEqual(SeatInventoryEvent.objects.count(), 2)
+        event = SeatInventoryEvent.objects.last()
+        self.assertEqual(event.seats_delta, -2)
+        self.assertEqual(event.tickets_available, 60)
+
+    def test_order_deleted_outside_the_api_releases_seats(self):
+        order_id = self.create_order(1, 2)
+        Order.objects.filter(pk=order_id).delete()
+        self.assertEqual(SeatInventoryEvent.objects.count(), 2)
+        event = SeatInventoryEvent.objects.last()
+        self.assertEqual(event.order_id, order_id)
+        self.assertEqual(event.seats_delta, -2)
+        self.assertEqual(event.tickets_available, 60)
+
+    def test_deleting_a_user_releases_the_seats_of_their_orders(self):
+        self.create_order(1)
+        self.create_order(2, 3)
+        self.user.delete()
+        self.assertEqual(
+            sorted(
+                SeatInventoryEvent.objects.filter(
+                    seats_delta__lt=0
+                ).values_list("seats_delta", flat=True)
+            ),
+            [-2, -1],
+        )
+        self.assertEqual(
+            SeatInventoryEvent.objects.last().tickets_available, 60
+        )
+
+    def test_deleting_a_flight_records_a_terminal_event(self):
+        self.create_order(1)
+        flight_id = self.flight.id
+        self.flight.delete()
+        event = SeatInventoryEvent.objects.get(flight_deleted=True)
+        self.assertEqual(event.flight_id, flight_id)
+        self.assertEqual(event.tickets_available, 0)
+
+    def test_flights_deleted_by_the_database_record_terminal_events(self):
+        delete_flights([self.flight.id])
+        self.assertEqual(
+            list(
+                SeatInventoryEvent.objects.filter(
+                    flight_deleted=True
+                ).values_list("flight_id", flat=True)
+            ),
+            [self.flight.id],
+        )
+
+    def test_without_since_returns_the_current_cursor(self):
+        self.create_order(1)
+        response = self.client.get(CHANGES_URL)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["events"], [])
+        self.assertEqual(
+            response.data["cursor"], SeatInventoryEvent.objects.get().position
+        )
+
+    def test_events_after_cursor(self):
+        self.create_order(1)
+        cursor = self.client.get(CHANGES_URL).data["cursor"]
+        self.create_order(2)
+        self.create_order(3)
+
+        response = self.client.get(CHANGES_URL, {"since": cursor})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        events = response.data["events"]
+        self.assertEqual(len(events), 2)
+        self.assertEqual(
+            [event["tickets_available"] for event in events], [58, 57]
+        )
+        self.assertEqual(response.data["cursor"], events[-1]["position"])
+
+    def test_timeout_without_events_returns_the_same_cursor(self):
+        self.create_order(1)
+        cursor = self.client.get(CHANGES_URL).data["cursor"]
+        response = self.client.get(
+            CHANGES_URL, {"since": cursor, "timeout": 0.1}
+        )
+        self.assertEqual(response.data, {"events": [], "cursor": cursor})
+
+    def test_sync_worker_does_not_wait(self):
+        self.create_order(1)
+        cursor = self.client.get(CHANGES_URL).data["cursor"]
+        started = time.monotonic()
+        response = self.client.get(
+            CHANGES_URL, {"since": cursor, "timeout": 10}
+        )
+        self.assertEqual(response.data, {"events": [], "cursor": cursor})
+        self.assertLess(time.monotonic() - started, 5)
+
+    @override_settings(
+        CHANGE_FEED={"MAX_EVENTS": 500, "MAX_TIMEOUT": 30, "MAX_WAITERS": 0}
+    )
+    def test_waiters_over_the_limit_do_not_wait(self):
+        self.create_order(1)
+        cursor = self.client.get(CHANGES_URL).data["cursor"]
+        started = time.monotonic()
+        response = self.client.get(
+            CHANGES_URL,
+            {"since": cursor, "timeout": 10},
+            **{"wsgi.multithread": True},
+        )
+        self.assertEqual(response.data, {"events": [], "cursor": cursor})
+        self.assertLess(time.monotonic() - started, 5)
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get(CHANGES_URL, {"since": "abc"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_purge_deletes_old_events(self):
+        self.create_order(1)
+        SeatInventoryEvent.objects.update(
+            created_at=datetime.now(timezone.utc) - timedelta(days=30)
+        )
+        call_command("purge_seat_events", stdout=StringIO())
+        self.assertFalse(SeatInventoryEvent.objects.exists())
+
+
+class ChangeFeedLongPollTestCase(ChangeFeedMixin, TransactionTestCase):
+    def setUp(self):
+        super().setUp()
+        # The listener keeps a connection to the test database open.
+        self.addCleanup(stop_listener)
+
+    def test_waiting_request_wakes_up_on_commit(self):
+        responses = []
+
+        def poll():
+            client = APIClient()
+            client.force_authenticate(user=self.user)
+            responses.append(
+                client.get(
+                    CHANGES_URL,
+                    {"since": 0, "timeout": 10},
+                    **{"wsgi.multithread": True},
+                )
+            )
+            connection.close()
+
+        waiter = threading.Thread(target=poll)
+        waiter.start()
+        self.create_order(1)
+        waiter.join(timeout=15)
+
+        self.assertFalse(waiter.is_alive())
+        self.assertEqual(len(responses[0].data["events"]), 1)
+
+    def test_positions_follow_commit_order(self):
+        recorded = threading.Event()
+        release = threading.Event()
+
+        def slow_booking():
+            try:
+                with transaction.atomic():
+                    record_seat_changes(
+                        sender=None, order_id=None, deltas={self.flight.id: 1}
+                    )
+                    recorded.set()
+                    release.wait(timeout=10)
+            finally:
+                connection.close()
+
+        booking = threading.Thread(target=slow_booking)
+        booking.start()
+        recorded.wait(timeout=10)
+        # Gets the next id but commits first, without waiting for the
+        # open booking.
+        self.create_order(1)
+        release.set()
+        booking.join(timeout=10)
+
+        slow, fast = SeatInventoryEvent.objects.order_by("id")
+        self.assertLess(slow.id, fast.id)
+        self.assertGreater(slow.position, fast.position)
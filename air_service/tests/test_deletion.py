@@ -0,0 +1,247 @@
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from air_service.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    City,
+    Country,
+    Crew,
+    Deletion,
+    Flight,
+    Order,
+    OrderSummary,
+    Route,
+    Ticket,
+)
+from jobs.worker import run_pending
+from reports.models import FlightLoad
+
+DEPARTURE = datetime(2025, 12, 10, 8, tzinfo=timezone.utc)
+
+
+class DeletionTestCase(TestCase):
+    def setUp(self):
+        self.admin = get_user_model().objects.create_superuser(
+            username="admin", password="password123"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+        country = Country.objects.create(country_name="Ukraine")
+        city = City.objects.create(city_name="Kyiv", country=country)
+        self.kyiv = Airport.objects.create(airport_name="Kyiv", city=city)
+        self.lviv = Airport.objects.create(airport_name="Lviv", city=city)
+        self.route = Route.objects.create(
+            source=self.kyiv, destination=self.lviv, distance=500
+        )
+        self.airplane = Airplane.objects.create(
+            airplane_name="Airplane1",
+            rows=10,
+            seats_in_row=6,
+            airplane_type=AirplaneType.objects.create(type_name="A320"),
+        )
+        self.crew = Crew.objects.create(first_name="Olena", last_name="Ko")
+        self.order = Order.objects.create(user=self.admin)
+
+    @contextmanager
+    def run_jobs_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            yield
+        run_pending()
+
+    def run_all_jobs(self):
+        # Jobs queue more jobs when their transaction commits.
+        total = 0
+        while True:
+            with self.captureOnCommitCallbacks(execute=True):
+                count = run_pending()
+            if not count:
+                return total
+            total += count
+
+    def add_flights(self, count, route=None, airplane=None):
+        with self.run_jobs_on_commit():
+            for number in range(count):
+                departure = DEPARTURE + timedelta(days=number)
+                flight = Flight.objects.create(
+                    route=route or self.route,
+                    airplane=airplane or self.airplane,
+                    departure_datetime=departure,
+                    arrival_datetime=departure + timedelta(hours=1),
+                )
+                flight.crew.add(self.crew)
+                Ticket.objects.create(
+                    order=self.order, flight=flight, seat_row=1, seat_number=1
+                )
+
+    def delete(self, url_name, pk):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.delete(
+                reverse(f"air_service:{url_name}", args=[pk])
+            )
+
+    def assertFlightsGone(self):
+        self.assertFalse(Flight.objects.exists())
+        self.assertFalse(Ticket.objects.exists())
+        self.assertFalse(Flight.crew.through.objects.exists())
+        self.assertTrue(Crew.objects.exists())
+        self.assertFalse(FlightLoad.objects.exists())
+        summary = OrderSummary.objects.get(order=self.order)
+        self.assertEqual(summary.ticket_count, 0)
+        self.assertEqual(summary.flight_ids, [])
+
+    def test_small_route_is_deleted_at_once(self):
+        self.add_flights(3)
+        self.assertEqual(FlightLoad.objects.count(), 3)
+
+        response = self.delete("route-detail", self.route.id)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Route.objects.exists())
+        run_pending()
+        self.assertFlightsGone()
+
+    def test_cascade_does_not_load_the_flights(self):
+        other_route = Route.objects.create(
+            source=self.lviv, destination=self.kyiv, distance=500
+        )
+        self.add_flights(1)
+        self.add_flights(10, route=other_route)
+
+        counts = []
+        for route in (self.route, other_route):
+            with CaptureQueriesContext(connection) as context:
+                self.delete("route-detail", route.id)
+            counts.append(len(context))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_foreign_keys_cascade_in_the_database(self):
+        foreign_keys = [
+            (Ticket, "flight"),
+            (Flight, "route"),
+            (Flight, "airplane"),
+            (Flight.crew.through, "flight"),
+        ]
+        with connection.cursor() as cursor:
+            for model, field_name in foreign_keys:
+                table = model._meta.db_table
+                column = model._meta.get_field(field_name).column
+                cursor.execute(
+                    """
+                    SELECT confdeltype FROM pg_constraint
+                    WHERE contype = 'f'
+                    AND conrelid = %s::regclass
+                    AND conkey = ARRAY[(
+                        SELECT attnum FROM pg_attribute
+                        WHERE attrelid = %s::regclass AND attname = %s
+                    )]
+                    """,
+                    [table, table, column],
+                )
+                with self.subTest(table=table, column=column):
+                    self.assertEqual(cursor.fetchall(), [("c",)])
+
+    def test_small_airplane_is_deleted_at_once(self):
+        self.add_flights(2)
+
+        response = self.delete("airplane-detail", self.airplane.id)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        run_pending()
+        self.assertTrue(Route.objects.exists())
+        self.assertFlightsGone()
+
+    def test_airport_delete_cascades_through_its_routes(self):
+        self.add_flights(2)
+
+        with self.run_jobs_on_commit():
+            self.kyiv.delete()
+        self.assertFlightsGone()
+
+    @override_settings(DELETION={"SYNC_MAX_TICKETS": 2, "CHUNK_SIZE": 2})
+    def test_large_route_is_deleted_in_the_background(self):
+        self.add_flights(5)
+
+        response = self.delete("route-detail", self.route.id)
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        deletion = Deletion.objects.get()
+        self.assertEqual(
+            response["Location"],
+            "http://testserver"
+            + reverse("air_service:deletion-detail", args=[deletion.id]),
+        )
+        self.assertEqual(response.data["status"], Deletion.Status.RUNNING)
+        self.assertEqual(response.data["total_flights"], 5)
+        self.assertTrue(Route.objects.exists())
+
+        # Deleting again follows the running deletion.
+        response = self.delete("route-detail", self.route.id)
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data["id"], deletion.id)
+
+        # Three chunks, the route, and the report and summary refreshes.
+        self.assertGreaterEqual(self.run_all_jobs(), 4)
+        self.assertFalse(Route.objects.exists())
+        self.assertFlightsGone()
+
+        response = self.client.get(response["Location"])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["status"], Deletion.Status.DONE)
+        self.assertEqual(response.data["deleted_flights"], 5)
+        self.assertIsNotNone(response.data["finished_at"])
+
+    @override_settings(DELETION={"SYNC_MAX_TICKETS": 0, "CHUNK_SIZE": 10})
+    def test_route_being_deleted_takes_no_flights_or_tickets(self):
+        self.add_flights(1)
+        flight = Flight.objects.get()
+        response = self.delete("route-detail", self.route.id)
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+
+        departure = DEPARTURE + timedelta(days=30)
+        response = self.client.post(
+            reverse("air_service:flight-list"),
+            {
+                "route": self.route.id,
+                "airplane": self.airplane.id,
+                "crew": [self.crew.id],
+                "departure_datetime": departure,
+                "arrival_datetime": departure + timedelta(hours=1),
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("being deleted", str(response.data))
+
+        response = self.client.post(
+            reverse("air_service:order-list"),
+            {"tickets": [
+                {"seat_row": 2, "seat_number": 2, "flight": flight.id}
+            ]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("being deleted", str(response.data))
+
+        self.run_all_jobs()
+        self.assertFalse(Route.objects.exists())
+
+    @override_settings(DELETION={"SYNC_MAX_TICKETS": 0, "CHUNK_SIZE": 10})
+    def test_deletion_progress_is_admin_only(self):
+        self.add_flights(1)
+        response = self.delete("airplane-detail", self.airplane.id)
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+
+        self.client.force_authenticate(
+            user=get_user_model().objects.create_user(
+                username="passenger", password="password123"
+            )
+        )
+        response = self.client.get(response["Location"])
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
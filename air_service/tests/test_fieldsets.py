@@ -0,0 +1,143 @@
+from datetime import datetime, timezone
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from air_service.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    City,
+    Country,
+    Crew,
+    Flight,
+    Order,
+    Route,
+    Ticket,
+)
+
+FLIGHT_LIST_URL = reverse("air_service:flight-list")
+
+
+class SparseFieldsetTestCase(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="testuser", password="password123"
+        )
+        country = Country.objects.create(country_name="Ukraine")
+        city = City.objects.create(city_name="Kyiv", country=country)
+        self.route = Route.objects.create(
+            source=Airport.objects.create(airport_name="Kyiv", city=city),
+            destination=Airport.objects.create(
+                airport_name="Lviv", city=city
+            ),
+            distance=500,
+        )
+        self.airplane = Airplane.objects.create(
+            airplane_name="Airplane1",
+            rows=10,
+            seats_in_row=6,
+            airplane_type=AirplaneType.objects.create(type_name="A320"),
+        )
+        self.pilot = Crew.objects.create(first_name="John", last_name="Doe")
+        self.flight = Flight.objects.create(
+            route=self.route,
+            airplane=self.airplane,
+            departure_datetime=datetime(2025, 12, 10, 8, tzinfo=timezone.utc),
+            arrival_datetime=datetime(2025, 12, 10, 10, tzinfo=timezone.utc),
+        )
+        self.flight.crew.add(self.pilot)
+        self.order = Order.objects.create(user=self.user)
+        self.ticket = Ticket.objects.create(
+            seat_row=1, seat_number=1, flight=self.flight, order=self.order
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.flight_url = reverse(
+            "air_service:flight-detail", args=[self.flight.id]
+        )
+        self.order_url = reverse(
+            "air_service:order-detail", args=[self.order.id]
+        )
+
+    def get(self, url, params):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data, " ".join(
+            query["sql"] for query in context.captured_queries
+        )
+
+    def test_fields_trim_the_response_and_the_query(self):
+        data, sql = self.get(
+            self.flight_url, {"fields": "id,departure_datetime"}
+        )
+        self.assertEqual(set(data), {"id", "departure_datetime"})
+        self.assertNotIn("air_service_route", sql)
+        self.assertNotIn("air_service_crew", sql)
+
+    def test_unexpanded_relations_are_ids(self):
+        data, sql = self.get(self.flight_url, {"expand": "route"})
+        self.assertEqual(data["route"]["source"], "Kyiv")
+        self.assertEqual(data["airplane"], self.airplane.id)
+        self.assertEqual(data["crew"], [self.pilot.id])
+        self.assertNotIn("air_service_airplanetype", sql)
+
+    def test_relations_are_expanded_by_default(self):
+        data, _ = self.get(self.flight_url, {})
+        self.assertEqual(data["airplane"]["airplane_type"]["type_name"],
+                         "A320")
+        self.assertEqual(data["crew"][0]["full_name"], "John Doe")
+
+    def test_flight_list_skips_the_seat_count_when_not_requested(self):
+        data, sql = self.get(FLIGHT_LIST_URL, {"fields": "id,route"})
+        self.assertEqual(
+            data["results"], [{"id": self.flight.id, "route": "Kyiv - Lviv"}]
+        )
+        self.assertNotIn("air_service_ticket", sql)
+
+    def test_nested_fields_and_expansion(self):
+        data, sql = self.get(
+            self.order_url,
+            {"fields": "id,tickets.seat_row,tickets.flight",
+             "expand": "tickets"}
+        )
+        self.assertEqual(
+            data,
+            {
+                "id": self.order.id,
+                "tickets": [{"seat_row": 1, "flight": self.flight.id}],
+            }
+        )
+        self.assertNotIn("air_service_flight", sql)
+
+        data, _ = self.get(
+            self.order_url,
+            {"fields": "tickets.flight.route", "expand": "tickets.flight"}
+        )
+        self.assertEqual(
+            data, {"tickets": [{"flight": {"route": "Kyiv - Lviv"}}]}
+        )
+
+    def test_nested_relations_of_flights_are_trimmed(self):
+        data, _ = self.get(
+            self.flight_url,
+            {"fields": "airplane.rows,route.source,crew.first_name"},
+        )
+        self.assertEqual(
+            data,
+            {
+                "airplane": {"rows": 10},
+                "route": {"source": "Kyiv"},
+                "crew": [{"first_name": "John"}],
+            }
+        )
+
+    def test_collapsed_many_relation(self):
+        data, _ = self.get(self.order_url, {"expand": ""})
+        self.assertEqual(data["tickets"], [self.ticket.id])
@@ -0,0 +1,88 @@
+import gzip
+from io import StringIO
+
+import msgpack
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from air_service.middleware import CompressionMiddleware, negotiate_encoding
+from air_service.models import Country
+
+COUNTRY_LIST_URL = reverse("air_service:country-list")
+
+
+class CompressionMiddlewareTestCase(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def respond(self, response, accept_encoding="gzip"):
+        middleware = CompressionMiddleware(lambda request: response)
+        return middleware(
+            self.factory.get("/", HTTP_ACCEPT_ENCODING=accept_encoding)
+        )
+
+    def test_large_responses_are_compressed(self):
+        content = b"flight " * 1000
+        response = self.respond(HttpResponse(content))
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.content), content)
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+
+    def test_small_responses_are_left_alone(self):
+        response = self.respond(HttpResponse(b"flight"))
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_streaming_responses_are_left_alone(self):
+        response = self.respond(
+            StreamingHttpResponse(iter([b"flight " * 1000]))
+        )
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_encoding_negotiation(self):
+        self.assertEqual(negotiate_encoding("gzip, br"), "br")
+        self.assertEqual(negotiate_encoding("br;q=0.5, gzip"), "gzip")
+        self.assertEqual(negotiate_encoding("*"), "br")
+        self.assertIsNone(negotiate_encoding("identity"))
+        self.assertIsNone(negotiate_encoding("gzip;q=0, br;q=0"))
+
+
+class MessagePackTestCase(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="admin", password="password123", is_staff=True
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_msgpack_is_selected_with_accept(self):
+        Country.objects.create(country_name="Ukraine")
+        response = self.client.get(
+            COUNTRY_LIST_URL, HTTP_ACCEPT="application/msgpack"
+        )
+        self.assertEqual(response["Content-Type"], "application/msgpack")
+        data = msgpack.unpackb(response.content)
+        self.assertEqual(data["results"][0]["country_name"], "Ukraine")
+
+    def test_msgpack_requests_are_parsed(self):
+        response = self.client.post(
+            COUNTRY_LIST_URL,
+            msgpack.packb({"country_name": "Poland"}),
+            content_type="application/msgpack",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(
+            Country.objects.filter(country_name="Poland").exists()
+        )
+
+    def test_benchmark_reports_every_format(self):
+        stdout = StringIO()
+        call_command(
+            "benchmark_formats", flights=10, repeat=1, stdout=stdout
+        )
+        self.assertIn("msgpack", stdout.getvalue())
+        self.assertIn("gzip", stdout.getvalue())
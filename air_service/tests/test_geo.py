@@ -0,0 +1,233 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from air_service.geo import (
+    AirportGrid,
+    airport_grid,
+    distance_matrix,
+    haversine_km,
+)
+from air_service.models import Airport, City, Country, Route
+
+NEARBY_URL = reverse("air_service:airport-nearby")
+ROUTE_LIST_URL = reverse("air_service:route-list")
+
+GEO = {
+    "GRID_CELL_DEGREES": 1.0,
+    "NEARBY_MAX_RADIUS_KM": 2000,
+    "ROUTE_DISTANCE_TOLERANCE": 0.25,
+    "VERSION_CHECK_INTERVAL": 0,
+}
+
+KYIV = (50.345, 30.8947)
+WARSAW = (52.1657, 20.9671)
+LVIV = (49.8125, 23.9561)
+
+
+class HaversineTestCase(SimpleTestCase):
+    def test_known_distance(self):
+        self.assertAlmostEqual(haversine_km(*KYIV, *WARSAW), 720, delta=5)
+
+    def test_same_point(self):
+        self.assertEqual(haversine_km(*KYIV, *KYIV), 0)
+
+    def test_matrix_matches_scalar(self):
+        points = [KYIV, WARSAW, LVIV, (-33.9399, 151.1753)]
+        latitudes, longitudes = zip(*points)
+        matrix = distance_matrix(latitudes, longitudes, block_size=3)
+        for i, first in enumerate(points):
+            for j, second in enumerate(points):
+                self.assertAlmostEqual(
+                    matrix[i, j], haversine_km(*first, *second), places=6
+                )
+
+
+class AirportGridTestCase(SimpleTestCase):
+    def nearby(self, airports, latitude, longitude, radius):
+        grid = AirportGrid(airports, cell_degrees=1.0)
+        return [
+            airport[0]
+            for _, airport in grid.nearby(latitude, longitude, radius, 10)
+        ]
+
+    def test_closest_first_within_radius(self):
+        airports = [
+            (1, "Boryspil", *KYIV),
+            (2, "Chopin", *WARSAW),
+            (3, "Lviv", *LVIV),
+        ]
+        self.assertEqual(self.nearby(airports, *KYIV, 600), [1, 3])
+        self.assertEqual(self.nearby(airports, *KYIV, 800), [1, 3, 2])
+
+    def test_across_the_antimeridian(self):
+        airports = [(1, "East", 0, 179.9), (2, "West", 0, -179.9)]
+        self.assertEqual(self.nearby(airports, 0, 179.95, 50), [1, 2])
+
+    def test_around_the_pole(self):
+        airports = [(1, "Alert", 89.5, 0), (2, "Opposite", 89.5, 180)]
+        self.assertEqual(self.nearby(airports, 89.9, 45, 200), [1, 2])
+
+    def test_matches_brute_force(self):
+        airports = [
+            (index, "", latitude, longitude)
+            for index, (latitude, longitude) in enumerate(
+                (lat, lon)
+                for lat in range(-85, 90, 7)
+                for lon in range(-180, 180, 11)
+            )
+        ]
+        for latitude, longitude in [(0, 0), (60, 170), (-80, -175)]:
+            expected = sorted(
+                (haversine_km(latitude, longitude, lat, lon), index)
+                for index, _, lat, lon in airports
+                if haversine_km(latitude, longitude, lat, lon) <= 1500
+            )
+            self.assertEqual(
+                self.nearby(airports, latitude, longitude, 1500),
+                [index for _, index in expected][:10],
+            )
+
+
+class GeoTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        airport_grid.invalidate()
+        ukraine = Country.objects.create(country_name="Ukraine")
+        poland = Country.objects.create(country_name="Poland")
+        self.kyiv = Airport.objects.create(
+            airport_name="Boryspil",
+            city=City.objects.create(city_name="Kyiv", country=ukraine),
+            latitude=KYIV[0],
+            longitude=KYIV[1],
+        )
+        self.warsaw = Airport.objects.create(
+            airport_name="Chopin",
+            city=City.objects.create(city_name="Warsaw", country=poland),
+            latitude=WARSAW[0],
+            longitude=WARSAW[1],
+        )
+        self.lviv = Airport.objects.create(
+            airport_name="Lviv",
+            city=City.objects.create(city_name="Lviv", country=ukraine),
+        )
+        self.great_circle = round(haversine_km(*KYIV, *WARSAW))
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_superuser(
+                username="admin", password="password123"
+            )
+        )
+
+
+@override_settings(GEO=GEO)
+class RouteDistanceTestCase(GeoTestCase):
+    def create_route(self, **data):
+        return self.client.post(
+            ROUTE_LIST_URL,
+            {"source": self.kyiv.id, "destination": self.warsaw.id, **data},
+        )
+
+    def test_distance_computed_when_omitted(self):
+        response = self.create_route()
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["distance"], self.great_circle)
+
+    def test_distance_within_tolerance_is_kept(self):
+        response = self.create_route(distance=self.great_circle + 50)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["distance"], self.great_circle + 50)
+
+    def test_distance_outside_tolerance_is_rejected(self):
+        response = self.create_route(distance=self.great_circle * 2)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("distance", response.data)
+
+    def test_distance_required_without_coordinates(self):
+        response = self.create_route(destination=self.lviv.id)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("distance", response.data)
+
+    def test_update_recomputes_when_airports_change(self):
+        route = Route.objects.create(
+            source=self.kyiv, destination=self.lviv, distance=470
+        )
+        response = self.client.patch(
+            reverse("air_service:route-detail", args=[route.id]),
+            {"destination": self.warsaw.id},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        route.refresh_from_db()
+        self.assertEqual(route.distance, self.great_circle)
+
+    def test_recompute_command(self):
+        located = Route.objects.create(
+            source=self.kyiv, destination=self.warsaw, distance=1
+        )
+        unlocated = Route.objects.create(
+            source=self.kyiv, destination=self.lviv, distance=470
+        )
+        out = StringIO()
+        call_command("recompute_route_distances", "--dry-run", stdout=out)
+        located.refresh_from_db()
+        self.assertEqual(located.distance, 1)
+
+        call_command("recompute_route_distances", stdout=out)
+        located.refresh_from_db()
+        unlocated.refresh_from_db()
+        self.assertEqual(located.distance, self.great_circle)
+        self.assertEqual(unlocated.distance, 470)
+
+
+@override_settings(GEO=GEO)
+class NearbyAirportsTestCase(GeoTestCase):
+    def test_nearby(self):
+        response = self.client.get(
+            NEARBY_URL,
+            {"latitude": KYIV[0], "longitude": KYIV[1], "radius": 800},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [airport["id"] for airport in response.data["results"]],
+            [self.kyiv.id, self.warsaw.id],
+        )
+        self.assertEqual(response.data["results"][0]["distance"], 0)
+
+    def test_radius_limit(self):
+        response = self.client.get(
+            NEARBY_URL,
+            {"latitude": 0, "longitude": 0, "radius": 5000},
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_coordinates_are_required(self):
+        response = self.client.get(NEARBY_URL, {"latitude": 0})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_coordinates_must_be_set_together(self):
+        response = self.client.patch(
+            reverse("air_service:airport-detail", args=[self.lviv.id]),
+            {"latitude": LVIV[0]},
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_index_is_refreshed_after_changes(self):
+        params = {"latitude": LVIV[0], "longitude": LVIV[1], "radius": 10}
+        self.assertEqual(
+            self.client.get(NEARBY_URL, params).data, {"results": []}
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(
+                reverse("air_service:airport-detail", args=[self.lviv.id]),
+                {"latitude": LVIV[0], "longitude": LVIV[1]},
+            )
+        results = self.client.get(NEARBY_URL, params).data["results"]
+        self.assertEqual(
+            [airport["id"] for airport in results], [self.lviv.id]
+        )
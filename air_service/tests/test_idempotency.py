@@ -0,0 +1,160 @@
+from datetime import datetime, timedelta, timezone
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone as django_timezone
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from air_service.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    City,
+    Country,
+    Flight,
+    IdempotencyKey,
+    Order,
+    Route,
+)
+from air_service.serializers import OrderSerializer
+
+ORDER_LIST_URL = reverse("air_service:order-list")
+
+IDEMPOTENCY = {
+    "TTL": 60,
+    "LOCK_TIMEOUT": 60,
+    "RETRY_AFTER": 1,
+}
+
+
+@override_settings(IDEMPOTENCY=IDEMPOTENCY)
+class IdempotencyKeyTestCase(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="testuser", password="password123", is_staff=True
+        )
+        country = Country.objects.create(country_name="Ukraine")
+        city = City.objects.create(city_name="Kyiv", country=country)
+        self.flight = Flight.objects.create(
+            route=Route.objects.create(
+                source=Airport.objects.create(airport_name="Kyiv", city=city),
+                destination=Airport.objects.create(
+                    airport_name="Lviv", city=city
+                ),
+                distance=500,
+            ),
+            airplane=Airplane.objects.create(
+                airplane_name="Airplane1",
+                rows=10,
+                seats_in_row=6,
+                airplane_type=AirplaneType.objects.create(type_name="A320"),
+            ),
+            departure_datetime=datetime(2025, 12, 10, 8, tzinfo=timezone.utc),
+            arrival_datetime=datetime(2025, 12, 10, 10, tzinfo=timezone.utc),
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def create_order(self, key, seat_number=1):
+        return self.client.post(
+            ORDER_LIST_URL,
+            {"tickets": [
+                {"seat_row": 1, "seat_number": seat_number,
+                 "flight": self.flight.id},
+            ]},
+            format="json",
+            HTTP_IDEMPOTENCY_KEY=key,
+        )
+
+    def test_retry_returns_the_stored_response(self):
+        first = self.create_order("order-1")
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+
+        with self.assertNumQueries(1):
+            retry = self.create_order("order-1")
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.data, first.data)
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_keys_are_scoped_per_user(self):
+        self.create_order("order-1")
+        other = get_user_model().objects.create_user(
+            username="other", password="password123", is_staff=True
+        )
+        self.client.force_authenticate(user=other)
+        response = self.create_order("order-1", seat_number=2)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Order.objects.count(), 2)
+
+    def test_reused_key_with_a_different_request_is_rejected(self):
+        self.create_order("order-1")
+        response = self.create_order("order-1", seat_number=2)
+        self.assertEqual(
+            response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_in_flight_duplicate_is_rejected_at_once(self):
+        self.create_order("order-1")
+        IdempotencyKey.objects.update(status_code=None, response_body=None)
+
+        with mock.patch("time.sleep") as sleep:
+            response = self.create_order("order-1")
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response["Retry-After"], "1")
+        sleep.assert_not_called()
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_order_is_rolled_back_when_the_key_was_taken_over(self):
+        create = OrderSerializer.create
+
+        def create_and_lose_the_key(serializer, validated_data):
+            order = create(serializer, validated_data)
+            # Another request takes the key over while this one runs.
+            IdempotencyKey.objects.update(locked_at=django_timezone.now())
+            return order
+
+        with mock.patch.object(
+            OrderSerializer, "create", create_and_lose_the_key
+        ):
+            response = self.create_order("order-1")
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertFalse(Order.objects.exists())
+
+    def test_abandoned_key_is_taken_over(self):
+        self.create_order("order-1")
+        Order.objects.all().delete()
+        IdempotencyKey.objects.update(
+            status_code=None,
+            response_body=None,
+            locked_at=django_timezone.now() - timedelta(minutes=5),
+        )
+
+        response = self.create_order("order-1")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_failed_request_releases_the_key(self):
+        response = self.create_order("order-1", seat_number=100)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+    def test_purge_deletes_expired_keys(self):
+        self.create_order("order-1")
+        self.create_order("order-2", seat_number=2)
+        IdempotencyKey.objects.filter(key="order-1").update(
+            expires_at=django_timezone.now()
+        )
+
+        call_command("purge_idempotency_keys", stdout=StringIO())
+
+        self.assertEqual(
+            list(IdempotencyKey.objects.values_list("key", flat=True)),
+            ["order-2"]
+        )
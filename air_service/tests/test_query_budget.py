@@ -0,0 +1,359 @@
+import itertools
+from datetime import datetime, timedelta, timezone
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from air_service.geo import airport_grid
+from air_service.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    City,
+    Country,
+    Crew,
+    Flight,
+    Order,
+    Route,
+    Ticket,
+)
+from air_service.tests.query_budget import QueryBudgetMixin
+from air_service.urls import router
+
+DEPARTURE = datetime(2025, 12, 10, 8, tzinfo=timezone.utc)
+
+# Router prefixes with a test below, a new viewset must be added here.
+COVERED_PREFIXES = {
+    "countries",
+    "cities",
+    "airports",
+    "airplanes_type",
+    "airplanes",
+    "routes",
+    "crews",
+    "flights",
+    "orders",
+}
+
+
+class QueryBudgetTestCase(QueryBudgetMixin, TestCase):
+    """
+    Every read endpoint runs as many statements for one object as for
+    nine, each with its own country, airports, route, airplane, crew
+    member, flight and order.
+
+    The first flight gets every crew member and the first order a ticket
+    on every flight, so detail views grow as well.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_superuser(
+            username="admin", password="password123"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.size = 0
+        self.seed(1)
+
+    def seed(self, size):
+        while self.size < size:
+            self.add_unit(self.size)
+            self.size += 1
+
+    def add_unit(self, number):
+        country = Country.objects.create(country_name=f"Country{number}")
+        city = City.objects.create(city_name=f"City{number}", country=country)
+        source = Airport.objects.create(
+            airport_name=f"Source{number}",
+            city=city,
+            latitude=50 + number / 10,
+            longitude=30,
+        )
+        destination = Airport.objects.create(
+            airport_name=f"Destination{number}",
+            city=city,
+            latitude=52,
+            longitude=21 + number / 10,
+        )
+        route = Route.objects.create(
+            source=source, destination=destination, distance=700
+        )
+        airplane = Airplane.objects.create(
+            airplane_name=f"Airplane{number}",
+            rows=10,
+            seats_in_row=6,
+            airplane_type=AirplaneType.objects.create(
+                type_name=f"Type{number}"
+            ),
+        )
+        crew = Crew.objects.create(
+            first_name=f"First{number}", last_name=f"Last{number}"
+        )
+        departure = DEPARTURE + timedelta(hours=number)
+        flight = Flight.objects.create(
+            route=route,
+            airplane=airplane,
+            departure_datetime=departure,
+            arrival_datetime=departure + timedelta(hours=2),
+        )
+        flight.crew.add(crew)
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(
+            order=order, flight=flight, seat_row=1, seat_number=2
+        )
+        if number == 0:
+            self.country, self.city, self.airport = country, city, source
+            self.route, self.airplane, self.crew = route, airplane, crew
+            self.flight, self.order = flight, order
+            return
+        self.flight.crew.add(crew)
+        Ticket.objects.create(
+            order=self.order, flight=flight, seat_row=1, seat_number=1
+        )
+
+    def assertConstantRequest(self, url_name, args=(), params=None):
+        url = reverse(f"air_service:{url_name}", args=args)
+
+        def request():
+            # Endpoints that cache their response or read an in-memory
+            # index must still hit the database for the count to mean
+            # anything.
+            cache.clear()
+            airport_grid.invalidate()
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        return self.assertConstantQueries(request, self.seed)
+
+    def test_every_viewset_is_covered(self):
+        self.assertEqual(
+            {prefix for prefix, _, _ in router.registry}, COVERED_PREFIXES
+        )
+
+    def test_countries(self):
+        self.assertConstantRequest("country-list")
+        self.assertConstantRequest("country-detail", [self.country.id])
+
+    def test_cities(self):
+        self.assertConstantRequest("city-list")
+        self.assertConstantRequest("city-detail", [self.city.id])
+
+    def test_airports(self):
+        self.assertConstantRequest("airport-list")
+        self.assertConstantRequest("airport-detail", [self.airport.id])
+        self.assertConstantRequest(
+            "airport-nearby",
+            params={"latitude": 51, "longitude": 25, "radius": 1000},
+        )
+
+    def test_airplane_types(self):
+        self.assertConstantRequest("airplanetype-list")
+        self.assertConstantRequest(
+            "airplanetype-detail", [self.airplane.airplane_type_id]
+        )
+
+    def test_airplanes(self):
+        self.assertConstantRequest("airplane-list")
+        self.assertConstantRequest("airplane-detail", [self.airplane.id])
+
+    def test_routes(self):
+        self.assertConstantRequest("route-list")
+        self.assertConstantRequest("route-detail", [self.route.id])
+
+    def test_crews(self):
+        self.assertConstantRequest("crew-list")
+        self.assertConstantRequest("crew-detail", [self.crew.id])
+
+    def test_flights(self):
+        self.assertConstantRequest("flight-list")
+        self.assertConstantRequest(
+            "flight-list", params={"ordering": "-tickets_available"}
+        )
+        self.assertConstantRequest("flight-detail", [self.flight.id])
+        self.assertConstantRequest(
+            "flight-detail", [self.flight.id], {"expand": ""}
+        )
+
+    def test_flight_dashboards(self):
+        self.assertConstantRequest(
+            "flight-airborne", params={"at": "2025-12-10T09:00:00Z"}
+        )
+        self.assertConstantRequest(
+            "flight-conflicts",
+            params={
+                "start": "2025-12-10T00:00:00Z",
+                "end": "2025-12-11T00:00:00Z",
+            },
+        )
+
+    def test_orders(self):
+        self.assertConstantRequest("order-list")
+        self.assertConstantRequest("order-detail", [self.order.id])
+        self.assertConstantRequest(
+            "order-detail", [self.order.id], {"expand": "tickets"}
+        )
+
+    def test_budget_reports_the_statements(self):
+        with self.assertRaisesMessage(
+            AssertionError, "over the budget of 0"
+        ):
+            self.assertQueryBudget(
+                0, lambda: list(Country.objects.all())
+            )
+
+
+class WriteQueryBudgetTestCase(QueryBudgetMixin, TestCase):
+    """
+    Write actions run as many statements for one ticket, flight or crew
+    member as for nine, and stay within a fixed budget.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_superuser(
+            username="admin", password="password123"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        country = Country.objects.create(country_name="Ukraine")
+        self.city = City.objects.create(city_name="Kyiv", country=country)
+        self.airplane_type = AirplaneType.objects.create(type_name="A320")
+        self.numbers = itertools.count()
+        self.route = self.create_route()
+        self.airplane = self.create_airplane()
+        self.flights = []
+        self.crew = []
+
+    def create_route(self):
+        number = Airport.objects.count()
+        return Route.objects.create(
+            source=Airport.objects.create(
+                airport_name=f"Source{number}", city=self.city
+            ),
+            destination=Airport.objects.create(
+                airport_name=f"Destination{number}", city=self.city
+            ),
+            distance=500,
+        )
+
+    def create_airplane(self):
+        return Airplane.objects.create(
+            airplane_name=f"Airplane{next(self.numbers)}",
+            rows=10,
+            seats_in_row=6,
+            airplane_type=self.airplane_type,
+        )
+
+    def create_flight(self, route, airplane, crew=()):
+        departure = DEPARTURE + timedelta(days=Flight.objects.count())
+        flight = Flight.objects.create(
+            route=route,
+            airplane=airplane,
+            departure_datetime=departure,
+            arrival_datetime=departure + timedelta(hours=2),
+        )
+        flight.crew.set(crew)
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(
+            order=order, flight=flight, seat_row=1, seat_number=1
+        )
+        return flight
+
+    def add_flights(self, size):
+        while len(self.flights) < size:
+            self.flights.append(self.create_flight(self.route, self.airplane))
+
+    def add_crew(self, size):
+        while len(self.crew) < size:
+            number = len(self.crew)
+            self.crew.append(
+                Crew.objects.create(
+                    first_name=f"First{number}", last_name=f"Last{number}"
+                )
+            )
+
+    def test_order_create(self):
+        seat_numbers = iter(range(2, 60))
+
+        def request():
+            seat_number = next(seat_numbers)
+            response = self.assertQueryBudget(
+                16,
+                self.client.post,
+                reverse("air_service:order-list"),
+                {"tickets": [
+                    {"seat_row": 1, "seat_number": seat_number,
+                     "flight": flight.id}
+                    for flight in self.flights
+                ]},
+                format="json",
+            )
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        self.assertConstantQueries(request, self.add_flights)
+
+    def test_flight_update(self):
+        self.add_flights(1)
+        flight = self.flights[0]
+        departures = iter(range(1, 10))
+
+        def request():
+            departure = DEPARTURE + timedelta(hours=next(departures))
+            response = self.assertQueryBudget(
+                19,
+                self.client.put,
+                reverse("air_service:flight-detail", args=[flight.id]),
+                {
+                    "route": self.route.id,
+                    "airplane": self.airplane.id,
+                    "crew": [member.id for member in self.crew],
+                    "departure_datetime": departure,
+                    "arrival_datetime": departure + timedelta(hours=2),
+                },
+                format="json",
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertConstantQueries(request, self.add_crew)
+
+    def assertConstantDestroy(self, url_name, create_target, add_flight):
+        targets = {}
+
+        def seed(size):
+            target = create_target()
+            for _ in range(size):
+                add_flight(target)
+            targets["current"] = target
+
+        def request():
+            response = self.assertQueryBudget(
+                8,
+                self.client.delete,
+                reverse(
+                    f"air_service:{url_name}", args=[targets["current"].id]
+                ),
+            )
+            self.assertEqual(
+                response.status_code, status.HTTP_204_NO_CONTENT
+            )
+
+        self.assertConstantQueries(request, seed)
+
+    def test_route_destroy(self):
+        self.assertConstantDestroy(
+            "route-detail",
+            self.create_route,
+            lambda route: self.create_flight(route, self.airplane),
+        )
+
+    def test_airplane_destroy(self):
+        self.assertConstantDestroy(
+            "airplane-detail",
+            self.create_airplane,
+            lambda airplane: self.create_flight(self.route, airplane),
+        )
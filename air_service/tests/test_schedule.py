@@ -0,0 +1,261 @@
+from datetime import datetime, timezone
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from air_service.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    City,
+    Country,
+    Crew,
+    Flight,
+    Route,
+)
+
+FLIGHT_LIST_URL = reverse("air_service:flight-list")
+FLIGHT_CONFLICTS_URL = reverse("air_service:flight-conflicts")
+FLIGHT_AIRBORNE_URL = reverse("air_service:flight-airborne")
+
+
+def at(hour):
+    return datetime(2025, 12, 10, hour, tzinfo=timezone.utc)
+
+
+class FlightScheduleTestCase(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="admin", password="password123", is_staff=True
+        )
+        country = Country.objects.create(country_name="Ukraine")
+        city = City.objects.create(city_name="Kyiv", country=country)
+        self.route = Route.objects.create(
+            source=Airport.objects.create(airport_name="Kyiv", city=city),
+            destination=Airport.objects.create(
+                airport_name="Lviv", city=city
+            ),
+            distance=500,
+        )
+        airplane_type = AirplaneType.objects.create(type_name="A320")
+        self.airplane1 = Airplane.objects.create(
+            airplane_name="Airplane1",
+            rows=10,
+            seats_in_row=6,
+            airplane_type=airplane_type,
+        )
+        self.airplane2 = Airplane.objects.create(
+            airplane_name="Airplane2",
+            rows=10,
+            seats_in_row=6,
+            airplane_type=airplane_type,
+        )
+        self.pilot = Crew.objects.create(first_name="John", last_name="Doe")
+        self.copilot = Crew.objects.create(
+            first_name="Jane", last_name="Doe"
+        )
+        self.flight = Flight.objects.create(
+            route=self.route,
+            airplane=self.airplane1,
+            departure_datetime=at(8),
+            arrival_datetime=at(10),
+        )
+        self.flight.crew.add(self.pilot)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def create_flight(self, airplane, departure, arrival, crew=()):
+        return self.client.post(
+            FLIGHT_LIST_URL,
+            {
+                "route": self.route.id,
+                "airplane": airplane.id,
+                "crew": [member.id for member in crew],
+                "departure_datetime": departure.isoformat(),
+                "arrival_datetime": arrival.isoformat(),
+            },
+            format="json",
+        )
+
+    def test_overlapping_airplane_is_rejected(self):
+        response = self.create_flight(
+            self.airplane1, at(9), at(11), crew=[self.copilot]
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("airplane", response.data)
+
+    def test_overlapping_crew_is_rejected(self):
+        response = self.create_flight(
+            self.airplane2, at(9), at(11), crew=[self.pilot]
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("crew", response.data)
+
+    def test_back_to_back_flights_are_allowed(self):
+        response = self.create_flight(
+            self.airplane1, at(10), at(12), crew=[self.pilot]
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_arrival_before_departure_is_rejected(self):
+        response = self.create_flight(
+            self.airplane2, at(12), at(11), crew=[self.copilot]
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("arrival_datetime", response.data)
+
+    def test_updating_a_flight_does_not_conflict_with_itself(self):
+        url = reverse("air_service:flight-detail", args=[self.flight.id])
+        response = self.client.patch(
+            url,
+            {"arrival_datetime": at(11).isoformat()},
+            format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_conflict_report_lists_double_bookings(self):
+        conflicting = Flight.objects.create(
+            route=self.route,
+            airplane=self.airplane1,
+            departure_datetime=at(9),
+            arrival_datetime=at(11),
+        )
+        conflicting.crew.add(self.pilot)
+        Flight.objects.create(
+            route=self.route,
+            airplane=self.airplane2,
+            departure_datetime=at(9),
+            arrival_datetime=at(11),
+        )
+
+        response = self.client.get(
+            FLIGHT_CONFLICTS_URL,
+            {"start": at(0).isoformat(), "end": at(23).isoformat()}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["airplanes"],
+            [
+                {
+                    "flight": self.flight.id,
+                    "airplane": self.airplane1.id,
+                    "conflicting_flights": [conflicting.id],
+                },
+                {
+                    "flight": conflicting.id,
+                    "airplane": self.airplane1.id,
+                    "conflicting_flights": [self.flight.id],
+                },
+            ]
+        )
+        self.assertEqual(len(response.data["crew"]), 2)
+
+    def test_conflict_report_requires_a_window(self):
+        response = self.client.get(FLIGHT_CONFLICTS_URL)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class FlightTimeWindowTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username="testuser", password="password123"
+        )
+        country = Country.objects.create(country_name="Ukraine")
+        city = City.objects.create(city_name="Kyiv", country=country)
+        self.kyiv = Airport.objects.create(airport_name="Kyiv", city=city)
+        self.lviv = Airport.objects.create(airport_name="Lviv", city=city)
+        airplane = Airplane.objects.create(
+            airplane_name="Airplane1",
+            rows=10,
+            seats_in_row=6,
+            airplane_type=AirplaneType.objects.create(type_name="A320"),
+        )
+        self.morning = Flight.objects.create(
+            route=Route.objects.create(
+                source=self.kyiv, destination=self.lviv, distance=500
+            ),
+            airplane=airplane,
+            departure_datetime=at(8),
+            arrival_datetime=at(10),
+        )
+        self.evening = Flight.objects.create(
+            route=Route.objects.create(
+                source=self.lviv, destination=self.kyiv, distance=500
+            ),
+            airplane=airplane,
+            departure_datetime=at(18),
+            arrival_datetime=at(20),
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def flight_ids(self, params):
+        response = self.client.get(FLIGHT_LIST_URL, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [flight["id"] for flight in response.data["results"]]
+
+    def test_filter_by_airborne_at(self):
+        self.assertEqual(
+            self.flight_ids({"airborne_at": at(9).isoformat()}),
+            [self.morning.id]
+        )
+        self.assertEqual(
+            self.flight_ids({"airborne_at": at(10).isoformat()}),
+            []
+        )
+
+    def test_filter_by_overlapping_window(self):
+        window = f"{at(9).isoformat()},{at(18).isoformat()}"
+        self.assertEqual(
+            self.flight_ids({"overlaps": window}),
+            [self.morning.id]
+        )
+        window = f"{at(9).isoformat()},{at(19).isoformat()}"
+        self.assertEqual(
+            sorted(self.flight_ids({"overlaps": window})),
+            [self.morning.id, self.evening.id]
+        )
+
+    def test_invalid_window_is_rejected(self):
+        response = self.client.get(
+            FLIGHT_LIST_URL,
+            {"overlaps": f"{at(18).isoformat()},{at(9).isoformat()}"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("overlaps", response.data)
+
+    def test_airborne_dashboard_counts_per_airport(self):
+        response = self.client.get(
+            FLIGHT_AIRBORNE_URL, {"at": at(19).isoformat()}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["airborne"], 1)
+        self.assertEqual(
+            response.data["airports"],
+            [
+                {
+                    "airport": self.kyiv.id,
+                    "airport_name": "Kyiv",
+                    "departed": 0,
+                    "arriving": 1,
+                },
+                {
+                    "airport": self.lviv.id,
+                    "airport_name": "Lviv",
+                    "departed": 1,
+                    "arriving": 0,
+                },
+            ]
+        )
+
+    def test_airborne_dashboard_is_cached(self):
+        params = {"at": at(19).isoformat()}
+        self.client.get(FLIGHT_AIRBORNE_URL, params)
+        with self.assertNumQueries(0):
+            response = self.client.get(FLIGHT_AIRBORNE_URL, params)
+        self.assertEqual(response.data["airborne"], 1)
@@ -0,0 +1,77 @@
+import json
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+
+from air_service import schema
+from air_service.schema import SchemaCache
+
+SCHEMA_URL = reverse("schema")
+
+
+class CachedSchemaTestCase(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.schema_file = Path(cls.directory.name) / "schema.json"
+        cls.enterClassContext(
+            override_settings(API_SCHEMA_FILE=cls.schema_file)
+        )
+        cls.cache = SchemaCache()
+        cls.enterClassContext(
+            mock.patch.object(schema, "schema_cache", cls.cache)
+        )
+        cls.cache.load()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls.directory.cleanup()
+
+    def test_schema_is_served_with_an_etag(self):
+        response = self.client.get(SCHEMA_URL)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response["Content-Type"], "application/vnd.oai.openapi"
+        )
+        self.assertIn(b"/api/v1/flights/", response.content)
+
+        response = self.client.get(
+            SCHEMA_URL, HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_json_format(self):
+        response = self.client.get(SCHEMA_URL, {"format": "json"})
+        self.assertEqual(
+            response["Content-Type"], "application/vnd.oai.openapi+json"
+        )
+        self.assertIn(
+            "/api/v1/flights/", json.loads(response.content)["paths"]
+        )
+
+    def test_schema_file_is_reused_while_the_code_is_unchanged(self):
+        with mock.patch.object(schema, "generate_schema") as generate:
+            SchemaCache().load()
+        generate.assert_not_called()
+
+        with mock.patch.object(
+            schema, "code_fingerprint", return_value="changed"
+        ), mock.patch.object(
+            schema, "generate_schema", return_value={"paths": {}}
+        ) as generate:
+            self.assertEqual(SchemaCache().load(), {"paths": {}})
+        generate.assert_called_once()
+        self.assertEqual(
+            json.loads(self.schema_file.read_text())["fingerprint"],
+            "changed"
+        )
+        self.cache.load(force=True)
+
+    def test_docs_point_at_the_cached_schema(self):
+        response = self.client.get(reverse("swagger-ui"))
+        self.assertContains(response, SCHEMA_URL)
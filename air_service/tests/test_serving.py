@@ -0,0 +1,74 @@
+import os
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+from air_service.management.commands.measure_serving import memory_kb
+from air_service.management.commands.serve import (
+    Command,
+    DjangoApplication,
+    warm_up,
+)
+
+
+class ServingTestCase(SimpleTestCase):
+    def test_warm_up_does_not_touch_the_database(self):
+        warm_up()
+
+    def test_options_reach_gunicorn(self):
+        application = DjangoApplication(
+            object(),
+            {"bind": "127.0.0.1:9000", "workers": 3, "preload_app": True},
+        )
+        self.assertEqual(application.cfg.workers, 3)
+        self.assertEqual(application.cfg.bind, ["127.0.0.1:9000"])
+        self.assertTrue(application.cfg.preload_app)
+
+    def serve(self, **options):
+        defaults = {
+            "bind": "127.0.0.1:9000",
+            "workers": 2,
+            "threads": 1,
+            "timeout": 30,
+            "graceful_timeout": 30,
+            "max_requests": 0,
+            "asgi": False,
+        }
+        with mock.patch(
+            "air_service.management.commands.serve.DjangoApplication"
+        ) as application, mock.patch("gc.freeze"):
+            Command().handle(**{**defaults, **options})
+        return application.call_args.args[1]
+
+    def test_worker_class_follows_the_options(self):
+        self.assertEqual(self.serve()["worker_class"], "sync")
+        self.assertEqual(self.serve(threads=4)["worker_class"], "gthread")
+        self.assertEqual(
+            self.serve(asgi=True)["worker_class"],
+            "uvicorn.workers.UvicornWorker"
+        )
+
+    def test_memory_is_read_from_proc(self):
+        memory = memory_kb(os.getpid())
+        self.assertGreater(memory["rss"], 0)
+        self.assertLessEqual(memory["private"], memory["rss"])
+
+
+class StartupProfileTestCase(SimpleTestCase):
+    def test_production_settings_leave_out_dev_apps(self):
+        from config.settings import prod
+
+        self.assertNotIn("debug_toolbar", prod.INSTALLED_APPS)
+        self.assertNotIn(
+            "debug_toolbar.middleware.DebugToolbarMiddleware",
+            prod.MIDDLEWARE
+        )
+
+    def test_profile_reports_imports_and_middleware(self):
+        stdout = StringIO()
+        call_command("startup_profile", top=3, requests=5, stdout=stdout)
+        output = stdout.getvalue()
+        self.assertIn("config.wsgi", output)
+        self.assertIn("air_service.middleware.CompressionMiddleware", output)
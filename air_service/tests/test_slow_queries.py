@@ -0,0 +1,192 @@
+import threading
+from types import SimpleNamespace
+
+from django.contrib.auth import get_user_model
+from django.db import DatabaseError, connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from air_service import slow_queries
+from air_service.models import Country
+from air_service.slow_queries import (
+    SlowQueryLog,
+    capture_slow_queries,
+    fingerprint,
+    get_log,
+    install_slow_query_capture,
+    normalize_sql,
+)
+
+SLOW_QUERIES_URL = reverse("air_service:slow-queries")
+COUNTRY_LIST_URL = reverse("air_service:country-list")
+
+
+def slow_query_settings(**overrides):
+    return {
+        "ENABLED": True,
+        "THRESHOLD_MS": 0,
+        "BUFFER_SIZE": 50,
+        "EXPLAIN_INTERVAL": 60,
+        "EXPLAIN_ANALYZE_SAMPLE_RATE": 0.0,
+        "EXPLAIN_QUEUE_SIZE": 100,
+        "EXPLAIN_TIMEOUT_MS": 5000,
+        **overrides,
+    }
+
+
+class NormalizeSqlTestCase(SimpleTestCase):
+    def test_literals_and_lists_are_replaced(self):
+        self.assertEqual(
+            normalize_sql(
+                "SELECT * FROM t\n  WHERE name = 'O''Hare' AND id IN "
+                "(%s, %s, %s) AND seats > 10"
+            ),
+            "SELECT * FROM t WHERE name = ? AND id IN (...) AND seats > ?",
+        )
+
+    def test_same_statement_same_fingerprint(self):
+        self.assertEqual(
+            fingerprint(normalize_sql("SELECT 1 FROM t WHERE id IN (%s)")),
+            fingerprint(
+                normalize_sql("SELECT 2 FROM t WHERE id IN (%s, %s)")
+            ),
+        )
+
+    @override_settings(SLOW_QUERIES=slow_query_settings())
+    def test_capture_is_installed_once(self):
+        fake = SimpleNamespace(execute_wrappers=[])
+        install_slow_query_capture(sender=None, connection=fake)
+        install_slow_query_capture(sender=None, connection=fake)
+        self.assertEqual(fake.execute_wrappers, [capture_slow_queries])
+
+
+class SlowQueryCaptureTestCase(TestCase):
+    def setUp(self):
+        slow_queries.slow_query_log = None
+        self.addCleanup(setattr, slow_queries, "slow_query_log", None)
+        self.admin = get_user_model().objects.create_superuser(
+            username="admin", password="password123"
+        )
+        Country.objects.create(country_name="Ukraine")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def request(self, url, **params):
+        with connection.execute_wrapper(capture_slow_queries):
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        get_log().wait_for_plans()
+        return response
+
+    def country_entries(self):
+        return [
+            entry
+            for entry in get_log().entries()
+            if "air_service_country" in entry["sql"]
+        ]
+
+    @override_settings(SLOW_QUERIES=slow_query_settings())
+    def test_statements_are_captured_with_view_and_plan(self):
+        self.request(COUNTRY_LIST_URL, search="ukr")
+        [entry] = [
+            entry
+            for entry in self.country_entries()
+            if "COUNT" not in entry["sql"]
+        ]
+        self.assertEqual(entry["view"], "air_service:country-list")
+        self.assertIn("LIKE UPPER(?)", entry["sql"])
+        self.assertNotIn("ukr", entry["sql"])
+        self.assertIn("Scan", entry["plan"])
+        self.assertFalse(entry["analyzed"])
+
+    @override_settings(
+        SLOW_QUERIES=slow_query_settings(EXPLAIN_ANALYZE_SAMPLE_RATE=1.0)
+    )
+    def test_analyze_sample(self):
+        self.request(COUNTRY_LIST_URL)
+        entry = self.country_entries()[0]
+        self.assertTrue(entry["analyzed"])
+        self.assertIn("actual time", entry["plan"])
+
+    @override_settings(
+        SLOW_QUERIES=slow_query_settings(EXPLAIN_ANALYZE_SAMPLE_RATE=1.0)
+    )
+    def test_locking_and_volatile_statements_are_not_analyzed(self):
+        statements = [
+            "SELECT id FROM air_service_country FOR UPDATE SKIP LOCKED",
+            "SELECT id FROM air_service_country FOR NO KEY UPDATE",
+            "SELECT pg_advisory_xact_lock(4100)",
+            "SELECT pg_notify('seat_inventory', '1')",
+        ]
+        log = get_log()
+        for sql in statements:
+            log.record(sql, [], False, 1.0, "default")
+        log.wait_for_plans()
+
+        entries = log.entries()
+        self.assertEqual(len(entries), len(statements))
+        for entry in entries:
+            with self.subTest(sql=entry["sql"]):
+                self.assertIsNotNone(entry["plan"])
+                self.assertFalse(entry["analyzed"])
+
+    def test_analyze_runs_read_only(self):
+        errors = []
+
+        def explain():
+            try:
+                SlowQueryLog.explain(
+                    "default",
+                    "SELECT nextval('air_service_seatinventoryevent_"
+                    "position_seq')",
+                    [],
+                    True,
+                )
+            except DatabaseError as error:
+                errors.append(error)
+            finally:
+                connection.close()
+
+        # A thread of its own, like the explain thread, so the statement
+        # runs in a transaction of its own.
+        thread = threading.Thread(target=explain)
+        thread.start()
+        thread.join(timeout=10)
+        self.assertIn("read-only transaction", str(errors[0]))
+
+    @override_settings(SLOW_QUERIES=slow_query_settings(THRESHOLD_MS=10000))
+    def test_fast_statements_are_ignored(self):
+        self.request(COUNTRY_LIST_URL)
+        self.assertEqual(get_log().entries(), [])
+
+    @override_settings(SLOW_QUERIES=slow_query_settings())
+    def test_admin_endpoint(self):
+        self.request(COUNTRY_LIST_URL)
+        response = self.client.get(
+            SLOW_QUERIES_URL, {"view": "air_service:country-list"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data["results"])
+        self.assertEqual(
+            {entry["view"] for entry in response.data["results"]},
+            {"air_service:country-list"},
+        )
+        self.assertEqual(
+            sum(summary["count"] for summary in response.data["fingerprints"]),
+            len(response.data["results"]),
+        )
+
+        response = self.client.delete(SLOW_QUERIES_URL)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(get_log().entries(), [])
+
+    @override_settings(SLOW_QUERIES=slow_query_settings())
+    def test_admin_only(self):
+        user = get_user_model().objects.create_user(
+            username="testuser", password="password123"
+        )
+        self.client.force_authenticate(user=user)
+        response = self.client.get(SLOW_QUERIES_URL)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,312 @@
+import asyncio
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import OperationalError
+from django.test import (
+    AsyncClient,
+    SimpleTestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from air_service.changes import stop_listener
+from air_service.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    City,
+    Country,
+    Flight,
+    Order,
+    Route,
+    Ticket,
+)
+from air_service.streams import LAGGED, SeatStreamHub
+
+
+def stream_url(flight_id):
+    return reverse("air_service:flight-seat-stream", args=[flight_id])
+
+
+def sample_flight():
+    country = Country.objects.create(country_name="Ukraine")
+    city = City.objects.create(city_name="Kyiv", country=country)
+    return Flight.objects.create(
+        route=Route.objects.create(
+            source=Airport.objects.create(airport_name="Kyiv", city=city),
+            destination=Airport.objects.create(
+                airport_name="Lviv", city=city
+            ),
+            distance=500,
+        ),
+        airplane=Airplane.objects.create(
+            airplane_name="Airplane1",
+            rows=10,
+            seats_in_row=6,
+            airplane_type=AirplaneType.objects.create(type_name="A320"),
+        ),
+        departure_datetime=datetime(2025, 12, 10, 8, tzinfo=timezone.utc),
+        arrival_datetime=datetime(2025, 12, 10, 10, tzinfo=timezone.utc),
+    )
+
+
+def book_seat(user, flight, seat_number):
+    order = Order.objects.create(user=user)
+    Ticket.objects.create(
+        order=order, flight=flight, seat_row=1, seat_number=seat_number
+    )
+
+
+@mock.patch.object(SeatStreamHub, "_run", mock.AsyncMock())
+class SeatStreamHubTestCase(SimpleTestCase):
+    async def test_events_reach_subscribers_of_their_flight(self):
+        hub = SeatStreamHub()
+        first = hub.subscribe(1)
+        second = hub.subscribe(1)
+        other = hub.subscribe(2)
+
+        event = SimpleNamespace(id=10, flight_id=1)
+        hub.publish([event])
+
+        self.assertIs(first.queue.get_nowait(), event)
+        self.assertIs(second.queue.get_nowait(), event)
+        self.assertTrue(other.queue.empty())
+
+    async def test_slow_subscriber_is_dropped(self):
+        hub = SeatStreamHub()
+        with self.settings(SEAT_STREAM={"QUEUE_SIZE": 2}):
+            slow = hub.subscribe(1)
+        hub.publish(
+            [SimpleNamespace(id=i, flight_id=1) for i in range(1, 4)]
+        )
+
+        self.assertIs(slow.queue.get_nowait(), LAGGED)
+        self.assertEqual(hub.subscriber_count, 0)
+
+
+# Streams query on their own connections, the data has to be committed.
+class SeatStreamViewTestCase(TransactionTestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="testuser", password="password123"
+        )
+        self.flight = sample_flight()
+
+    def test_stream_requires_authentication(self):
+        response = self.client.get(stream_url(self.flight.id))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_unknown_flight(self):
+        response = self.client.get(
+            stream_url(self.flight.id + 1),
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}",
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class SyncSeatStreamTestCase(TransactionTestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="testuser", password="password123"
+        )
+        self.flight = sample_flight()
+        self.headers = {
+            "HTTP_AUTHORIZATION": f"Bearer {AccessToken.for_user(self.user)}"
+        }
+        # The listener keeps a connection to the test database open.
+        self.addCleanup(stop_listener)
+
+    def read_event(self, stream):
+        while True:
+            lines = [
+                line for line in next(stream).decode().splitlines()
+                if line and not line.startswith(("retry:", ":"))
+            ]
+            if lines:
+                return lines
+
+    def test_sync_worker_is_refused(self):
+        response = self.client.get(stream_url(self.flight.id), **self.headers)
+        self.assertEqual(
+            response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+        self.assertEqual(response["Retry-After"], "3")
+
+    def test_threaded_worker_follows_the_change_feed(self):
+        response = self.client.get(
+            stream_url(self.flight.id),
+            **self.headers,
+            **{"wsgi.multithread": True},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        stream = response.streaming_content
+        try:
+            snapshot = self.read_event(stream)
+            self.assertIn("event: snapshot", snapshot)
+            self.assertIn('"tickets_available": 60', snapshot[-1])
+
+            book_seat(self.user, self.flight, 1)
+            event = self.read_event(stream)
+            self.assertIn("event: seats", event)
+            self.assertIn('"tickets_available": 59', event[-1])
+        finally:
+            response.close()
+
+    def test_stream_ends_when_the_flight_is_deleted(self):
+        response = self.client.get(
+            stream_url(self.flight.id),
+            **self.headers,
+            **{"wsgi.multithread": True},
+        )
+        stream = response.streaming_content
+        try:
+            self.assertIn("event: snapshot", self.read_event(stream))
+
+            self.flight.delete()
+            self.assertIn("event: deleted", self.read_event(stream))
+            self.assertEqual(list(stream), [])
+        finally:
+            response.close()
+
+    @override_settings(
+        CHANGE_FEED={"MAX_EVENTS": 500, "MAX_TIMEOUT": 30, "MAX_WAITERS": 0}
+    )
+    def test_stream_over_the_waiter_limit_ends(self):
+        response = self.client.get(
+            stream_url(self.flight.id),
+            **self.headers,
+            **{"wsgi.multithread": True},
+        )
+        chunks = list(response.streaming_content)
+        self.assertEqual(len(chunks), 1)
+        self.assertTrue(chunks[0].startswith(b"retry: 3000"))
+
+
+class SeatStreamTestCase(TransactionTestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="testuser", password="password123"
+        )
+        self.flight = sample_flight()
+        self.client = AsyncClient()
+        self.headers = {
+            "Authorization": f"Bearer {AccessToken.for_user(self.user)}"
+        }
+
+    async def read_event(self, stream):
+        """Next event of the stream, skipping comments and heartbeats."""
+        while True:
+            chunk = await asyncio.wait_for(anext(stream), timeout=10)
+            lines = [
+                line for line in chunk.decode().splitlines()
+                if line and not line.startswith(("retry:", ":"))
+            ]
+            if lines:
+                return lines
+
+    async def test_booking_is_pushed_to_open_streams(self):
+        response = await self.client.get(
+            stream_url(self.flight.id), headers=self.headers
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        stream = response.streaming_content
+        try:
+            snapshot = await self.read_event(stream)
+            self.assertIn("event: snapshot", snapshot)
+            self.assertIn('"tickets_available": 60', snapshot[-1])
+
+            await sync_to_async(book_seat)(self.user, self.flight, 1)
+            event = await self.read_event(stream)
+            self.assertIn("event: seats", event)
+            self.assertIn('"seats_delta": 1', event[-1])
+            self.assertIn('"tickets_available": 59', event[-1])
+        finally:
+            await stream.aclose()
+
+    async def test_stream_ends_when_the_flight_is_deleted(self):
+        response = await self.client.get(
+            stream_url(self.flight.id), headers=self.headers
+        )
+        stream = response.streaming_content
+        try:
+            self.assertIn("event: snapshot", await self.read_event(stream))
+
+            flight_id = self.flight.id
+            await self.flight.adelete()
+            event = await self.read_event(stream)
+            self.assertIn("event: deleted", event)
+            self.assertEqual(event[-1], f'data: {{"flight": {flight_id}}}')
+            with self.assertRaises(StopAsyncIteration):
+                await anext(stream)
+        finally:
+            await stream.aclose()
+
+    async def test_reconnect_replays_missed_events(self):
+        await sync_to_async(book_seat)(self.user, self.flight, 1)
+        await sync_to_async(book_seat)(self.user, self.flight, 2)
+
+        response = await self.client.get(
+            stream_url(self.flight.id),
+            headers={**self.headers, "Last-Event-ID": "0"},
+        )
+        stream = response.streaming_content
+        try:
+            first = await self.read_event(stream)
+            second = await self.read_event(stream)
+        finally:
+            await stream.aclose()
+        self.assertIn('"tickets_available": 59', first[-1])
+        self.assertIn('"tickets_available": 58', second[-1])
+
+
+class SeatStreamListenerFailureTestCase(TransactionTestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="testuser", password="password123"
+        )
+        self.flight = sample_flight()
+
+    async def test_listener_survives_database_errors(self):
+        hub = SeatStreamHub()
+        hub.reconnect_delay = 0
+        with mock.patch(
+            "air_service.streams.latest_cursor",
+            side_effect=[OperationalError("Connection lost"), 0],
+        ), self.assertLogs("air_service.streams", "ERROR"):
+            subscription = hub.subscribe(self.flight.id)
+            try:
+                self.assertTrue(await hub.wait_until_listening(10))
+            finally:
+                hub.unsubscribe(subscription)
+
+    @mock.patch.object(SeatStreamHub, "_run", mock.AsyncMock())
+    async def test_stream_ends_while_the_listener_is_down(self):
+        client = AsyncClient()
+        with self.settings(
+            SEAT_STREAM={
+                **settings.SEAT_STREAM, "LISTEN_TIMEOUT": 0.1, "RETRY": 10
+            }
+        ):
+            response = await client.get(
+                stream_url(self.flight.id),
+                headers={
+                    "Authorization": (
+                        f"Bearer {AccessToken.for_user(self.user)}"
+                    )
+                },
+            )
+            chunks = [
+                chunk.decode()
+                async for chunk in response.streaming_content
+            ]
+        self.assertEqual(len(chunks), 1)
+        self.assertTrue(chunks[0].startswith("retry: 10"))
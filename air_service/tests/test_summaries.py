@@ -0,0 +1,185 @@
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from air_service.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    City,
+    Country,
+    Flight,
+    Order,
+    OrderSummary,
+    Route,
+    Ticket,
+)
+from jobs.worker import run_pending
+
+ORDER_LIST_URL = reverse("air_service:order-list")
+DEPARTURE = datetime(2025, 12, 10, 8, tzinfo=timezone.utc)
+
+
+class OrderSummaryTestCase(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="testuser", password="password123", is_staff=True
+        )
+        country = Country.objects.create(country_name="Ukraine")
+        city = City.objects.create(city_name="Kyiv", country=country)
+        self.kyiv = Airport.objects.create(airport_name="Kyiv", city=city)
+        self.lviv = Airport.objects.create(airport_name="Lviv", city=city)
+        airplane = Airplane.objects.create(
+            airplane_name="Airplane1",
+            rows=10,
+            seats_in_row=6,
+            airplane_type=AirplaneType.objects.create(type_name="A320"),
+        )
+        self.outbound = Flight.objects.create(
+            route=Route.objects.create(
+                source=self.kyiv, destination=self.lviv, distance=470
+            ),
+            airplane=airplane,
+            departure_datetime=DEPARTURE,
+            arrival_datetime=DEPARTURE + timedelta(hours=1),
+        )
+        self.inbound = Flight.objects.create(
+            route=Route.objects.create(
+                source=self.lviv, destination=self.kyiv, distance=470
+            ),
+            airplane=airplane,
+            departure_datetime=DEPARTURE + timedelta(days=3),
+            arrival_datetime=DEPARTURE + timedelta(days=3, hours=1),
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    @contextmanager
+    def run_jobs_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            yield
+        run_pending()
+
+    def book(self, *flights):
+        response = self.client.post(
+            ORDER_LIST_URL,
+            {
+                "tickets": [
+                    {"seat_row": 1, "seat_number": seat, "flight": flight.id}
+                    for seat, flight in enumerate(flights, start=1)
+                ]
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return OrderSummary.objects.get(order_id=response.data["id"])
+
+    def test_summary_follows_the_tickets(self):
+        summary = self.book(self.inbound, self.outbound)
+        self.assertEqual(summary.ticket_count, 2)
+        self.assertEqual(summary.first_departure, DEPARTURE)
+        self.assertEqual(summary.source_names, "Kyiv, Lviv")
+        self.assertEqual(summary.destination_names, "Lviv, Kyiv")
+        self.assertEqual(
+            summary.flight_ids, [self.outbound.id, self.inbound.id]
+        )
+
+        Ticket.objects.get(flight=self.outbound).delete()
+        summary.refresh_from_db()
+        self.assertEqual(summary.ticket_count, 1)
+        self.assertEqual(summary.source_names, "Lviv")
+
+    def test_empty_order_has_a_summary(self):
+        order = Order.objects.create(user=self.user)
+        self.assertEqual(order.summary.ticket_count, 0)
+        self.assertIsNone(order.summary.first_departure)
+
+    def test_list_reads_only_summaries(self):
+        order_id = self.book(self.outbound, self.inbound).order_id
+        self.book(self.inbound)
+        with self.assertNumQueries(2):
+            response = self.client.get(ORDER_LIST_URL)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 2)
+        self.assertEqual(
+            response.data["results"][1],
+            {
+                "id": order_id,
+                "order_created_at": response.data["results"][1][
+                    "order_created_at"
+                ],
+                "ticket_count": 2,
+                "first_departure": "2025-12-10T08:00:00Z",
+                "source_names": "Kyiv, Lviv",
+                "destination_names": "Lviv, Kyiv",
+                "flight_ids": [self.outbound.id, self.inbound.id],
+            },
+        )
+
+    def test_list_filters_and_ordering(self):
+        round_trip = self.book(self.outbound, self.inbound).order_id
+        one_way = self.book(self.inbound).order_id
+        response = self.client.get(ORDER_LIST_URL, {"source": "kyi"})
+        self.assertEqual(
+            [order["id"] for order in response.data["results"]],
+            [round_trip],
+        )
+        response = self.client.get(ORDER_LIST_URL, {"search": "lviv"})
+        self.assertEqual(response.data["count"], 2)
+        response = self.client.get(
+            ORDER_LIST_URL, {"ordering": "-first_departure"}
+        )
+        self.assertEqual(
+            [order["id"] for order in response.data["results"]],
+            [one_way, round_trip],
+        )
+
+    def test_retrieve_returns_the_tickets(self):
+        order_id = self.book(self.outbound).order_id
+        response = self.client.get(
+            reverse("air_service:order-detail", args=[order_id])
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["tickets"][0]["flight"]["id"], self.outbound.id
+        )
+
+    def test_schedule_and_airport_changes_are_picked_up(self):
+        summary = self.book(self.outbound)
+        with self.run_jobs_on_commit():
+            self.outbound.departure_datetime += timedelta(hours=2)
+            self.outbound.arrival_datetime += timedelta(hours=2)
+            self.outbound.save()
+        summary.refresh_from_db()
+        self.assertEqual(
+            summary.first_departure, DEPARTURE + timedelta(hours=2)
+        )
+
+        with self.run_jobs_on_commit():
+            self.kyiv.airport_name = "Boryspil"
+            self.kyiv.save()
+        summary.refresh_from_db()
+        self.assertEqual(summary.source_names, "Boryspil")
+
+    def test_deleted_flight_is_dropped(self):
+        summary = self.book(self.outbound, self.inbound)
+        with self.run_jobs_on_commit():
+            self.outbound.delete()
+        summary.refresh_from_db()
+        self.assertEqual(summary.ticket_count, 1)
+        self.assertEqual(summary.flight_ids, [self.inbound.id])
+
+    def test_rebuild_command(self):
+        summary = self.book(self.outbound)
+        OrderSummary.objects.update(ticket_count=0, source_names="")
+        call_command("rebuild_order_summaries", stdout=StringIO())
+        summary.refresh_from_db()
+        self.assertEqual(summary.ticket_count, 1)
+        self.assertEqual(summary.source_names, "Kyiv")
@@ -0,0 +1,108 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework.views import APIView
+
+from air_service.throttling import (
+    SlidingWindowRateThrottle,
+    UserSlidingWindowThrottle,
+)
+
+THROTTLE_RATES = {
+    "user": "3/min",
+    "orders": "5/min",
+    "orders_write": "2/min",
+}
+
+
+class OrdersView(APIView):
+    permission_classes = ()
+    throttle_classes = [UserSlidingWindowThrottle]
+    throttle_scope = "orders"
+
+    def get(self, request):
+        return Response()
+
+    def post(self, request):
+        return Response()
+
+
+class PlainView(APIView):
+    permission_classes = ()
+    throttle_classes = [UserSlidingWindowThrottle]
+
+    def get(self, request):
+        return Response()
+
+
+@mock.patch.object(SlidingWindowRateThrottle, "THROTTLE_RATES", THROTTLE_RATES)
+class SlidingWindowThrottleTestCase(TestCase):
+    def setUp(self):
+        caches["throttle"].clear()
+        self.factory = APIRequestFactory()
+        self.user = get_user_model().objects.create_user(
+            username="testuser", password="password123"
+        )
+        self.now = 1200.0
+        timer = mock.patch.object(
+            SlidingWindowRateThrottle, "timer", lambda throttle: self.now
+        )
+        timer.start()
+        self.addCleanup(timer.stop)
+
+    def request(self, view, method="get"):
+        request = getattr(self.factory, method)("/")
+        force_authenticate(request, user=self.user)
+        return view.as_view()(request)
+
+    def test_requests_over_rate_are_throttled(self):
+        for _ in range(3):
+            response = self.request(PlainView)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.request(PlainView)
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_429_TOO_MANY_REQUESTS
+        )
+        self.assertIn("Retry-After", response)
+
+    def test_write_scope_is_stricter_than_read_scope(self):
+        for _ in range(2):
+            response = self.request(OrdersView, "post")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.request(OrdersView, "post")
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_429_TOO_MANY_REQUESTS
+        )
+        for _ in range(5):
+            response = self.request(OrdersView)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_previous_window_is_weighted_by_overlap(self):
+        for _ in range(3):
+            self.request(PlainView)
+
+        self.now += 60 + 30
+        # Half of the previous window still overlaps: 3 * 0.5 + 1 <= 3
+        response = self.request(PlainView)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.request(PlainView)
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_429_TOO_MANY_REQUESTS
+        )
+
+    def test_rejected_requests_do_not_consume_allowance(self):
+        for _ in range(10):
+            self.request(PlainView)
+
+        self.now += 60 + 40
+        # Only the 3 accepted requests count: 3 * (1 / 3) + 1 <= 3
+        response = self.request(PlainView)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
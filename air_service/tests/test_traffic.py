@@ -0,0 +1,164 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.management import call_command
+from django.http import QueryDict
+from django.test import (
+    LiveServerTestCase,
+    SimpleTestCase,
+    TestCase,
+    override_settings,
+)
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from air_service import traffic
+from air_service.middleware import TrafficRecordingMiddleware
+from air_service.models import Country
+from air_service.traffic import anonymize_query, body_from_shape, body_shape
+
+COUNTRY_LIST_URL = reverse("air_service:country-list")
+
+
+def recording_settings(path, **overrides):
+    return {
+        "ENABLED": True,
+        "SAMPLE_RATE": 1,
+        "FILE": path,
+        "QUEUE_SIZE": 100,
+        "FLUSH_INTERVAL": 0.05,
+        **overrides,
+    }
+
+
+class TrafficShapeTestCase(SimpleTestCase):
+    def test_body_shape(self):
+        shape = body_shape(
+            {"tickets": [{"seat_row": 1, "flight": 2}] * 3, "note": None}
+        )
+        self.assertEqual(
+            shape,
+            {
+                "tickets": {
+                    "list": 3,
+                    "item": {"seat_row": "int", "flight": "int"},
+                },
+                "note": "null",
+            },
+        )
+        self.assertEqual(
+            body_from_shape(shape),
+            {"tickets": [{"seat_row": 1, "flight": 1}] * 3, "note": None},
+        )
+
+    def test_credentials_are_redacted(self):
+        query = QueryDict("search=kyiv&token=secret&token=other")
+        self.assertEqual(
+            anonymize_query(query),
+            {"search": ["kyiv"], "token": ["<redacted>", "<redacted>"]},
+        )
+
+    def test_disabled_by_default(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            TrafficRecordingMiddleware(lambda request: None)
+
+
+class TrafficRecordingTestCase(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / "traffic.jsonl"
+        self.user = get_user_model().objects.create_user(
+            username="testuser", password="password123", is_staff=True
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def records(self):
+        traffic.traffic_writer.close()
+        with open(self.path) as file:
+            return [json.loads(line) for line in file]
+
+    def test_requests_are_recorded(self):
+        with override_settings(TRAFFIC_RECORDING=recording_settings(
+            self.path
+        )):
+            self.client.get(COUNTRY_LIST_URL, {"search": "ukr"})
+            self.client.post(
+                COUNTRY_LIST_URL, {"country_name": "Ukraine"}, format="json"
+            )
+            [listed, created] = self.records()
+
+        self.assertEqual(listed["method"], "GET")
+        self.assertEqual(listed["path"], COUNTRY_LIST_URL)
+        self.assertEqual(listed["query"], {"search": ["ukr"]})
+        self.assertEqual(listed["endpoint"], "air_service:country-list")
+        self.assertEqual(listed["user"], "staff")
+        self.assertEqual(listed["status"], 200)
+        self.assertGreater(listed["queries"], 0)
+        self.assertIsNone(listed["body"])
+        self.assertEqual(created["body"], {"country_name": "str"})
+        self.assertEqual(created["status"], 201)
+        self.assertTrue(Country.objects.filter(country_name="Ukraine"))
+
+    def test_sampling(self):
+        with override_settings(TRAFFIC_RECORDING=recording_settings(
+            self.path, SAMPLE_RATE=0
+        )):
+            self.client.get(COUNTRY_LIST_URL)
+            traffic.traffic_writer.close()
+        self.assertFalse(self.path.exists())
+
+
+class ReplayTrafficTestCase(LiveServerTestCase):
+    def setUp(self):
+        get_user_model().objects.create_user(
+            username="testuser", password="password123"
+        )
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / "traffic.jsonl"
+        record = {
+            "method": "GET",
+            "path": COUNTRY_LIST_URL,
+            "query": {"search": ["ukr"]},
+            "body": None,
+            "endpoint": "air_service:country-list",
+            "status": 200,
+            "latency_ms": 5,
+            "queries": 2,
+        }
+        records = [
+            {**record, "time": 1000.0, "user": "user"},
+            {**record, "time": 1000.1, "user": "user"},
+            {**record, "time": 1000.2, "user": "staff"},
+            {**record, "time": 1000.3, "user": "user", "method": "POST"},
+        ]
+        self.path.write_text(
+            "".join(json.dumps(record) + "\n" for record in records)
+            + '{"truncated'
+        )
+
+    def test_replay_reports_per_endpoint(self):
+        out = StringIO()
+        call_command(
+            "replay_traffic",
+            str(self.path),
+            "--url", self.live_server_url,
+            "--as", "user=testuser",
+            "--speed", "10",
+            stdout=out,
+        )
+        output = out.getvalue()
+        self.assertIn("Replayed 2 requests", output)
+        self.assertIn("skipped 1: no user for staff", output)
+        self.assertIn("skipped 1: write", output)
+        [row] = [
+            line for line in output.splitlines()
+            if line.startswith("air_service:country-list")
+        ]
+        self.assertEqual(row.split()[1:4], ["2", "0", "0.0%"])
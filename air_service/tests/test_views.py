@@ -385,6 +385,54 @@ class FilteringTestCase(TestCase):
             "2025-12-11T23:45:00Z"
         )
 
+    def test_flight_filtering_by_min_available(self):
+        url = FLIGHT_LIST_URL
+        response = self.client.get(url, {"min_available": "74"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["id"], self.flight2.id)
+        self.assertEqual(response.data["results"][0]["tickets_available"], 75)
+
+    def test_flight_filtering_by_min_capacity(self):
+        url = FLIGHT_LIST_URL
+        response = self.client.get(url, {"min_capacity": "76"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 0)
+
+    def test_flight_capacity_filters_must_be_counts(self):
+        for param in ("min_capacity", "min_available"):
+            for value in ("abc", "-1"):
+                with self.subTest(param=param, value=value):
+                    response = self.client.get(
+                        FLIGHT_LIST_URL, {param: value}
+                    )
+                    self.assertEqual(
+                        response.status_code, status.HTTP_400_BAD_REQUEST
+                    )
+                    self.assertIn(param, response.data)
+
+    def test_flight_ordering_by_tickets_available(self):
+        url = FLIGHT_LIST_URL
+        response = self.client.get(url, {"ordering": "tickets_available"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [flight["id"] for flight in response.data["results"]],
+            [self.flight1.id, self.flight2.id]
+        )
+
+    def test_airplane_filtering_by_min_capacity(self):
+        url = AIRPLANE_LIST_URL
+        response = self.client.get(url, {"min_capacity": "75"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 2)
+        response = self.client.get(url, {"min_capacity": "76"})
+        self.assertEqual(len(response.data["results"]), 0)
+
+    def test_airplane_min_capacity_must_be_a_count(self):
+        response = self.client.get(AIRPLANE_LIST_URL, {"min_capacity": "abc"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("min_capacity", response.data)
+
     def test_order_filtering_without_filtering(self):
         url = ORDER_LIST_URL
         response = self.client.get(url, {"page": 1})
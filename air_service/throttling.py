@@ -0,0 +1,104 @@
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.throttling import (
+    SimpleRateThrottle,
+    AnonRateThrottle,
+    UserRateThrottle,
+)
+
+
+class SlidingWindowRateThrottle(SimpleRateThrottle):
+    """
+    Sliding-window counter throttle.
+
+    Instead of storing the full request history per client, one integer
+    counter is kept per client and fixed window. The previous window's
+    counter is weighted by how much of it still overlaps the sliding
+    window, so every request costs one atomic increment and one read.
+    """
+
+    cache_format = "throttle_%(scope)s_%(ident)s"
+
+    @property
+    def cache(self):
+        return caches[settings.THROTTLE_CACHE_ALIAS]
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        window, self.elapsed = divmod(self.now / self.duration, 1)
+        current_key = f"{self.key}_{int(window)}"
+        previous_key = f"{self.key}_{int(window) - 1}"
+
+        self.cache.add(current_key, 0, self.duration * 2)
+        try:
+            current = self.cache.incr(current_key)
+        except ValueError:
+            # The counter expired or was evicted between add() and incr().
+            self.cache.set(current_key, 1, self.duration * 2)
+            current = 1
+        self.previous = self.cache.get(previous_key, 0)
+
+        self.estimated = self.previous * (1 - self.elapsed) + current
+        if self.estimated > self.num_requests:
+            # Rejected requests don't consume the allowance.
+            self.cache.decr(current_key)
+            return self.throttle_failure()
+        return self.throttle_success()
+
+    def throttle_success(self):
+        return True
+
+    def wait(self):
+        remaining_window = self.duration * (1 - self.elapsed)
+        if self.previous:
+            excess = self.estimated - self.num_requests
+            seconds = excess * self.duration / self.previous
+            if seconds <= remaining_window:
+                return seconds
+        return remaining_window
+
+
+class AnonSlidingWindowThrottle(SlidingWindowRateThrottle, AnonRateThrottle):
+    """
+    Limits the rate of API calls that may be made by anonymous users.
+    """
+
+
+class UserSlidingWindowThrottle(SlidingWindowRateThrottle, UserRateThrottle):
+    """
+    Limits the rate of API calls that may be made by a given user.
+
+    Views may set `throttle_scope` to get their own rate and counter.
+    Unsafe requests use `<scope>_write` when that rate is configured.
+    Views without a configured scope share the `user` rate.
+    """
+
+    scope_attr = "throttle_scope"
+
+    def allow_request(self, request, view):
+        scope = self.get_view_scope(request, view)
+        if scope:
+            self.scope = scope
+            self.rate = self.get_rate()
+            self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
+
+    def get_view_scope(self, request, view):
+        scope = getattr(view, self.scope_attr, None)
+        if not scope:
+            return None
+        if request.method not in SAFE_METHODS:
+            write_scope = f"{scope}_write"
+            if write_scope in self.THROTTLE_RATES:
+                return write_scope
+        if scope in self.THROTTLE_RATES:
+            return scope
+        return None
@@ -0,0 +1,185 @@
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+
+from django.conf import settings
+
+# Query parameters whose values are never written to the traffic file.
+REDACTED_PARAMS = frozenset(
+    {"access", "email", "password", "refresh", "token"}
+)
+REDACTED = "<redacted>"
+# Bodies larger than this are recorded as `"<large>"` instead of a shape.
+MAX_BODY_SIZE = 64 * 1024
+_STOP = object()
+
+
+def body_shape(value):
+    """
+    Replace every value of a JSON document by its type name.
+
+    Lists keep their length and the shape of their first item, which is
+    what a replay needs to send a body of the same size and structure.
+    """
+    if isinstance(value, dict):
+        return {key: body_shape(item) for key, item in value.items()}
+    if isinstance(value, list):
+        if not value:
+            return []
+        return {"list": len(value), "item": body_shape(value[0])}
+    if value is None:
+        return "null"
+    return type(value).__name__
+
+
+def body_from_shape(shape):
+    """A placeholder document with the structure of `shape`."""
+    if isinstance(shape, dict):
+        if set(shape) == {"list", "item"}:
+            return [body_from_shape(shape["item"])] * shape["list"]
+        return {key: body_from_shape(item) for key, item in shape.items()}
+    if isinstance(shape, list):
+        return []
+    return {"int": 1, "float": 1.0, "bool": True, "str": "x"}.get(shape)
+
+
+def anonymize_query(query_dict):
+    return {
+        key: (
+            [REDACTED] * len(values)
+            if key.lower() in REDACTED_PARAMS
+            else values
+        )
+        for key, values in query_dict.lists()
+    }
+
+
+def request_body_shape(request):
+    if request.method in ("GET", "HEAD", "OPTIONS"):
+        return None
+    if request.content_type != "application/json":
+        return request.content_type or None
+    if int(request.META.get("CONTENT_LENGTH") or 0) > MAX_BODY_SIZE:
+        return "<large>"
+    try:
+        return body_shape(json.loads(request.body))
+    except ValueError:
+        return "<invalid>"
+
+
+def user_class(request):
+    user = getattr(request, "user", None)
+    if user is None or not user.is_authenticated:
+        return "anonymous"
+    return "staff" if user.is_staff else "user"
+
+
+class QueryCounter:
+    """`connection.execute_wrapper` that counts the statements it sees."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class TrafficWriter:
+    """
+    Appends records to `TRAFFIC_RECORDING["FILE"]` from a background
+    thread, so requests never wait on the disk.
+
+    Records are queued up to `QUEUE_SIZE` and dropped beyond that. Each
+    batch is written with a single `os.write` on an `O_APPEND` descriptor,
+    so lines from several workers never interleave.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queue = None
+        self._thread = None
+        self.dropped = 0
+
+    def write(self, record):
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            config = settings.TRAFFIC_RECORDING
+            self._queue = queue.Queue(maxsize=config["QUEUE_SIZE"])
+            self._thread = threading.Thread(
+                target=self._run,
+                args=(
+                    self._queue,
+                    os.fspath(config["FILE"]),
+                    config["FLUSH_INTERVAL"],
+                ),
+                name="traffic-writer",
+                daemon=True,
+            )
+            self._thread.start()
+
+    @staticmethod
+    def _run(records, path, flush_interval):
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        lines = []
+        flushed_at = time.monotonic()
+        try:
+            while True:
+                try:
+                    record = records.get(timeout=flush_interval)
+                except queue.Empty:
+                    record = None
+                if record is not None and record is not _STOP:
+                    lines.append(
+                        json.dumps(record, separators=(",", ":")) + "\n"
+                    )
+                now = time.monotonic()
+                if lines and (
+                    record is _STOP or now - flushed_at >= flush_interval
+                ):
+                    os.write(fd, "".join(lines).encode())
+                    lines.clear()
+                    flushed_at = now
+                if record is _STOP:
+                    return
+        finally:
+            os.close(fd)
+
+    def close(self):
+        """Write out everything queued so far and stop the thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+            if thread is None:
+                return
+            self._queue.put(_STOP)
+        thread.join()
+
+
+traffic_writer = TrafficWriter()
+atexit.register(traffic_writer.close)
+
+
+def _reset_writer():
+    # The writer thread does not survive a fork.
+    global traffic_writer
+    traffic_writer = TrafficWriter()
+    atexit.register(traffic_writer.close)
+
+
+os.register_at_fork(after_in_child=_reset_writer)
+
+
+def write_record(record):
+    traffic_writer.write(record)
@@ -16,6 +16,28 @@ router.register(r"orders", views.OrderViewSet)
 
 
 urlpatterns = [
+    path(
+        "autocomplete/",
+        views.AutocompleteView.as_view(),
+        name="autocomplete",
+    ),
+    path("batch/", views.BatchView.as_view(), name="batch"),
+    path("changes/", views.ChangesView.as_view(), name="changes"),
+    path(
+        "deletions/<int:pk>/",
+        views.DeletionView.as_view(),
+        name="deletion-detail",
+    ),
+    path(
+        "slow-queries/",
+        views.SlowQueriesView.as_view(),
+        name="slow-queries",
+    ),
+    path(
+        "flights/<int:pk>/seats/stream/",
+        views.flight_seat_stream,
+        name="flight-seat-stream",
+    ),
     path("", include(router.urls)),
 ]
 
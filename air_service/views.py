@@ -1,7 +1,36 @@
-from django.db.models import Prefetch, Count, F, Min, Max
+import os
+
+from django.conf import settings
+from django.contrib.postgres.expressions import ArraySubquery
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Count, F, Min, Max, OuterRef
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils import timezone
 from drf_spectacular.utils import extend_schema, OpenApiParameter
-from rest_framework import viewsets, filters
+from rest_framework import (
+    exceptions,
+    generics,
+    viewsets,
+    filters,
+    permissions,
+    serializers,
+    status,
+)
+from rest_framework.decorators import action
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.reverse import reverse
+from rest_framework.settings import api_settings
+from rest_framework.views import APIView
 
+from air_service.autocomplete import autocomplete_index
+from air_service.batch import run_batch
+from air_service.changes import can_wait, latest_cursor, wait_for_events
+from air_service.deletion import delete_or_schedule
+from air_service.fieldsets import SparseFieldsetViewMixin
+from air_service.geo import airport_grid
+from air_service.idempotency import IDEMPOTENCY_HEADER, idempotent
 from air_service.models import (
     Country,
     City,
@@ -10,9 +39,10 @@ from air_service.models import (
     AirplaneType,
     Route,
     Crew,
+    Deletion,
     Flight,
     Order,
-    Ticket,
+    OrderSummary,
 )
 from air_service.serializers import (
     CountrySerializer,
@@ -27,16 +57,75 @@ from air_service.serializers import (
     CrewRetrieveSerializer,
     OrderSerializer,
     AirplaneSerializer,
+    AirplaneQuerySerializer,
     AirplaneTypeSerializer,
     FlightRetrieveSerializer,
-    OrderListRetrieveSerializer
+    OrderListRetrieveSerializer,
+    OrderSummarySerializer,
+    ScheduleWindowSerializer,
+    FlightQuerySerializer,
+    BatchSerializer,
+    AutocompleteQuerySerializer,
+    NearbyAirportsQuerySerializer,
+    ChangesQuerySerializer,
+    SeatInventoryEventSerializer,
+    DeletionSerializer,
+)
+from air_service.slow_queries import get_log
+from air_service.streams import run_query, seat_stream, sync_seat_stream
+
+IDEMPOTENCY_KEY_PARAMETER = OpenApiParameter(
+    IDEMPOTENCY_HEADER,
+    type={"type": "string"},
+    location=OpenApiParameter.HEADER,
+    description="Retries with the same key get the first response back "
+                "instead of writing again"
 )
+FIELDSET_PARAMETERS = [
+    OpenApiParameter(
+        "fields",
+        type={"type": "string"},
+        description="Comma separated fields to return, dotted names "
+                    "select fields of nested objects"
+    ),
+    OpenApiParameter(
+        "expand",
+        type={"type": "string"},
+        description="Comma separated relations to nest, the others are "
+                    "returned as ids. All are nested when omitted"
+    ),
+]
+
+
+class BackgroundDestroyMixin:
+    """
+    Objects with many flights are deleted in the background, the response
+    is 202 with the `Deletion` to follow instead of 204.
+    """
+
+    @extend_schema(responses={202: DeletionSerializer, 204: None})
+    def destroy(self, request, *args, **kwargs):
+        deletion = delete_or_schedule(self.get_object())
+        if deletion is None:
+            return Response(status=status.HTTP_204_NO_CONTENT)
+        return Response(
+            DeletionSerializer(deletion).data,
+            status=status.HTTP_202_ACCEPTED,
+            headers={
+                "Location": reverse(
+                    "air_service:deletion-detail",
+                    args=[deletion.id],
+                    request=request,
+                )
+            },
+        )
 
 
 class CountryViewSet(viewsets.ModelViewSet):
     queryset = Country.objects.all()
     serializer_class = CountrySerializer
     filter_backends = [filters.SearchFilter]
+    throttle_scope = "reference"
     search_fields = ["country_name"]
 
 
@@ -44,6 +133,7 @@ class CityViewSet(viewsets.ModelViewSet):
     queryset = City.objects.all()
     serializer_class = CitySerializer
     filter_backends = [filters.SearchFilter]
+    throttle_scope = "reference"
     search_fields = ["city_name", "country__country_name"]
 
     def get_queryset(self):
@@ -53,7 +143,7 @@ class CityViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(
                 country__country_name__icontains=country
             )
-        if self.action == "list":
+        if self.action in ("list", "retrieve"):
             return queryset.select_related("country")
         return queryset
 
@@ -74,6 +164,7 @@ class AirportViewSet(viewsets.ModelViewSet):
     queryset = Airport.objects.all()
     serializer_class = AirportRetrieveSerializer
     filter_backends = [filters.SearchFilter]
+    throttle_scope = "reference"
     search_fields = ["airport_name", "city__city_name"]
 
     def get_queryset(self):
@@ -88,9 +179,9 @@ class AirportViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(
                 city__country__country_name__icontains=country
             )
-        if self.action == "list":
+        if self.action in ("list", "retrieve"):
             return queryset.select_related("city__country")
-        return queryset.distinct()
+        return queryset
 
     @extend_schema(
         parameters=[
@@ -109,23 +200,72 @@ class AirportViewSet(viewsets.ModelViewSet):
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "latitude",
+                type={"type": "number"},
+                required=True,
+                description="Latitude of the point in degrees"
+            ),
+            OpenApiParameter(
+                "longitude",
+                type={"type": "number"},
+                required=True,
+                description="Longitude of the point in degrees"
+            ),
+            OpenApiParameter(
+                "radius",
+                type={"type": "number"},
+                description="Search radius in km (default 300)"
+            ),
+            OpenApiParameter(
+                "limit",
+                type={"type": "integer"},
+                description="Number of airports to return (default 20)"
+            ),
+        ]
+    )
+    @action(detail=False)
+    def nearby(self, request):
+        """Located airports within the radius, closest first."""
+        serializer = NearbyAirportsQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        query = serializer.validated_data
+        return Response(
+            {
+                "results": airport_grid.nearby(
+                    query["latitude"],
+                    query["longitude"],
+                    query["radius"],
+                    query["limit"],
+                )
+            }
+        )
+
 
 class AirplaneTypeViewSet(viewsets.ModelViewSet):
     queryset = AirplaneType.objects.all()
     serializer_class = AirplaneTypeSerializer
     filter_backends = [filters.SearchFilter]
+    throttle_scope = "reference"
     search_fields = ["type_name"]
 
 
-class AirplaneViewSet(viewsets.ModelViewSet):
+class AirplaneViewSet(BackgroundDestroyMixin, viewsets.ModelViewSet):
     queryset = Airplane.objects.all()
-    filter_backends = [filters.SearchFilter]
+    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    throttle_scope = "reference"
     search_fields = ["airplane_name", "airplane_type__type_name"]
+    ordering_fields = ["airplane_name", "capacity"]
 
     def get_queryset(self):
         queryset = self.queryset
         airplane_name = self.request.query_params.get("airplane_name")
         airplane_type = self.request.query_params.get("airplane_type")
+        params = AirplaneQuerySerializer(data=self.request.query_params)
+        params.is_valid(raise_exception=True)
+        min_capacity = params.validated_data.get("min_capacity")
         if airplane_name:
             queryset = queryset.filter(
                 airplane_name__icontains=airplane_name
@@ -134,8 +274,13 @@ class AirplaneViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(
                 airplane_type__type_name__icontains=airplane_type
             )
-        if self.action == "list":
+        if min_capacity is not None:
+            queryset = queryset.filter(
+                capacity__gte=min_capacity
+            )
+        if self.action in ("list", "retrieve"):
             return queryset.select_related("airplane_type")
+        return queryset
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -155,16 +300,30 @@ class AirplaneViewSet(viewsets.ModelViewSet):
                 "airplane type",
                 type={"type": "string"},
                 description="Filter by airplane type"
-            )
+            ),
+            OpenApiParameter(
+                "min_capacity",
+                type={"type": "integer"},
+                description="Filter by minimum number of seats"
+            ),
+            OpenApiParameter(
+                "ordering",
+                type={"type": "string"},
+                description="Order by airplane_name or capacity, "
+                            "prefix with '-' for descending"
+            ),
         ]
     )
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
 
-class RouteViewSet(viewsets.ModelViewSet):
+class RouteViewSet(
+    BackgroundDestroyMixin, SparseFieldsetViewMixin, viewsets.ModelViewSet
+):
     queryset = Route.objects.all()
     filter_backends = [filters.SearchFilter]
+    throttle_scope = "reference"
     search_fields = [
         "source__airport_name",
         "destination__airport_name",
@@ -203,10 +362,7 @@ class RouteViewSet(viewsets.ModelViewSet):
                 distance__lte=distance_max
             )
         if self.action in ("list", "retrieve"):
-            return queryset.select_related(
-                "source__city__country",
-                "destination__city__country",
-            )
+            return self.optimize_queryset(queryset)
         return queryset
 
     def get_serializer_class(self):
@@ -238,16 +394,22 @@ class RouteViewSet(viewsets.ModelViewSet):
                 type={"type": "string"},
                 description="Filter by airport destination"
             ),
+            *FIELDSET_PARAMETERS,
         ]
     )
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
+    @extend_schema(parameters=FIELDSET_PARAMETERS)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
 
 class CrewViewSet(viewsets.ModelViewSet):
     queryset = Crew.objects.all()
     serializer_class = CrewRetrieveSerializer
     filter_backends = [filters.SearchFilter]
+    throttle_scope = "reference"
     search_fields = ["first_name", "last_name"]
 
     def get_queryset(self):
@@ -283,15 +445,21 @@ class CrewViewSet(viewsets.ModelViewSet):
         return super().list(request, *args, **kwargs)
 
 
-class FlightViewSet(viewsets.ModelViewSet):
+class FlightViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = Flight.objects.all()
-    filter_backends = [filters.SearchFilter]
+    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = [
         "route__source__airport_name",
         "route__destination__airport_name",
         "departure_datetime",
         "arrival_datetime",
     ]
+    ordering_fields = [
+        "departure_datetime",
+        "arrival_datetime",
+        "airplane__capacity",
+        "tickets_available",
+    ]
 
     def get_queryset(self):
         queryset = self.queryset
@@ -301,6 +469,12 @@ class FlightViewSet(viewsets.ModelViewSet):
             "departure_datetime"
         )
         arrival_datetime = self.request.query_params.get("arrival_datetime")
+        params = FlightQuerySerializer(data=self.request.query_params)
+        params.is_valid(raise_exception=True)
+        min_capacity = params.validated_data.get("min_capacity")
+        min_available = params.validated_data.get("min_available")
+        airborne_at = params.validated_data.get("airborne_at")
+        overlaps = params.validated_data.get("overlaps")
         if source:
             queryset = queryset.filter(
                 route__source__airport_name__icontains=source
@@ -317,18 +491,38 @@ class FlightViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(
                 arrival_datetime__date=arrival_datetime
             )
+        if min_capacity is not None:
+            queryset = queryset.filter(
+                airplane__capacity__gte=min_capacity
+            )
+        if min_available is not None:
+            # A flight can't have more free seats than its airplane has
+            # seats, so narrow on the indexed capacity before counting
+            # tickets.
+            queryset = queryset.filter(
+                airplane__capacity__gte=min_available
+            )
+        if airborne_at:
+            queryset = queryset.filter(flight_period__contains=airborne_at)
+        if overlaps:
+            queryset = queryset.filter(flight_period__overlap=overlaps)
 
         if self.action in ("list", "retrieve"):
-            return (queryset.select_related(
-                "route__source",
-                "route__destination",
-                "airplane",
-            ).prefetch_related("crew").annotate(
-                tickets_available=F("airplane__rows")
-                * F("airplane__seats_in_row")
-                - Count("tickets")
+            queryset = self.optimize_queryset(queryset)
+        if self.action == "list" and (
+            min_available is not None
+            or self.get_fieldset().includes("tickets_available")
+            or "tickets_available" in self.request.query_params.get(
+                "ordering", ""
             )
+        ):
+            queryset = queryset.annotate(
+                tickets_available=F("airplane__capacity") - Count("tickets")
             )
+            if min_available is not None:
+                queryset = queryset.filter(
+                    tickets_available__gte=min_available
+                )
         return queryset
 
     def get_serializer_class(self):
@@ -362,25 +556,221 @@ class FlightViewSet(viewsets.ModelViewSet):
                 description="Filter by arrival datetime",
                 default="2023-10-10"
             ),
-
+            OpenApiParameter(
+                "min_capacity",
+                type={"type": "integer"},
+                description="Filter by minimum airplane capacity"
+            ),
+            OpenApiParameter(
+                "min_available",
+                type={"type": "integer"},
+                description="Filter by minimum number of available seats"
+            ),
+            OpenApiParameter(
+                "airborne_at",
+                type={"type": "datetime"},
+                description="Filter by flights in the air at this moment",
+                default="2025-12-10T12:00:00Z"
+            ),
+            OpenApiParameter(
+                "overlaps",
+                type={"type": "string"},
+                description="Filter by flights touching the window "
+                            "[start, end), as 'start,end'",
+                default="2025-12-10T00:00:00Z,2025-12-11T00:00:00Z"
+            ),
+            OpenApiParameter(
+                "ordering",
+                type={"type": "string"},
+                description="Order by departure_datetime, arrival_datetime, "
+                            "airplane__capacity or tickets_available, "
+                            "prefix with '-' for descending"
+            ),
+            *FIELDSET_PARAMETERS,
         ]
     )
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
+    @extend_schema(parameters=FIELDSET_PARAMETERS)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "at",
+                type={"type": "datetime"},
+                description="Moment to count airborne flights at, "
+                            "defaults to now"
+            ),
+        ]
+    )
+    @action(detail=False, methods=["get"])
+    def airborne(self, request):
+        """Airborne flight counts per departure and arrival airport."""
+        at = request.query_params.get("at")
+        cache_key = f"flights:airborne:{at or 'now'}"
+        dashboard = cache.get(cache_key)
+        if dashboard is None:
+            moment = (
+                serializers.DateTimeField().run_validation(at)
+                if at
+                else timezone.now()
+            )
+            dashboard = self.airborne_dashboard(moment)
+            cache.set(
+                cache_key,
+                dashboard,
+                settings.AIRBORNE_DASHBOARD_CACHE_TIMEOUT
+            )
+        return Response(dashboard)
+
+    @staticmethod
+    def airborne_dashboard(moment):
+        airborne = Flight.objects.filter(flight_period__contains=moment)
+        airports = {}
+        for side, key in (
+            ("route__source", "departed"),
+            ("route__destination", "arriving"),
+        ):
+            counts = airborne.values(
+                side, f"{side}__airport_name"
+            ).annotate(flights=Count("id"))
+            for row in counts:
+                airport = airports.setdefault(
+                    row[side],
+                    {
+                        "airport": row[side],
+                        "airport_name": row[f"{side}__airport_name"],
+                        "departed": 0,
+                        "arriving": 0,
+                    }
+                )
+                airport[key] = row["flights"]
+        return {
+            "at": moment,
+            "airborne": sum(
+                airport["departed"] for airport in airports.values()
+            ),
+            "airports": sorted(
+                airports.values(),
+                key=lambda airport: airport["airport_name"]
+            ),
+        }
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "start",
+                type={"type": "datetime"},
+                description="Start of the window (inclusive)",
+                required=True,
+                default="2025-12-10T00:00:00Z"
+            ),
+            OpenApiParameter(
+                "end",
+                type={"type": "datetime"},
+                description="End of the window (exclusive)",
+                required=True,
+                default="2025-12-11T00:00:00Z"
+            ),
+        ]
+    )
+    @action(
+        detail=False,
+        methods=["get"],
+        permission_classes=[permissions.IsAdminUser],
+    )
+    def conflicts(self, request):
+        """Airplane and crew double bookings touching a time window."""
+        window = ScheduleWindowSerializer(data=request.query_params)
+        window.is_valid(raise_exception=True)
+        period = (
+            window.validated_data["start"],
+            window.validated_data["end"],
+        )
+
+        overlapping_flights = Flight.objects.filter(
+            airplane=OuterRef("airplane"),
+            flight_period__overlap=OuterRef("flight_period"),
+        ).exclude(pk=OuterRef("pk")).order_by("pk")
+        airplane_conflicts = (
+            Flight.objects.filter(flight_period__overlap=period)
+            .annotate(
+                conflicting_flights=ArraySubquery(
+                    overlapping_flights.values("pk")
+                )
+            )
+            .exclude(conflicting_flights=[])
+            .order_by("pk")
+            .values("id", "airplane", "conflicting_flights")
+        )
+
+        assignments = Flight.crew.through.objects
+        overlapping_assignments = assignments.filter(
+            crew=OuterRef("crew"),
+            flight__flight_period__overlap=OuterRef(
+                "flight__flight_period"
+            ),
+        ).exclude(flight=OuterRef("flight")).order_by("flight")
+        crew_conflicts = (
+            assignments.filter(flight__flight_period__overlap=period)
+            .annotate(
+                conflicting_flights=ArraySubquery(
+                    overlapping_assignments.values("flight")
+                )
+            )
+            .exclude(conflicting_flights=[])
+            .order_by("flight", "crew")
+            .values("flight", "crew", "conflicting_flights")
+        )
+
+        return Response(
+            {
+                "airplanes": [
+                    {
+                        "flight": conflict["id"],
+                        "airplane": conflict["airplane"],
+                        "conflicting_flights": conflict[
+                            "conflicting_flights"
+                        ],
+                    }
+                    for conflict in airplane_conflicts
+                ],
+                "crew": list(crew_conflicts),
+            }
+        )
+
+
+class OrderViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
+    """
+    The order history is listed from `OrderSummary` rows, the tickets of
+    an order are only read when it is retrieved.
+    """
 
-class OrderViewSet(viewsets.ModelViewSet):
     queryset = Order.objects.all()
     serializer_class = OrderSerializer
-    filter_backends = [filters.SearchFilter]
+    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    throttle_scope = "orders"
     search_fields = [
         "order_created_at",
-        "tickets__flight__route__source__airport_name",
-        "tickets__flight__route__destination__airport_name"
+        "source_names",
+        "destination_names",
     ]
+    ordering_fields = ["order_created_at", "first_departure", "ticket_count"]
+    ordering = ["-order_created_at"]
 
     def get_queryset(self):
+        if self.action == "list":
+            return self.optimize_queryset(self.get_summaries())
         queryset = Order.objects.filter(user=self.request.user)
+        if self.action == "retrieve":
+            return self.optimize_queryset(queryset)
+        return queryset
+
+    def get_summaries(self):
+        queryset = OrderSummary.objects.filter(user=self.request.user)
         order_created_at = self.request.query_params.get("order_created_at")
         source = self.request.query_params.get("source")
         destination = self.request.query_params.get("destination")
@@ -389,26 +779,23 @@ class OrderViewSet(viewsets.ModelViewSet):
                 order_created_at__date=order_created_at
             )
         if source:
-            queryset = queryset.filter(
-                tickets__flight__route__source__airport_name__icontains=source
-            )
+            queryset = queryset.filter(source_names__icontains=source)
         if destination:
             queryset = queryset.filter(
-                tickets__flight__route__destination__airport_name__icontains=destination
-            )
-        if self.action in ("list", "retrieve"):
-            tickets_prefetch = Prefetch(
-                "tickets",
-                queryset=Ticket.objects.select_related(
-                    "flight__route__source__city",
-                    "flight__route__destination__city",
-                ),
+                destination_names__icontains=destination
             )
-            return queryset.prefetch_related(tickets_prefetch)
         return queryset
 
+    def filter_queryset(self, queryset):
+        # Search and ordering apply to the summaries of the list only.
+        if self.action != "list":
+            return queryset
+        return super().filter_queryset(queryset)
+
     def get_serializer_class(self):
-        if self.action in ("list", "retrieve"):
+        if self.action == "list":
+            return OrderSummarySerializer
+        if self.action == "retrieve":
             return OrderListRetrieveSerializer
         return OrderSerializer
 
@@ -433,9 +820,279 @@ class OrderViewSet(viewsets.ModelViewSet):
                 description="Filter by created at",
                 default="2003-10-10"
             ),
-
-
+            *FIELDSET_PARAMETERS,
         ]
     )
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
+
+    @extend_schema(parameters=FIELDSET_PARAMETERS)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+    @extend_schema(parameters=[IDEMPOTENCY_KEY_PARAMETER])
+    @idempotent
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
+
+    @extend_schema(parameters=[IDEMPOTENCY_KEY_PARAMETER])
+    @idempotent
+    def update(self, request, *args, **kwargs):
+        return super().update(request, *args, **kwargs)
+
+
+class BatchView(APIView):
+    """Run several GET requests against the API in one round trip."""
+
+    permission_classes = (permissions.IsAuthenticated,)
+
+    @extend_schema(request=BatchSerializer)
+    def post(self, request):
+        serializer = BatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        max_workers = (
+            settings.BATCH["MAX_WORKERS"]
+            if serializer.validated_data["concurrent"]
+            else 1
+        )
+        return Response(
+            {
+                "responses": run_batch(
+                    request,
+                    serializer.validated_data["requests"],
+                    max_workers=max_workers,
+                )
+            }
+        )
+
+
+class AutocompleteView(APIView):
+    """
+    Typeahead over airport, city and country names.
+
+    Served from a prefix index held in memory by each worker, no query
+    runs per keystroke.
+    """
+
+    throttle_scope = "autocomplete"
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "q",
+                type={"type": "string"},
+                required=True,
+                description="Prefix of any word of the name (ex. ?q=lvi)"
+            ),
+            OpenApiParameter(
+                "limit",
+                type={"type": "integer"},
+                description="Number of matches to return"
+            ),
+        ]
+    )
+    def get(self, request):
+        serializer = AutocompleteQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        limit = serializer.validated_data.get(
+            "limit", settings.AUTOCOMPLETE["LIMIT"]
+        )
+        return Response(
+            {
+                "results": autocomplete_index.search(
+                    serializer.validated_data["q"], limit
+                )
+            }
+        )
+
+
+class ChangesView(APIView):
+    """
+    Feed of seat inventory changes, consumed with a cursor.
+
+    Without `since` only the current cursor is returned, so a consumer can
+    start following the feed from now. With `since` the events after it
+    are returned, and when there are none yet the request waits up to
+    `timeout` seconds for the next booking to commit. Sync workers and
+    requests over CHANGE_FEED["MAX_WAITERS"] get an answer at once.
+    """
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "since",
+                type=int,
+                description=(
+                    "Return events after this cursor "
+                    "(ex. ?since=120)"
+                ),
+            ),
+            OpenApiParameter(
+                "timeout",
+                type=float,
+                description=(
+                    "Seconds to wait for new events when there are none "
+                    "(ex. ?timeout=25)"
+                ),
+            ),
+        ],
+    )
+    def get(self, request):
+        serializer = ChangesQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        since = serializer.validated_data.get("since")
+        if since is None:
+            return Response({"events": [], "cursor": latest_cursor()})
+        timeout = serializer.validated_data["timeout"]
+        events = wait_for_events(since, timeout if can_wait(request) else 0)
+        return Response(
+            {
+                "events": SeatInventoryEventSerializer(
+                    events, many=True
+                ).data,
+                "cursor": events[-1].position if events else since,
+            }
+        )
+
+
+class DeletionView(generics.RetrieveAPIView):
+    """Progress of a route or airplane deleted in the background."""
+
+    queryset = Deletion.objects.all()
+    serializer_class = DeletionSerializer
+    permission_classes = (permissions.IsAdminUser,)
+
+
+class SlowQueriesView(APIView):
+    """
+    Slow statements captured by the worker serving the request, newest
+    first, and a summary per fingerprint, slowest first.
+    """
+
+    permission_classes = (permissions.IsAdminUser,)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "view",
+                type={"type": "string"},
+                description="Only statements of this view "
+                            "(ex. ?view=air_service:flight-list)"
+            ),
+            OpenApiParameter(
+                "fingerprint",
+                type={"type": "string"},
+                description="Only statements with this fingerprint"
+            ),
+        ]
+    )
+    def get(self, request):
+        entries = get_log().entries()
+        for name in ("view", "fingerprint"):
+            value = request.query_params.get(name)
+            if value:
+                entries = [entry for entry in entries if entry[name] == value]
+        fingerprints = {}
+        for entry in entries:
+            summary = fingerprints.setdefault(
+                entry["fingerprint"],
+                {
+                    "fingerprint": entry["fingerprint"],
+                    "sql": entry["sql"],
+                    "views": set(),
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                },
+            )
+            summary["views"].add(entry["view"])
+            summary["count"] += 1
+            summary["total_ms"] += entry["duration_ms"]
+            summary["max_ms"] = max(summary["max_ms"], entry["duration_ms"])
+        return Response(
+            {
+                "worker": os.getpid(),
+                "threshold_ms": settings.SLOW_QUERIES["THRESHOLD_MS"],
+                "fingerprints": sorted(
+                    (
+                        {
+                            **summary,
+                            "views": sorted(
+                                summary["views"], key=lambda view: view or ""
+                            ),
+                            "total_ms": round(summary["total_ms"], 2),
+                        }
+                        for summary in fingerprints.values()
+                    ),
+                    key=lambda summary: summary["total_ms"],
+                    reverse=True,
+                ),
+                "results": entries,
+            }
+        )
+
+    def delete(self, request):
+        get_log().clear()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+def stream_user(request):
+    """Authenticate a plain Django request with the API authenticators."""
+    api_request = Request(
+        request,
+        authenticators=[
+            authenticator()
+            for authenticator in api_settings.DEFAULT_AUTHENTICATION_CLASSES
+        ],
+    )
+    try:
+        user = api_request.user
+    except exceptions.AuthenticationFailed:
+        return None
+    return user if user.is_authenticated else None
+
+
+def seat_stream_error(request, pk):
+    if stream_user(request) is None:
+        return JsonResponse(
+            {"detail": "Authentication credentials were not provided."},
+            status=401,
+        )
+    if not Flight.objects.filter(pk=pk).exists():
+        return JsonResponse(
+            {"detail": "No Flight matches the given query."}, status=404
+        )
+    return None
+
+
+async def flight_seat_stream(request, pk):
+    """
+    Server-sent events with the seats taken and released on a flight.
+
+    An async view, so under ASGI an open stream costs a queue on the event
+    loop rather than a worker thread. WSGI workers follow the change feed
+    listener instead, which needs threads to spare.
+    """
+    error = await run_query(seat_stream_error, request, pk)
+    if error is not None:
+        return error
+    last_event_id = request.headers.get("Last-Event-ID", "")
+    last_event_id = int(last_event_id) if last_event_id.isdigit() else None
+    if isinstance(request, ASGIRequest):
+        events = seat_stream(pk, last_event_id)
+    elif can_wait(request):
+        events = sync_seat_stream(pk, last_event_id)
+    else:
+        response = JsonResponse(
+            {"detail": "Seat streams need a threaded or ASGI server."},
+            status=503,
+        )
+        response["Retry-After"] = settings.SEAT_STREAM["RETRY"] // 1000
+        return response
+    response = StreamingHttpResponse(
+        events, content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    # Stops nginx from buffering the stream.
+    response["X-Accel-Buffering"] = "no"
+    return response
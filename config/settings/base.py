@@ -31,25 +31,28 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework",
     "air_service",
     "user",
-    "debug_toolbar",
+    "reports",
+    "jobs",
     "django_filters",
     "rest_framework.authtoken",
-    "drf_spectacular",
-
 ]
 
 MIDDLEWARE = [
+    "air_service.middleware.TrafficRecordingMiddleware",
+    "air_service.middleware.SlowQueryMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "air_service.middleware.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
+    "user.middleware.PasswordHashingUnavailableMiddleware",
 ]
 
 ROOT_URLCONF = "config.urls"
@@ -103,6 +106,26 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+PASSWORD_HASHERS = [
+    "user.hashing.PooledPBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+
+# Request threads of each gunicorn worker, see the `serve` command.
+SERVER_THREADS = int(os.environ.get("GUNICORN_THREADS", 1))
+
+# Password hashing runs in a bounded per-process pool so a burst of logins
+# can't occupy every request thread. The pool is cut down to half of
+# SERVER_THREADS, see `user.hashing.pool_limits`.
+PASSWORD_HASHING_POOL = {
+    "MAX_WORKERS": 2,
+    "MAX_QUEUE": 16,
+    "TIMEOUT": 2,
+}
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.1/topics/i18n/
 
@@ -126,24 +149,170 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 AUTH_USER_MODEL = "user.User"
 
-INTERNAL_IPS = [
-    "127.0.0.1",
-]
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+CACHES = {
+    # Cached users and throttle counters must be shared by all workers,
+    # otherwise invalidation and limits only apply to one process.
+    "default": (
+        {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
+            "KEY_PREFIX": "default",
+        }
+        if os.environ.get("REDIS_URL")
+        else {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    ),
+    "throttle": (
+        {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
+            "KEY_PREFIX": "throttle",
+        }
+        if os.environ.get("REDIS_URL")
+        else {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "throttle",
+        }
+    ),
+}
+
+THROTTLE_CACHE_ALIAS = "throttle"
+
+AUTH_USER_CACHE_TIMEOUT = 60
+
+AIRBORNE_DASHBOARD_CACHE_TIMEOUT = 5
+
+COMPRESSION = {
+    "MIN_SIZE": 1024,
+    "GZIP_LEVEL": 6,
+    "BROTLI_QUALITY": 5,
+}
+
+BATCH = {
+    "MAX_REQUESTS": 10,
+    "MAX_WORKERS": 4,
+}
+
+CHANGE_FEED = {
+    "MAX_EVENTS": 500,
+    "MAX_TIMEOUT": 30,
+    # Requests per process that may block waiting for events, keep it
+    # below the threads of a worker so others still get served.
+    "MAX_WAITERS": int(os.environ.get("CHANGE_FEED_MAX_WAITERS", 4)),
+    "RETENTION_DAYS": 7,
+}
+
+AUTOCOMPLETE = {
+    "LIMIT": 10,
+    "MAX_LIMIT": 50,
+    "VERSION_CHECK_INTERVAL": 1,
+}
+
+GEO = {
+    "GRID_CELL_DEGREES": 1.0,
+    "NEARBY_MAX_RADIUS_KM": 2000,
+    # Flown routes are longer than the great circle, but not by this much.
+    "ROUTE_DISTANCE_TOLERANCE": 0.25,
+    "VERSION_CHECK_INTERVAL": 1,
+}
+
+# Sampled request records for `manage.py replay_traffic`.
+TRAFFIC_RECORDING = {
+    "ENABLED": os.environ.get("DJANGO_TRAFFIC_RECORDING") == "1",
+    "SAMPLE_RATE": float(os.environ.get("DJANGO_TRAFFIC_SAMPLE_RATE", 0.01)),
+    "FILE": os.environ.get("DJANGO_TRAFFIC_FILE", BASE_DIR / "traffic.jsonl"),
+    "QUEUE_SIZE": 10000,
+    "FLUSH_INTERVAL": 1,
+}
+
+# Statements slower than THRESHOLD_MS are kept with their plan for the
+# admin-only `slow-queries/` endpoint.
+SLOW_QUERIES = {
+    "ENABLED": os.environ.get("DJANGO_SLOW_QUERIES") == "1",
+    "THRESHOLD_MS": int(os.environ.get("DJANGO_SLOW_QUERY_MS", 200)),
+    "BUFFER_SIZE": 200,
+    "EXPLAIN_INTERVAL": 60,
+    "EXPLAIN_ANALYZE_SAMPLE_RATE": 0.0,
+    "EXPLAIN_QUEUE_SIZE": 100,
+    "EXPLAIN_TIMEOUT_MS": 5000,
+}
+
+SEAT_STREAM = {
+    "HEARTBEAT": 15,
+    # Seconds a new stream waits for the listener before it ends and the
+    # client reconnects.
+    "LISTEN_TIMEOUT": 10,
+    "QUEUE_SIZE": 100,
+    "RETRY": 3000,
+}
+
+IDEMPOTENCY = {
+    "TTL": 24 * 60 * 60,
+    "LOCK_TIMEOUT": 60,
+    # Seconds a retry arriving while the first request runs is told to
+    # wait.
+    "RETRY_AFTER": 1,
+}
+
+# Background jobs run by `manage.py run_workers`, a failed job is retried
+# after RETRY_DELAY seconds, doubled on each attempt.
+JOBS = {
+    "CONCURRENCY": 2,
+    "POLL_INTERVAL": 1,
+    "MAX_ATTEMPTS": 5,
+    "RETRY_DELAY": 10,
+}
+
+# Routes and airplanes whose flights hold more tickets are deleted in the
+# background, CHUNK_SIZE flights per transaction.
+DELETION = {
+    "SYNC_MAX_TICKETS": 5000,
+    "CHUNK_SIZE": 200,
+}
+
+# Serves the OpenAPI schema with Swagger and Redoc when enabled, which
+# needs drf_spectacular in INSTALLED_APPS.
+API_DOCS_ENABLED = False
+
+# Generated schema, reused while the code fingerprint stored in it matches.
+API_SCHEMA_FILE = BASE_DIR / "openapi-schema.json"
+
 REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [
         "air_service.permissions.IsAdminAllOrIsAuthenticatedReadOnly",
     ],
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
-        "rest_framework.authentication.TokenAuthentication",
+        "user.authentication.CachedJWTAuthentication",
+        "user.authentication.CachedTokenAuthentication",
         "rest_framework.authentication.BasicAuthentication"
     ],
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "air_service.throttling.AnonSlidingWindowThrottle",
+        "air_service.throttling.UserSlidingWindowThrottle",
     ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
-    "DEFAULT_THROTTLE_RATES": {"anon": "100/day", "user": "1000/day"},
+    "DEFAULT_THROTTLE_RATES": {
+        "anon": "100/day",
+        "user": "1000/day",
+        "reference": "5000/day",
+        "autocomplete": "20000/day",
+        "orders_write": "100/day",
+    },
+    "DEFAULT_RENDERER_CLASSES": [
+        "rest_framework.renderers.JSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+        "air_service.renderers.MessagePackRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "rest_framework.parsers.JSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+        "air_service.renderers.MessagePackParser",
+    ],
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 15
 }
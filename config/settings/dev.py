@@ -4,3 +4,20 @@ from config.settings.base import *
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = True
 ALLOWED_HOSTS = ["127.0.0.1", "localhost"]
+
+INSTALLED_APPS = [
+    *INSTALLED_APPS,
+    "debug_toolbar",
+    "drf_spectacular",
+]
+
+MIDDLEWARE = [
+    *MIDDLEWARE,
+    "debug_toolbar.middleware.DebugToolbarMiddleware",
+]
+
+INTERNAL_IPS = [
+    "127.0.0.1",
+]
+
+API_DOCS_ENABLED = True
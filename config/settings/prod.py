@@ -3,3 +3,9 @@ from config.settings.base import *
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = False
 ALLOWED_HOSTS = []
+
+# Dev-only apps and middleware stay out of production workers, the API
+# docs are opt-in.
+API_DOCS_ENABLED = os.environ.get("DJANGO_API_DOCS") == "1"
+if API_DOCS_ENABLED:
+    INSTALLED_APPS = [*INSTALLED_APPS, "drf_spectacular"]
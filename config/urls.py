@@ -14,28 +14,40 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
-from debug_toolbar.toolbar import debug_toolbar_urls
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
-from drf_spectacular.views import (
-    SpectacularAPIView,
-    SpectacularSwaggerView,
-    SpectacularRedocView
-)
 
-urlpatterns = ([
+urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/v1/", include("air_service.urls", namespace="air_service")),
     path("api/v1/user/", include("user.urls", namespace="user")),
-    path("api/v1/schema/", SpectacularAPIView.as_view(), name="schema"),
-    path(
-        "api/v1/schema/swagger/",
-        SpectacularSwaggerView.as_view(url_name="schema"),
-        name="swagger-ui",
-    ),
-    path(
-        "api/v1/schema/redoc/",
-        SpectacularRedocView.as_view(url_name="schema"),
-        name="redoc",
-    ),
-] + debug_toolbar_urls())
+    path("api/v1/reports/", include("reports.urls", namespace="reports")),
+]
+
+if settings.API_DOCS_ENABLED:
+    from drf_spectacular.views import (
+        SpectacularSwaggerView,
+        SpectacularRedocView
+    )
+
+    from air_service.schema import cached_schema_view
+
+    urlpatterns += [
+        path("api/v1/schema/", cached_schema_view, name="schema"),
+        path(
+            "api/v1/schema/swagger/",
+            SpectacularSwaggerView.as_view(url_name="schema"),
+            name="swagger-ui",
+        ),
+        path(
+            "api/v1/schema/redoc/",
+            SpectacularRedocView.as_view(url_name="schema"),
+            name="redoc",
+        ),
+    ]
+
+if "debug_toolbar" in settings.INSTALLED_APPS:
+    from debug_toolbar.toolbar import debug_toolbar_urls
+
+    urlpatterns += debug_toolbar_urls()
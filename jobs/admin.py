@@ -0,0 +1,18 @@
+from django.contrib import admin
+from django.utils import timezone
+
+from jobs.models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("id", "task", "status", "attempts", "run_at")
+    list_filter = ("status", "task")
+    readonly_fields = ("created_at",)
+    actions = ["retry"]
+
+    @admin.action(description="Retry the selected jobs now")
+    def retry(self, request, queryset):
+        queryset.update(
+            status=Job.Status.QUEUED, attempts=0, run_at=timezone.now()
+        )
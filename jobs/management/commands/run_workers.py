@@ -0,0 +1,50 @@
+import signal
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from jobs.worker import run_pending, work
+
+
+class Command(BaseCommand):
+    help = (
+        "Run queued background jobs until interrupted. SIGINT and SIGTERM "
+        "let the running jobs finish first."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=settings.JOBS["CONCURRENCY"],
+            help="Number of jobs run at the same time.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Run the jobs that are due and exit.",
+        )
+
+    def handle(self, *args, **options):
+        if options["once"]:
+            count = run_pending()
+            self.stdout.write(self.style.SUCCESS(f"Ran {count} jobs."))
+            return
+
+        stop = threading.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *args: stop.set())
+        threads = [
+            threading.Thread(target=work, args=(stop,), name=f"job-worker-{n}")
+            for n in range(options["concurrency"])
+        ]
+        for thread in threads:
+            thread.start()
+        self.stdout.write(
+            f"Running jobs with {len(threads)} workers, Ctrl-C to stop."
+        )
+        # Join with a timeout so the main thread keeps handling signals.
+        while any(thread.is_alive() for thread in threads):
+            for thread in threads:
+                thread.join(timeout=1)
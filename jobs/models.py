@@ -0,0 +1,40 @@
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+
+class Job(models.Model):
+    """
+    A task call waiting for `run_workers`.
+
+    Jobs are deleted once they succeed, so the table only holds queued
+    jobs and the ones that ran out of attempts.
+    """
+
+    class Status(models.TextChoices):
+        QUEUED = "queued"
+        FAILED = "failed"
+
+    task = models.CharField(max_length=255)
+    kwargs = models.JSONField(default=dict)
+    status = models.CharField(
+        max_length=10, choices=Status.choices, default=Status.QUEUED
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField()
+    run_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ["run_at", "id"]
+        indexes = [
+            models.Index(
+                fields=["run_at", "id"],
+                condition=Q(status="queued"),
+                name="job_queued_run_at",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.task}({self.id})"
@@ -0,0 +1,42 @@
+from django.conf import settings
+from django.db import transaction
+
+# Task name to function, filled by the `task` decorator when the modules
+# defining tasks are imported from `AppConfig.ready()`.
+registry = {}
+
+
+def task(func=None, *, max_attempts=None):
+    """
+    Register `func` to be run by the workers under its dotted path.
+
+    Its keyword arguments are stored as JSON, so they must be plain values
+    and mapping keys come back as strings.
+    """
+
+    def register(func):
+        func.task_name = f"{func.__module__}.{func.__qualname__}"
+        func.max_attempts = max_attempts
+        registry[func.task_name] = func
+        return func
+
+    return register(func) if func else register
+
+
+def enqueue(func, **kwargs):
+    """Queue a call of the task `func` in the current transaction."""
+    from jobs.models import Job
+
+    return Job.objects.create(
+        task=func.task_name,
+        kwargs=kwargs,
+        max_attempts=func.max_attempts or settings.JOBS["MAX_ATTEMPTS"],
+    )
+
+
+def enqueue_on_commit(func, **kwargs) -> None:
+    """
+    Queue a call of the task `func` once the current transaction commits,
+    nothing is queued when it rolls back.
+    """
+    transaction.on_commit(lambda: enqueue(func, **kwargs))
@@ -0,0 +1,145 @@
+import threading
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from air_service.models import Country
+from jobs.models import Job
+from jobs.tasks import enqueue, enqueue_on_commit, task
+from jobs.worker import run_one, run_pending
+
+JOB_SETTINGS = {
+    "CONCURRENCY": 1,
+    "POLL_INTERVAL": 0.1,
+    "MAX_ATTEMPTS": 3,
+    "RETRY_DELAY": 10,
+}
+
+
+@task
+def create_country(name):
+    Country.objects.create(country_name=name)
+
+
+@task(max_attempts=1)
+def fail_once(name):
+    Country.objects.create(country_name=name)
+    raise ValueError("Booking service unavailable")
+
+
+@task
+def fail(name):
+    Country.objects.create(country_name=name)
+    raise ValueError("Booking service unavailable")
+
+
+@override_settings(JOBS=JOB_SETTINGS)
+class JobQueueTestCase(TestCase):
+    def test_job_is_queued_when_the_transaction_commits(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            enqueue_on_commit(create_country, name="Ukraine")
+        self.assertFalse(Job.objects.exists())
+
+        callbacks[0]()
+        job = Job.objects.get()
+        self.assertEqual(job.task, "jobs.tests.create_country")
+        self.assertEqual(job.kwargs, {"name": "Ukraine"})
+        self.assertEqual(job.max_attempts, 3)
+
+    def test_rolled_back_transaction_queues_nothing(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    enqueue_on_commit(create_country, name="Ukraine")
+                    raise ValueError
+            except ValueError:
+                pass
+        self.assertFalse(Job.objects.exists())
+
+    def test_successful_jobs_run_in_order_and_are_deleted(self):
+        enqueue(create_country, name="Ukraine")
+        enqueue(create_country, name="Poland")
+
+        self.assertEqual(run_pending(), 2)
+        self.assertEqual(
+            list(Country.objects.values_list("country_name", flat=True)),
+            ["Ukraine", "Poland"],
+        )
+        self.assertFalse(Job.objects.exists())
+
+    def test_failed_job_is_retried_later(self):
+        started = timezone.now()
+        enqueue(fail, name="Ukraine")
+
+        with self.assertLogs("jobs.worker", "WARNING"):
+            self.assertEqual(run_pending(), 1)
+        job = Job.objects.get()
+        self.assertEqual(job.status, Job.Status.QUEUED)
+        self.assertEqual(job.attempts, 1)
+        self.assertGreaterEqual(
+            (job.run_at - started).total_seconds(), 10
+        )
+        self.assertIn("Booking service unavailable", job.last_error)
+        # The work of the failed attempt is rolled back.
+        self.assertFalse(Country.objects.exists())
+
+        Job.objects.update(run_at=timezone.now())
+        with self.assertLogs("jobs.worker", "WARNING"):
+            run_pending()
+        job.refresh_from_db()
+        self.assertEqual(job.attempts, 2)
+        self.assertGreaterEqual(
+            (job.run_at - started).total_seconds(), 20
+        )
+
+    def test_job_fails_after_its_last_attempt(self):
+        enqueue(fail_once, name="Ukraine")
+        with self.assertLogs("jobs.worker", "ERROR"):
+            self.assertEqual(run_pending(), 1)
+        job = Job.objects.get()
+        self.assertEqual(job.status, Job.Status.FAILED)
+        self.assertFalse(run_one())
+
+    def test_unknown_task_fails_at_once(self):
+        Job.objects.create(task="jobs.tests.missing", max_attempts=5)
+        with self.assertLogs("jobs.worker", "ERROR"):
+            run_pending()
+        job = Job.objects.get()
+        self.assertEqual(job.status, Job.Status.FAILED)
+        self.assertIn("Unknown task", job.last_error)
+
+    def test_run_workers_once(self):
+        enqueue(create_country, name="Ukraine")
+        out = StringIO()
+        call_command("run_workers", "--once", stdout=out)
+        self.assertIn("Ran 1 jobs", out.getvalue())
+        self.assertTrue(Country.objects.filter(country_name="Ukraine"))
+
+
+@override_settings(JOBS=JOB_SETTINGS)
+class ConcurrentWorkersTestCase(TransactionTestCase):
+    def test_locked_job_is_skipped(self):
+        locked = enqueue(create_country, name="Ukraine")
+        enqueue(create_country, name="Poland")
+
+        def other_worker():
+            try:
+                run_one()
+            finally:
+                connection.close()
+
+        with transaction.atomic():
+            # Another worker is running the first job.
+            Job.objects.select_for_update().get(pk=locked.pk)
+            thread = threading.Thread(target=other_worker)
+            thread.start()
+            thread.join(timeout=10)
+
+        self.assertEqual(
+            list(Country.objects.values_list("country_name", flat=True)),
+            ["Poland"],
+        )
+        self.assertEqual(list(Job.objects.all()), [locked])
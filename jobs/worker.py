@@ -0,0 +1,79 @@
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.utils import timezone
+
+from jobs.models import Job
+from jobs.tasks import registry
+
+logger = logging.getLogger(__name__)
+
+
+def run_one() -> bool:
+    """
+    Run the next due job, False when there is none.
+
+    The job row stays locked until its work commits, other workers skip
+    it, and a worker that dies leaves it queued for the next one.
+    """
+    with transaction.atomic():
+        job = (
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(status=Job.Status.QUEUED, run_at__lte=timezone.now())
+            .order_by("run_at", "id")
+            .first()
+        )
+        if job is None:
+            return False
+        execute(job)
+    return True
+
+
+def execute(job: Job) -> None:
+    func = registry.get(job.task)
+    try:
+        if func is None:
+            raise LookupError(f"Unknown task {job.task!r}")
+        with transaction.atomic():
+            func(**job.kwargs)
+    except Exception:
+        job.attempts += 1
+        job.last_error = traceback.format_exc()
+        if func is None or job.attempts >= job.max_attempts:
+            job.status = Job.Status.FAILED
+            logger.exception("Job %s failed", job)
+        else:
+            delay = settings.JOBS["RETRY_DELAY"] * 2 ** (job.attempts - 1)
+            job.run_at = timezone.now() + timedelta(seconds=delay)
+            logger.warning("Job %s will be retried", job, exc_info=True)
+        job.save(update_fields=["attempts", "last_error", "status", "run_at"])
+    else:
+        job.delete()
+
+
+def run_pending() -> int:
+    """Run every due job in this thread, returns how many ran."""
+    count = 0
+    while run_one():
+        count += 1
+    return count
+
+
+def work(stop) -> None:
+    """Run jobs until the `stop` event is set, polling when idle."""
+    try:
+        while not stop.is_set():
+            close_old_connections()
+            try:
+                ran = run_one()
+            except Exception:
+                logger.exception("Could not fetch a job")
+                connection.close()
+                ran = False
+            if not ran:
+                stop.wait(settings.JOBS["POLL_INTERVAL"])
+    finally:
+        connection.close()
@@ -0,0 +1,108 @@
+# Generated by Django 5.1.5 on 2026-10-19 01:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="AirplaneTypeDailyLoad",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("capacity", models.IntegerField(default=0)),
+                ("seats_sold", models.IntegerField(default=0)),
+                ("airplane_type_id", models.BigIntegerField()),
+                ("airplane_type_name", models.CharField(max_length=100)),
+                ("date", models.DateField(db_index=True)),
+                ("flights", models.IntegerField(default=0)),
+            ],
+            options={
+                "ordering": ["date", "airplane_type_name"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("airplane_type_id", "date"),
+                        name="unique_airplane_type_daily_load",
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="FlightLoad",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("capacity", models.IntegerField(default=0)),
+                ("seats_sold", models.IntegerField(default=0)),
+                ("flight_id", models.BigIntegerField(unique=True)),
+                ("route_id", models.BigIntegerField()),
+                ("route_name", models.CharField(max_length=255)),
+                ("airplane_type_id", models.BigIntegerField()),
+                ("airplane_type_name", models.CharField(max_length=100)),
+                ("departure_date", models.DateField()),
+            ],
+            options={
+                "ordering": ["departure_date", "flight_id"],
+                "indexes": [
+                    models.Index(
+                        fields=["route_id", "departure_date"],
+                        name="reports_fli_route_i_470778_idx",
+                    ),
+                    models.Index(
+                        fields=["airplane_type_id", "departure_date"],
+                        name="reports_fli_airplan_8e55da_idx",
+                    ),
+                    models.Index(
+                        fields=["departure_date"], name="reports_fli_departu_625595_idx"
+                    ),
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="RouteDailyLoad",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("capacity", models.IntegerField(default=0)),
+                ("seats_sold", models.IntegerField(default=0)),
+                ("route_id", models.BigIntegerField()),
+                ("route_name", models.CharField(max_length=255)),
+                ("date", models.DateField(db_index=True)),
+                ("flights", models.IntegerField(default=0)),
+            ],
+            options={
+                "ordering": ["date", "route_name"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("route_id", "date"), name="unique_route_daily_load"
+                    )
+                ],
+            },
+        ),
+    ]
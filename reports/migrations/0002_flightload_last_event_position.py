@@ -0,0 +1,34 @@
+# Generated by Django 5.1.5 on 2026-10-19 12:40
+
+from django.db import migrations, models
+
+# Existing rows were recounted by every job, so they hold every committed
+# event of their flight.
+BACKFILL = """
+UPDATE reports_flightload AS load
+SET last_event_position = events.position
+FROM (
+    SELECT flight_id, max(position) AS position
+    FROM air_service_seatinventoryevent
+    GROUP BY flight_id
+) AS events
+WHERE events.flight_id = load.flight_id
+AND events.position IS NOT NULL;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("air_service", "0011_seat_event_position"),
+        ("reports", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="flightload",
+            name="last_event_position",
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.RunSQL(BACKFILL, migrations.RunSQL.noop),
+    ]
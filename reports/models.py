@@ -0,0 +1,82 @@
+from django.db import models
+
+
+class LoadMixin(models.Model):
+    capacity = models.IntegerField(default=0)
+    seats_sold = models.IntegerField(default=0)
+
+    class Meta:
+        abstract = True
+
+    @property
+    def load_factor(self):
+        if not self.capacity:
+            return None
+        return round(self.seats_sold / self.capacity, 4)
+
+
+class FlightLoad(LoadMixin):
+    """
+    Seats sold per flight.
+
+    Holds plain ids and names instead of foreign keys so reports never
+    join or lock the booking tables.
+    """
+
+    flight_id = models.BigIntegerField(unique=True)
+    route_id = models.BigIntegerField()
+    route_name = models.CharField(max_length=255)
+    airplane_type_id = models.BigIntegerField()
+    airplane_type_name = models.CharField(max_length=100)
+    departure_date = models.DateField()
+    # Feed position of the last seat inventory event in `seats_sold`.
+    last_event_position = models.BigIntegerField(default=0)
+
+    class Meta:
+        ordering = ["departure_date", "flight_id"]
+        indexes = [
+            models.Index(fields=["route_id", "departure_date"]),
+            models.Index(fields=["airplane_type_id", "departure_date"]),
+            models.Index(fields=["departure_date"]),
+        ]
+
+    def __str__(self):
+        return f"{self.route_name}({self.departure_date})"
+
+
+class RouteDailyLoad(LoadMixin):
+    route_id = models.BigIntegerField()
+    route_name = models.CharField(max_length=255)
+    date = models.DateField(db_index=True)
+    flights = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ["date", "route_name"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["route_id", "date"],
+                name="unique_route_daily_load"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.route_name}({self.date})"
+
+
+class AirplaneTypeDailyLoad(LoadMixin):
+    airplane_type_id = models.BigIntegerField()
+    airplane_type_name = models.CharField(max_length=100)
+    date = models.DateField(db_index=True)
+    flights = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ["date", "airplane_type_name"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["airplane_type_id", "date"],
+                name="unique_airplane_type_daily_load"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.airplane_type_name}({self.date})"
@@ -0,0 +1,53 @@
+from rest_framework import serializers
+
+from reports.models import FlightLoad, RouteDailyLoad, AirplaneTypeDailyLoad
+
+
+class FlightLoadSerializer(serializers.ModelSerializer):
+    load_factor = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = FlightLoad
+        fields = [
+            "flight_id",
+            "route_id",
+            "route_name",
+            "airplane_type_id",
+            "airplane_type_name",
+            "departure_date",
+            "capacity",
+            "seats_sold",
+            "load_factor",
+        ]
+
+
+class RouteDailyLoadSerializer(serializers.ModelSerializer):
+    load_factor = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = RouteDailyLoad
+        fields = [
+            "route_id",
+            "route_name",
+            "date",
+            "flights",
+            "capacity",
+            "seats_sold",
+            "load_factor",
+        ]
+
+
+class AirplaneTypeDailyLoadSerializer(serializers.ModelSerializer):
+    load_factor = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = AirplaneTypeDailyLoad
+        fields = [
+            "airplane_type_id",
+            "airplane_type_name",
+            "date",
+            "flights",
+            "capacity",
+            "seats_sold",
+            "load_factor",
+        ]
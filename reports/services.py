@@ -0,0 +1,273 @@
+from collections import Counter
+from functools import reduce
+from itertools import islice
+from operator import or_
+
+from django.db import connection, transaction
+from django.db.models import Count, F, Max, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from air_service.models import Flight, SeatInventoryEvent
+from jobs.tasks import task
+from reports.models import FlightLoad, RouteDailyLoad, AirplaneTypeDailyLoad
+
+DAILY_TABLES = (
+    (RouteDailyLoad, "route_id", "route_name"),
+    (AirplaneTypeDailyLoad, "airplane_type_id", "airplane_type_name"),
+)
+
+# First key of the advisory locks guarding the daily rows of each table.
+DAILY_LOCK_IDS = {RouteDailyLoad: 4201, AirplaneTypeDailyLoad: 4202}
+
+
+def flights_with_sales():
+    return (
+        Flight.objects.select_related(
+            "route__source",
+            "route__destination",
+            "airplane__airplane_type",
+        )
+        .annotate(
+            seats_sold=Count("tickets"),
+            # Read in the same statement as the count, so the count holds
+            # exactly the events up to this position.
+            last_event_position=Coalesce(
+                Subquery(
+                    SeatInventoryEvent.objects.filter(
+                        flight_id=OuterRef("id"), position__isnull=False
+                    )
+                    .order_by("-position")
+                    .values("position")[:1]
+                ),
+                0,
+            ),
+        )
+        .order_by("id")
+    )
+
+
+def build_flight_loads(flights):
+    for flight in flights:
+        yield FlightLoad(
+            flight_id=flight.id,
+            route_id=flight.route_id,
+            route_name=str(flight.route),
+            airplane_type_id=flight.airplane.airplane_type_id,
+            airplane_type_name=flight.airplane.airplane_type.type_name,
+            departure_date=timezone.localdate(flight.departure_datetime),
+            capacity=flight.airplane.capacity,
+            seats_sold=flight.seats_sold,
+            last_event_position=flight.last_event_position,
+        )
+
+
+def daily_keys(loads) -> dict:
+    keys = {model: set() for model, _, _ in DAILY_TABLES}
+    for load in loads:
+        for model, key_field, _ in DAILY_TABLES:
+            keys[model].add((getattr(load, key_field), load.departure_date))
+    return keys
+
+
+def lock_daily_rows(keys: dict) -> None:
+    """
+    Lock the daily rows of `keys` until the transaction ends, rows that
+    don't exist yet included.
+
+    Jobs for other flights on the same day would otherwise aggregate
+    without each other's uncommitted flight rows and the last to commit
+    would overwrite the daily row. Locks are taken in one order, so jobs
+    don't deadlock.
+    """
+    with connection.cursor() as cursor:
+        for model, _, _ in DAILY_TABLES:
+            for key, date in sorted(keys[model]):
+                cursor.execute(
+                    "SELECT pg_advisory_xact_lock(%s, hashtext(%s))",
+                    [DAILY_LOCK_IDS[model], f"{key}:{date}"],
+                )
+
+
+def rebuild_daily_rows(keys: dict) -> None:
+    lock_daily_rows(keys)
+    for model, key_field, name_field in DAILY_TABLES:
+        for key, date in keys[model]:
+            totals = FlightLoad.objects.filter(
+                **{key_field: key},
+                departure_date=date,
+            ).aggregate(
+                name=Max(name_field),
+                flights=Count("id"),
+                capacity=Sum("capacity"),
+                seats_sold=Sum("seats_sold"),
+            )
+            if not totals["flights"]:
+                model.objects.filter(**{key_field: key}, date=date).delete()
+                continue
+            model.objects.update_or_create(
+                **{key_field: key},
+                date=date,
+                defaults={
+                    name_field: totals["name"],
+                    "flights": totals["flights"],
+                    "capacity": totals["capacity"],
+                    "seats_sold": totals["seats_sold"],
+                },
+            )
+
+
+def replace_flight_loads(flight_ids) -> dict:
+    """
+    Recount the report rows of the given flights from the booking tables,
+    dropping rows of flights that no longer exist, and return the daily
+    keys they touched.
+    """
+    previous = list(
+        FlightLoad.objects.select_for_update()
+        .filter(flight_id__in=flight_ids)
+        .order_by("flight_id")
+    )
+    keys = daily_keys(previous)
+    FlightLoad.objects.filter(pk__in=[load.pk for load in previous]).delete()
+
+    loads = FlightLoad.objects.bulk_create(
+        build_flight_loads(flights_with_sales().filter(id__in=flight_ids))
+    )
+    for model, model_keys in daily_keys(loads).items():
+        keys[model] |= model_keys
+    return keys
+
+
+@task
+@transaction.atomic
+def refresh_flights(flight_ids) -> None:
+    """
+    Recompute the report rows of the given flights, for changes to the
+    flights themselves. Bookings go through `apply_seat_events` instead.
+
+    Concurrent runs for a new flight collide on its unique row and the
+    loser is retried.
+    """
+    rebuild_daily_rows(replace_flight_loads(flight_ids))
+
+
+@task
+@transaction.atomic
+def apply_seat_events(flight_ids) -> None:
+    """
+    Add the seats taken or released by the feed events of the given
+    flights to their report rows, without reading the booking tables.
+
+    A row keeps the position of the last event it counts and only events
+    after it are added, so retried jobs and jobs running after a
+    recompute count every seat once.
+    """
+    loads = list(
+        FlightLoad.objects.select_for_update()
+        .filter(flight_id__in=flight_ids)
+        .order_by("flight_id")
+    )
+    missing = set(flight_ids) - {load.flight_id for load in loads}
+    rebuilt = {model: set() for model, _, _ in DAILY_TABLES}
+    if missing:
+        # Counted from scratch, so their events are already included.
+        rebuilt = replace_flight_loads(sorted(missing))
+
+    totals = {}
+    if loads:
+        events = SeatInventoryEvent.objects.filter(
+            reduce(
+                or_,
+                (
+                    Q(
+                        flight_id=load.flight_id,
+                        position__gt=load.last_event_position,
+                    )
+                    for load in loads
+                ),
+            )
+        )
+        totals = {
+            row["flight_id"]: row
+            for row in events.values("flight_id")
+            .annotate(seats=Sum("seats_delta"), position=Max("position"))
+            .order_by()
+        }
+
+    daily_deltas = {model: Counter() for model, _, _ in DAILY_TABLES}
+    for load in loads:
+        total = totals.get(load.flight_id)
+        if total is None:
+            continue
+        FlightLoad.objects.filter(pk=load.pk).update(
+            seats_sold=F("seats_sold") + total["seats"],
+            last_event_position=total["position"],
+        )
+        for model, key_field, _ in DAILY_TABLES:
+            key = (getattr(load, key_field), load.departure_date)
+            daily_deltas[model][key] += total["seats"]
+
+    lock_daily_rows(
+        {model: rebuilt[model] | set(daily_deltas[model]) for model in rebuilt}
+    )
+    for model, key_field, _ in DAILY_TABLES:
+        for (key, date), seats in daily_deltas[model].items():
+            if (key, date) in rebuilt[model]:
+                continue
+            model.objects.filter(**{key_field: key}, date=date).update(
+                seats_sold=F("seats_sold") + seats
+            )
+    rebuild_daily_rows(rebuilt)
+
+
+@task
+def refresh_airplane_flights(airplane_id) -> None:
+    refresh_flights(
+        list(
+            Flight.objects.filter(airplane_id=airplane_id).values_list(
+                "id", flat=True
+            )
+        )
+    )
+
+
+@transaction.atomic
+def rebuild_all(batch_size: int = 1000) -> int:
+    """Rebuild every report table from the booking tables."""
+    FlightLoad.objects.all().delete()
+    for model, _, _ in DAILY_TABLES:
+        model.objects.all().delete()
+
+    flights = flights_with_sales().iterator(chunk_size=batch_size)
+    loads = build_flight_loads(flights)
+    total = 0
+    while batch := list(islice(loads, batch_size)):
+        FlightLoad.objects.bulk_create(batch)
+        total += len(batch)
+
+    for model, key_field, name_field in DAILY_TABLES:
+        rows = (
+            FlightLoad.objects.values(key_field, "departure_date")
+            .annotate(
+                name=Max(name_field),
+                flights=Count("id"),
+                capacity=Sum("capacity"),
+                seats_sold=Sum("seats_sold"),
+            )
+            .order_by()
+        )
+        model.objects.bulk_create(
+            (
+                model(
+                    **{key_field: row[key_field], name_field: row["name"]},
+                    date=row["departure_date"],
+                    flights=row["flights"],
+                    capacity=row["capacity"],
+                    seats_sold=row["seats_sold"],
+                )
+                for row in rows.iterator()
+            ),
+            batch_size=batch_size,
+        )
+    return total
@@ -0,0 +1,36 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from air_service.models import Airplane, Flight
+from air_service.signals import flights_deleted, tickets_changed
+from jobs.tasks import enqueue_on_commit
+from reports.services import (
+    apply_seat_events,
+    refresh_airplane_flights,
+    refresh_flights,
+)
+
+
+# Reports are updated by background jobs queued when the booking commits,
+# so the request neither holds report locks nor waits for the update;
+# `rebuild_reports` repairs any drift.
+@receiver(tickets_changed)
+def update_ticket_sales(sender, deltas, **kwargs):
+    enqueue_on_commit(apply_seat_events, flight_ids=sorted(deltas))
+
+
+@receiver(post_save, sender=Flight)
+@receiver(post_delete, sender=Flight)
+def update_flight_load(sender, instance, **kwargs):
+    enqueue_on_commit(refresh_flights, flight_ids=[instance.pk])
+
+
+@receiver(flights_deleted)
+def drop_flight_loads(sender, flight_ids, **kwargs):
+    enqueue_on_commit(refresh_flights, flight_ids=flight_ids)
+
+
+@receiver(post_save, sender=Airplane)
+def update_airplane_flight_loads(sender, instance, created, **kwargs):
+    if not created:
+        enqueue_on_commit(refresh_airplane_flights, airplane_id=instance.pk)
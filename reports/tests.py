@@ -0,0 +1,332 @@
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from air_service.models import (
+    Airplane,
+    AirplaneType,
+    Airport,
+    City,
+    Country,
+    Flight,
+    Order,
+    Route,
+    Ticket,
+)
+from jobs.models import Job
+from jobs.tasks import enqueue
+from jobs.worker import run_pending
+from reports.models import FlightLoad, RouteDailyLoad, AirplaneTypeDailyLoad
+from reports.services import apply_seat_events, refresh_flights
+
+ORDER_LIST_URL = reverse("air_service:order-list")
+ROUTE_REPORT_URL = reverse("reports:routedailyload-list")
+
+
+class ReportsTestCase(TestCase):
+    def setUp(self):
+        # The test transaction never commits, assign feed positions on
+        # insert instead.
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SET CONSTRAINTS air_service_seat_event_position IMMEDIATE"
+            )
+        self.user = get_user_model().objects.create_user(
+            username="testuser", password="password123", is_staff=True
+        )
+        country = Country.objects.create(country_name="Ukraine")
+        city = City.objects.create(city_name="Kyiv", country=country)
+        source = Airport.objects.create(airport_name="Kyiv", city=city)
+        destination = Airport.objects.create(airport_name="Lviv", city=city)
+        self.route = Route.objects.create(
+            source=source, destination=destination, distance=500
+        )
+        self.airplane_type = AirplaneType.objects.create(type_name="A320")
+        airplane = Airplane.objects.create(
+            airplane_name="Airplane1",
+            rows=5,
+            seats_in_row=2,
+            airplane_type=self.airplane_type,
+        )
+        with self.run_jobs_on_commit():
+            self.flight1 = Flight.objects.create(
+                route=self.route,
+                airplane=airplane,
+                departure_datetime=datetime(
+                    2025, 12, 10, 8, 0, tzinfo=timezone.utc
+                ),
+                arrival_datetime=datetime(
+                    2025, 12, 10, 9, 0, tzinfo=timezone.utc
+                ),
+            )
+            self.flight2 = Flight.objects.create(
+                route=self.route,
+                airplane=airplane,
+                departure_datetime=datetime(
+                    2025, 12, 10, 18, 0, tzinfo=timezone.utc
+                ),
+                arrival_datetime=datetime(
+                    2025, 12, 10, 19, 0, tzinfo=timezone.utc
+                ),
+            )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    @contextmanager
+    def run_jobs_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            yield
+        run_pending()
+
+    def create_order(self, tickets):
+        with self.run_jobs_on_commit():
+            response = self.client.post(
+                ORDER_LIST_URL,
+                {"tickets": tickets},
+                format="json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response.data["id"]
+
+    def test_new_flights_have_empty_reports(self):
+        route_load = RouteDailyLoad.objects.get(route_id=self.route.id)
+        self.assertEqual(route_load.flights, 2)
+        self.assertEqual(route_load.capacity, 20)
+        self.assertEqual(route_load.seats_sold, 0)
+
+    def test_order_create_updates_reports(self):
+        self.create_order([
+            {"seat_row": 1, "seat_number": 1, "flight": self.flight1.id},
+            {"seat_row": 1, "seat_number": 2, "flight": self.flight1.id},
+            {"seat_row": 1, "seat_number": 1, "flight": self.flight2.id},
+        ])
+
+        self.assertEqual(
+            FlightLoad.objects.get(flight_id=self.flight1.id).seats_sold, 2
+        )
+        route_load = RouteDailyLoad.objects.get(route_id=self.route.id)
+        self.assertEqual(route_load.seats_sold, 3)
+        self.assertEqual(route_load.load_factor, 0.15)
+        type_load = AirplaneTypeDailyLoad.objects.get(
+            airplane_type_id=self.airplane_type.id
+        )
+        self.assertEqual(type_load.seats_sold, 3)
+
+    def test_booking_only_queues_the_report_update(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                ORDER_LIST_URL,
+                {"tickets": [
+                    {"seat_row": 1, "seat_number": 1,
+                     "flight": self.flight1.id},
+                ]},
+                format="json"
+            )
+        self.assertEqual(
+            FlightLoad.objects.get(flight_id=self.flight1.id).seats_sold, 0
+        )
+        self.assertEqual(
+            list(Job.objects.values_list("task", flat=True)),
+            ["reports.services.apply_seat_events"]
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            self.assertEqual(run_pending(), 1)
+        for query in context.captured_queries:
+            self.assertNotIn('"air_service_ticket"', query["sql"])
+            self.assertNotIn('"air_service_flight"', query["sql"])
+        self.assertEqual(
+            FlightLoad.objects.get(flight_id=self.flight1.id).seats_sold, 1
+        )
+
+    def test_report_jobs_in_any_order_count_each_seat_once(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                ORDER_LIST_URL,
+                {"tickets": [
+                    {"seat_row": 1, "seat_number": 1,
+                     "flight": self.flight1.id},
+                ]},
+                format="json"
+            )
+            self.flight1.save()
+        # The flight refresh runs first, then the booking job twice as if
+        # it had been retried.
+        booking_job = Job.objects.get(
+            task="reports.services.apply_seat_events"
+        )
+        flight_job = Job.objects.get(task="reports.services.refresh_flights")
+        Job.objects.filter(pk=flight_job.pk).update(run_at=booking_job.run_at)
+        Job.objects.filter(pk=booking_job.pk).update(
+            run_at=booking_job.run_at + timedelta(seconds=1)
+        )
+        run_pending()
+        enqueue(apply_seat_events, **booking_job.kwargs)
+        run_pending()
+
+        self.assertEqual(
+            FlightLoad.objects.get(flight_id=self.flight1.id).seats_sold, 1
+        )
+        route_load = RouteDailyLoad.objects.get(route_id=self.route.id)
+        self.assertEqual(route_load.seats_sold, 1)
+
+    def test_order_update_and_delete_update_reports(self):
+        order_id = self.create_order([
+            {"seat_row": 1, "seat_number": 1, "flight": self.flight1.id},
+        ])
+        url = reverse("air_service:order-detail", args=[order_id])
+
+        with self.run_jobs_on_commit():
+            self.client.put(
+                url,
+                {"tickets": [
+                    {"seat_row": 1, "seat_number": 1,
+                     "flight": self.flight2.id},
+                ]},
+                format="json"
+            )
+        self.assertEqual(
+            FlightLoad.objects.get(flight_id=self.flight1.id).seats_sold, 0
+        )
+        self.assertEqual(
+            FlightLoad.objects.get(flight_id=self.flight2.id).seats_sold, 1
+        )
+
+        with self.run_jobs_on_commit():
+            self.client.delete(url)
+        route_load = RouteDailyLoad.objects.get(route_id=self.route.id)
+        self.assertEqual(route_load.seats_sold, 0)
+
+    def test_deleting_a_user_updates_reports(self):
+        self.create_order([
+            {"seat_row": 1, "seat_number": 1, "flight": self.flight1.id},
+            {"seat_row": 1, "seat_number": 1, "flight": self.flight2.id},
+        ])
+        with self.run_jobs_on_commit():
+            self.user.delete()
+        self.assertEqual(
+            list(FlightLoad.objects.values_list("seats_sold", flat=True)),
+            [0, 0],
+        )
+        route_load = RouteDailyLoad.objects.get(route_id=self.route.id)
+        self.assertEqual(route_load.seats_sold, 0)
+
+    def test_flight_delete_removes_its_report(self):
+        with self.run_jobs_on_commit():
+            self.flight2.delete()
+        self.assertFalse(
+            FlightLoad.objects.filter(flight_id=self.flight2.id).exists()
+        )
+        route_load = RouteDailyLoad.objects.get(route_id=self.route.id)
+        self.assertEqual(route_load.flights, 1)
+
+    def test_rebuild_matches_incremental_updates(self):
+        self.create_order([
+            {"seat_row": 2, "seat_number": 3, "flight": self.flight1.id},
+        ])
+        incremental = list(
+            RouteDailyLoad.objects.values("flights", "capacity", "seats_sold")
+        )
+        call_command("rebuild_reports", stdout=StringIO())
+        self.assertEqual(
+            list(
+                RouteDailyLoad.objects.values(
+                    "flights", "capacity", "seats_sold"
+                )
+            ),
+            incremental
+        )
+
+    def test_reports_are_admin_only(self):
+        client = APIClient()
+        client.force_authenticate(
+            user=get_user_model().objects.create_user(
+                username="passenger", password="password123"
+            )
+        )
+        response = client.get(ROUTE_REPORT_URL)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        response = self.client.get(
+            ROUTE_REPORT_URL,
+            {"date_from": "2025-12-10", "date_to": "2025-12-10"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(
+            response.data["results"][0]["route_name"],
+            "Kyiv - Lviv"
+        )
+
+
+class ConcurrentReportJobsTestCase(TransactionTestCase):
+    def test_jobs_for_one_route_and_day_keep_both_flights(self):
+        country = Country.objects.create(country_name="Ukraine")
+        city = City.objects.create(city_name="Kyiv", country=country)
+        route = Route.objects.create(
+            source=Airport.objects.create(airport_name="Kyiv", city=city),
+            destination=Airport.objects.create(
+                airport_name="Lviv", city=city
+            ),
+            distance=500,
+        )
+        airplane = Airplane.objects.create(
+            airplane_name="Airplane1",
+            rows=5,
+            seats_in_row=2,
+            airplane_type=AirplaneType.objects.create(type_name="A320"),
+        )
+        flights = [
+            Flight.objects.create(
+                route=route,
+                airplane=airplane,
+                departure_datetime=datetime(
+                    2025, 12, 10, hour, tzinfo=timezone.utc
+                ),
+                arrival_datetime=datetime(
+                    2025, 12, 10, hour + 1, tzinfo=timezone.utc
+                ),
+            )
+            for hour in (8, 18)
+        ]
+        refresh_flights([flight.id for flight in flights])
+        order = Order.objects.create(
+            user=get_user_model().objects.create_user(
+                username="passenger", password="password123"
+            )
+        )
+        for flight in flights:
+            Ticket.objects.create(
+                order=order, flight=flight, seat_row=1, seat_number=1
+            )
+
+        def other_job():
+            try:
+                refresh_flights([flights[1].id])
+            finally:
+                connection.close()
+
+        with transaction.atomic():
+            refresh_flights([flights[0].id])
+            thread = threading.Thread(target=other_job)
+            thread.start()
+            # The other job waits for this one to commit.
+            thread.join(timeout=1)
+            self.assertTrue(thread.is_alive())
+        thread.join(timeout=10)
+
+        route_load = RouteDailyLoad.objects.get(route_id=route.id)
+        self.assertEqual(route_load.flights, 2)
+        self.assertEqual(route_load.seats_sold, 2)
+        type_load = AirplaneTypeDailyLoad.objects.get()
+        self.assertEqual(type_load.seats_sold, 2)
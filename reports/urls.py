@@ -0,0 +1,16 @@
+from django.urls import path, include
+from rest_framework import routers
+
+from reports import views
+
+router = routers.DefaultRouter()
+router.register(r"flights", views.FlightLoadViewSet)
+router.register(r"routes", views.RouteDailyLoadViewSet)
+router.register(r"airplane-types", views.AirplaneTypeDailyLoadViewSet)
+
+
+urlpatterns = [
+    path("", include(router.urls)),
+]
+
+app_name = "reports"
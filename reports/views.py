@@ -0,0 +1,102 @@
+from drf_spectacular.utils import extend_schema, OpenApiParameter
+from rest_framework import viewsets, permissions
+
+from reports.models import FlightLoad, RouteDailyLoad, AirplaneTypeDailyLoad
+from reports.serializers import (
+    FlightLoadSerializer,
+    RouteDailyLoadSerializer,
+    AirplaneTypeDailyLoadSerializer,
+)
+
+DATE_PARAMETERS = [
+    OpenApiParameter(
+        "date_from",
+        type={"type": "date"},
+        description="Filter from date (inclusive)",
+        default="2025-01-01"
+    ),
+    OpenApiParameter(
+        "date_to",
+        type={"type": "date"},
+        description="Filter to date (inclusive)",
+        default="2025-12-31"
+    ),
+]
+
+
+class ReportViewSet(viewsets.ReadOnlyModelViewSet):
+    permission_classes = (permissions.IsAdminUser,)
+    date_field = "date"
+    key_field = None
+
+    def get_queryset(self):
+        queryset = self.queryset
+        date_from = self.request.query_params.get("date_from")
+        date_to = self.request.query_params.get("date_to")
+        key = self.request.query_params.get(self.key_field)
+        if date_from:
+            queryset = queryset.filter(
+                **{f"{self.date_field}__gte": date_from}
+            )
+        if date_to:
+            queryset = queryset.filter(
+                **{f"{self.date_field}__lte": date_to}
+            )
+        if key:
+            queryset = queryset.filter(**{self.key_field: key})
+        return queryset
+
+
+class FlightLoadViewSet(ReportViewSet):
+    queryset = FlightLoad.objects.all()
+    serializer_class = FlightLoadSerializer
+    date_field = "departure_date"
+    key_field = "route_id"
+
+    @extend_schema(
+        parameters=DATE_PARAMETERS + [
+            OpenApiParameter(
+                "route_id",
+                type={"type": "integer"},
+                description="Filter by route id"
+            ),
+        ]
+    )
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+
+class RouteDailyLoadViewSet(ReportViewSet):
+    queryset = RouteDailyLoad.objects.all()
+    serializer_class = RouteDailyLoadSerializer
+    key_field = "route_id"
+
+    @extend_schema(
+        parameters=DATE_PARAMETERS + [
+            OpenApiParameter(
+                "route_id",
+                type={"type": "integer"},
+                description="Filter by route id"
+            ),
+        ]
+    )
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+
+class AirplaneTypeDailyLoadViewSet(ReportViewSet):
+    queryset = AirplaneTypeDailyLoad.objects.all()
+    serializer_class = AirplaneTypeDailyLoadSerializer
+    key_field = "airplane_type_id"
+
+    @extend_schema(
+        parameters=DATE_PARAMETERS + [
+            OpenApiParameter(
+                "airplane_type_id",
+                type={"type": "integer"},
+                description="Filter by airplane type id"
+            ),
+        ]
+    )
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class UserConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "user"
+
+    def ready(self):
+        import user.signals  # noqa: F401
+
+        # Production installs drf_spectacular only with the API docs on.
+        if self.apps.is_installed("drf_spectacular"):
+            import user.schema  # noqa: F401
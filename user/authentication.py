@@ -0,0 +1,123 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import router
+from django.utils.translation import gettext_lazy as _
+from rest_framework import authentication, exceptions
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+
+# What authentication and permission checks read. The rest of the user,
+# the password hash above all, stays out of the cache and is deferred.
+CACHED_USER_FIELDS = ("id", "is_active", "is_staff", "is_superuser")
+
+
+def user_cache_key(user_id) -> str:
+    return f"auth_user_{user_id}"
+
+
+def token_cache_key(key: str) -> str:
+    return f"auth_token_{key}"
+
+
+def cache_user(user) -> dict:
+    data = {name: getattr(user, name) for name in CACHED_USER_FIELDS}
+    # Tokens carry the same digest, it is needed to spot revoked ones.
+    data["password_digest"] = get_md5_hash_password(user.password)
+    cache.set(
+        user_cache_key(user.pk), data, settings.AUTH_USER_CACHE_TIMEOUT
+    )
+    return data
+
+
+def get_cached_user_data(user_id):
+    """
+    The cached fields of the user and its password digest, loaded and
+    cached on a miss. None when the user doesn't exist.
+    """
+    data = cache.get(user_cache_key(user_id))
+    if data is None:
+        user = get_user_model().objects.filter(pk=user_id).first()
+        if user is None:
+            return None
+        data = cache_user(user)
+    return data
+
+
+def user_from_cache(data):
+    """A user instance with only the cached fields loaded."""
+    model = get_user_model()
+    field_names = [
+        field.attname
+        for field in model._meta.concrete_fields
+        if field.attname in CACHED_USER_FIELDS
+    ]
+    return model.from_db(
+        router.db_for_read(model),
+        field_names,
+        [data[name] for name in field_names],
+    )
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that resolves the user from the cache.
+
+    Cached users are dropped by the signal handlers in `user.signals`
+    whenever they are saved or deleted.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(jwt_settings.USER_ID_CLAIM)
+        data = cache.get(user_cache_key(user_id))
+        if data is None:
+            user = super().get_user(validated_token)
+            cache_user(user)
+            return user
+
+        if jwt_settings.CHECK_USER_IS_ACTIVE and not data["is_active"]:
+            raise exceptions.AuthenticationFailed(
+                _("User is inactive"), code="user_inactive"
+            )
+        if jwt_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(
+                jwt_settings.REVOKE_TOKEN_CLAIM
+            ) != data["password_digest"]:
+                raise exceptions.AuthenticationFailed(
+                    _("The user's password has been changed."),
+                    code="password_changed"
+                )
+        return user_from_cache(data)
+
+
+class CachedTokenAuthentication(authentication.TokenAuthentication):
+    """
+    Token authentication that caches the token key -> user id mapping
+    and resolves the user from the cache.
+
+    Cached tokens are dropped by the signal handlers in `user.signals`
+    when the token is deleted.
+    """
+
+    def authenticate_credentials(self, key):
+        user_id = cache.get(token_cache_key(key))
+        if user_id is None:
+            user, token = super().authenticate_credentials(key)
+            cache.set(
+                token_cache_key(key),
+                user.pk,
+                settings.AUTH_USER_CACHE_TIMEOUT
+            )
+            cache_user(user)
+            return user, token
+
+        data = get_cached_user_data(user_id)
+        if data is None or not data["is_active"]:
+            raise exceptions.AuthenticationFailed(
+                _("User inactive or deleted.")
+            )
+        user = user_from_cache(data)
+        token = self.get_model()(key=key, user=user)
+        return user, token
@@ -0,0 +1,204 @@
+import asyncio
+import os
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    PBKDF2PasswordHasher,
+    check_password,
+    make_password,
+)
+
+
+class PasswordHashingUnavailable(Exception):
+    """
+    Raised when the pool is saturated. Hashing runs outside DRF as well,
+    in the admin login for one, so `PasswordHashingUnavailableMiddleware`
+    turns it into a 503.
+    """
+
+    detail = "Too many password checks in progress, try again later."
+
+
+class PasswordHashingPool:
+    """
+    Bounded thread pool that runs password hashing off the request thread.
+
+    At most `max_workers` hashes run at once and at most `max_queue` more
+    wait for a free thread. Both hold their request thread, so callers
+    that find every slot taken are rejected with
+    `PasswordHashingUnavailable` at once instead of waiting as well.
+    Async callers hold no thread while they wait, they get up to `timeout`
+    seconds for a slot.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int, timeout: float = 0):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="password-hashing",
+        )
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # asyncio semaphores belong to one event loop.
+        self._async_slots = weakref.WeakKeyDictionary()
+        self._in_flight = 0
+        self._submitted = 0
+        self._completed = 0
+        self._rejected = 0
+
+    def run(self, fn, *args):
+        if getattr(self._local, "active", False):
+            return fn(*args)
+        if not self._slots.acquire(blocking=False):
+            self._reject()
+        return self._submit(fn, *args).result()
+
+    async def arun(self, fn, *args):
+        """`run` for async callers, `fn` runs on the same executor."""
+        slots = self._loop_slots()
+        if slots.locked():
+            try:
+                await asyncio.wait_for(slots.acquire(), self.timeout)
+            except asyncio.TimeoutError:
+                self._reject()
+        else:
+            await slots.acquire()
+        try:
+            if not self._slots.acquire(blocking=False):
+                self._reject()
+            self._start()
+            try:
+                return await asyncio.get_running_loop().run_in_executor(
+                    self._executor, self._call, fn, *args
+                )
+            finally:
+                self._release()
+        finally:
+            slots.release()
+
+    def stats(self) -> dict:
+        with self._lock:
+            in_flight = self._in_flight
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "running": min(in_flight, self.max_workers),
+                "queued": max(in_flight - self.max_workers, 0),
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "saturation": in_flight / (self.max_workers + self.max_queue),
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+    def _loop_slots(self):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if loop not in self._async_slots:
+                self._async_slots[loop] = asyncio.Semaphore(
+                    self.max_workers + self.max_queue
+                )
+            return self._async_slots[loop]
+
+    def _start(self):
+        with self._lock:
+            self._submitted += 1
+            self._in_flight += 1
+
+    def _submit(self, fn, *args):
+        self._start()
+        try:
+            future = self._executor.submit(self._call, fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    def _call(self, fn, *args):
+        self._local.active = True
+        try:
+            return fn(*args)
+        finally:
+            self._local.active = False
+
+    def _release(self, future=None):
+        with self._lock:
+            self._in_flight -= 1
+            self._completed += 1
+        self._slots.release()
+
+    def _reject(self):
+        with self._lock:
+            self._rejected += 1
+        raise PasswordHashingUnavailable()
+
+
+def pool_limits() -> tuple:
+    """
+    MAX_WORKERS and MAX_QUEUE of PASSWORD_HASHING_POOL, cut down to half of
+    the SERVER_THREADS of a worker so the other half keeps serving during a
+    burst of logins. A single-threaded worker hashes on its one thread
+    either way.
+    """
+    config = settings.PASSWORD_HASHING_POOL
+    slots = max(settings.SERVER_THREADS // 2, 1)
+    max_workers = min(config["MAX_WORKERS"], slots)
+    return max_workers, min(config["MAX_QUEUE"], slots - max_workers)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> PasswordHashingPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                max_workers, max_queue = pool_limits()
+                _pool = PasswordHashingPool(
+                    max_workers=max_workers,
+                    max_queue=max_queue,
+                    timeout=settings.PASSWORD_HASHING_POOL["TIMEOUT"],
+                )
+    return _pool
+
+
+def _reset_pool():
+    # Pool threads don't survive fork(), so each worker builds its own.
+    global _pool
+    _pool = None
+
+
+os.register_at_fork(after_in_child=_reset_pool)
+
+
+class PooledPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2 hasher that derives keys in the password hashing pool.
+
+    Uses the same algorithm name as `PBKDF2PasswordHasher`, so existing
+    password hashes stay valid.
+    """
+
+    def encode(self, password, salt, iterations=None):
+        return get_pool().run(super().encode, password, salt, iterations)
+
+
+async def amake_password(password):
+    """Hash a password from async code without blocking the event loop."""
+    return await get_pool().arun(make_password, password)
+
+
+async def acheck_password(password, encoded):
+    """Check a password from async code without blocking the event loop."""
+    return await get_pool().arun(check_password, password, encoded)
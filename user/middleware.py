@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.http import JsonResponse
+from django.utils.deprecation import MiddlewareMixin
+
+from user.hashing import PasswordHashingUnavailable
+
+
+class PasswordHashingUnavailableMiddleware(MiddlewareMixin):
+    """
+    Answer 503 when the password hashing pool turns a caller away,
+    whichever view was checking the password.
+    """
+
+    def process_exception(self, request, exception):
+        if not isinstance(exception, PasswordHashingUnavailable):
+            return None
+        response = JsonResponse({"detail": exception.detail}, status=503)
+        response["Retry-After"] = max(
+            round(settings.PASSWORD_HASHING_POOL["TIMEOUT"]), 1
+        )
+        return response
@@ -1,3 +1,269 @@
-from django.test import TestCase
+import asyncio
+import sys
+import threading
+from unittest import mock
 
-# Create your tests here.
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, check_password
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from drf_spectacular.generators import SchemaGenerator
+from rest_framework import exceptions, status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from user.authentication import (
+    CachedJWTAuthentication,
+    CachedTokenAuthentication,
+    jwt_settings,
+    user_cache_key,
+)
+from user.hashing import (
+    PasswordHashingPool,
+    PasswordHashingUnavailable,
+    PooledPBKDF2PasswordHasher,
+    acheck_password,
+    amake_password,
+    pool_limits,
+)
+
+
+class CachedAuthenticationTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = APIRequestFactory()
+        self.user = get_user_model().objects.create_user(
+            username="testuser", password="password123"
+        )
+
+    def jwt_request(self):
+        token = AccessToken.for_user(self.user)
+        return self.factory.get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def token_request(self, token):
+        return self.factory.get(
+            "/",
+            HTTP_AUTHORIZATION=f"Token {token.key}"
+        )
+
+    def test_jwt_user_is_resolved_from_cache(self):
+        authentication = CachedJWTAuthentication()
+        with self.assertNumQueries(1):
+            user, _ = authentication.authenticate(self.jwt_request())
+        with self.assertNumQueries(0):
+            cached_user, _ = authentication.authenticate(self.jwt_request())
+        self.assertEqual(cached_user.pk, user.pk)
+
+    def test_cached_user_leaves_out_the_password_hash(self):
+        authentication = CachedJWTAuthentication()
+        authentication.authenticate(self.jwt_request())
+
+        cached = cache.get(user_cache_key(self.user.pk))
+        self.assertNotIn("password", cached)
+        self.assertNotIn(self.user.password, cached.values())
+        with self.assertNumQueries(0):
+            user, _ = authentication.authenticate(self.jwt_request())
+        self.assertTrue(user.is_active)
+        self.assertIn("password", user.get_deferred_fields())
+
+    def test_cached_user_rejects_tokens_of_an_old_password(self):
+        old_token = AccessToken.for_user(self.user)
+        old_token[jwt_settings.REVOKE_TOKEN_CLAIM] = get_md5_hash_password(
+            self.user.password
+        )
+        self.user.set_password("password456")
+        self.user.save()
+        authentication = CachedJWTAuthentication()
+        authentication.authenticate(self.jwt_request())
+
+        request = self.factory.get(
+            "/", HTTP_AUTHORIZATION=f"Bearer {old_token}"
+        )
+        with mock.patch.object(jwt_settings, "CHECK_REVOKE_TOKEN", True):
+            with self.assertNumQueries(0):
+                with self.assertRaises(exceptions.AuthenticationFailed):
+                    authentication.authenticate(request)
+
+    def test_jwt_scheme_is_documented(self):
+        schema = SchemaGenerator().get_schema(request=None, public=True)
+        self.assertIn("jwtAuth", schema["components"]["securitySchemes"])
+
+    def test_jwt_deactivated_user_is_rejected(self):
+        authentication = CachedJWTAuthentication()
+        authentication.authenticate(self.jwt_request())
+
+        self.user.is_active = False
+        self.user.save()
+
+        with self.assertRaises(exceptions.AuthenticationFailed):
+            authentication.authenticate(self.jwt_request())
+
+    def test_token_user_is_resolved_from_cache(self):
+        token = Token.objects.create(user=self.user)
+        authentication = CachedTokenAuthentication()
+        with self.assertNumQueries(1):
+            authentication.authenticate(self.token_request(token))
+        with self.assertNumQueries(0):
+            user, auth = authentication.authenticate(
+                self.token_request(token)
+            )
+        self.assertEqual(user.pk, self.user.pk)
+        self.assertEqual(auth.key, token.key)
+
+    def test_deleted_token_is_rejected(self):
+        token = Token.objects.create(user=self.user)
+        authentication = CachedTokenAuthentication()
+        authentication.authenticate(self.token_request(token))
+
+        token.delete()
+
+        with self.assertRaises(exceptions.AuthenticationFailed):
+            authentication.authenticate(self.token_request(token))
+
+    def test_user_update_refreshes_cached_user(self):
+        authentication = CachedJWTAuthentication()
+        authentication.authenticate(self.jwt_request())
+
+        self.user.is_staff = True
+        self.user.save()
+
+        user, _ = authentication.authenticate(self.jwt_request())
+        self.assertTrue(user.is_staff)
+
+
+class UserConfigTestCase(SimpleTestCase):
+    def test_schema_extension_needs_drf_spectacular(self):
+        # A None entry makes importing the module fail.
+        with mock.patch.dict(sys.modules, {"user.schema": None}):
+            with mock.patch.object(apps, "is_installed", return_value=False):
+                apps.get_app_config("user").ready()
+
+
+class PasswordHashingPoolTestCase(SimpleTestCase):
+    def setUp(self):
+        self.pool = PasswordHashingPool(max_workers=1, max_queue=0)
+        self.addCleanup(self.pool.shutdown)
+
+    def test_pooled_hashes_are_compatible_with_pbkdf2(self):
+        encoded = PooledPBKDF2PasswordHasher().encode("secret", "salt", 1000)
+        self.assertTrue(PBKDF2PasswordHasher().verify("secret", encoded))
+
+    def test_saturated_pool_rejects_callers(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def block():
+            started.set()
+            release.wait()
+
+        worker = threading.Thread(target=self.pool.run, args=(block,))
+        worker.start()
+        started.wait()
+        try:
+            with self.assertRaises(PasswordHashingUnavailable):
+                self.pool.run(lambda: None)
+            stats = self.pool.stats()
+            self.assertEqual(stats["running"], 1)
+            self.assertEqual(stats["rejected"], 1)
+            self.assertEqual(stats["saturation"], 1)
+        finally:
+            release.set()
+            worker.join()
+
+    async def test_async_hashes_are_compatible(self):
+        encoded = await amake_password("secret")
+        self.assertTrue(check_password("secret", encoded))
+        self.assertTrue(await acheck_password("secret", encoded))
+        self.assertFalse(await acheck_password("wrong", encoded))
+
+    async def test_async_callers_wait_for_a_slot(self):
+        self.pool.timeout = 5
+        release = threading.Event()
+        first = asyncio.create_task(self.pool.arun(release.wait))
+        second = asyncio.create_task(self.pool.arun(lambda: "hashed"))
+        await asyncio.sleep(0.05)
+        self.assertFalse(second.done())
+
+        release.set()
+        self.assertEqual(await second, "hashed")
+        await first
+        self.assertEqual(self.pool.stats()["completed"], 2)
+
+    async def test_async_callers_are_rejected_after_the_timeout(self):
+        self.pool.timeout = 0.05
+        release = threading.Event()
+        first = asyncio.create_task(self.pool.arun(release.wait))
+        await asyncio.sleep(0)
+        try:
+            with self.assertRaises(PasswordHashingUnavailable):
+                await self.pool.arun(lambda: None)
+            self.assertEqual(self.pool.stats()["rejected"], 1)
+        finally:
+            release.set()
+            await first
+
+    def test_pool_leaves_request_threads_free(self):
+        for threads in (2, 3, 8, 16, 64):
+            with self.subTest(GUNICORN_THREADS=threads):
+                with override_settings(SERVER_THREADS=threads):
+                    max_workers, max_queue = pool_limits()
+                self.assertGreaterEqual(max_workers, 1)
+                self.assertLessEqual(max_workers + max_queue, threads // 2)
+
+        # A sync worker has to hash on its only thread.
+        with override_settings(SERVER_THREADS=1):
+            self.assertEqual(pool_limits(), (1, 0))
+
+
+class PasswordHashingUnavailableTestCase(TestCase):
+    def setUp(self):
+        get_user_model().objects.create_superuser(
+            username="admin", password="password123"
+        )
+        saturated = mock.patch.object(
+            PasswordHashingPool, "run", side_effect=PasswordHashingUnavailable
+        )
+        saturated.start()
+        self.addCleanup(saturated.stop)
+
+    def test_admin_login_answers_503(self):
+        response = self.client.post(
+            reverse("admin:login"),
+            {"username": "admin", "password": "password123"},
+        )
+        self.assertEqual(
+            response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+        self.assertEqual(response["Retry-After"], "2")
+
+    def test_api_login_answers_503(self):
+        response = APIClient().post(
+            reverse("user:token_obtain_pair"),
+            {"username": "admin", "password": "password123"},
+        )
+        self.assertEqual(
+            response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+        self.assertIn("try again later", response.json()["detail"])
+
+
+class PasswordHashingStatsViewTestCase(TestCase):
+    def test_stats_are_admin_only(self):
+        url = reverse("user:hashing_stats")
+        client = APIClient()
+        user = get_user_model().objects.create_user(
+            username="testuser", password="password123"
+        )
+        client.force_authenticate(user=user)
+        response = client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        user.is_staff = True
+        user.save()
+        response = client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("saturation", response.data)
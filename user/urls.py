@@ -5,7 +5,11 @@ from rest_framework_simplejwt.views import (
     TokenVerifyView
 )
 
-from user.views import UserCreateView, ManageUserView
+from user.views import (
+    UserCreateView,
+    ManageUserView,
+    PasswordHashingStatsView
+)
 
 urlpatterns = [
     path("register/", UserCreateView.as_view(), name="create"),
@@ -13,6 +17,11 @@ urlpatterns = [
     path("token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
     path("token/verify/", TokenVerifyView.as_view(), name="token_verify"),
     path("profile/", ManageUserView.as_view(), name="manage_user"),
+    path(
+        "hashing-stats/",
+        PasswordHashingStatsView.as_view(),
+        name="hashing_stats"
+    ),
 ]
 
 app_name = "user"
@@ -1,8 +1,12 @@
+from django.contrib.auth import get_user_model
 from rest_framework import generics, authentication, permissions
 from rest_framework.authtoken.serializers import AuthTokenSerializer
 from rest_framework.authtoken.views import ObtainAuthToken
+from rest_framework.response import Response
 from rest_framework.settings import api_settings
+from rest_framework.views import APIView
 
+from user.hashing import get_pool
 from user.serializer import UserSerializer
 
 
@@ -21,4 +25,13 @@ class ManageUserView(generics.RetrieveUpdateAPIView):
     permission_classes = (permissions.IsAuthenticated,)
 
     def get_object(self):
-        return self.request.user
+        # The authenticated user may come from the cache with most of its
+        # fields deferred, edit the full row instead.
+        return get_user_model().objects.get(pk=self.request.user.pk)
+
+
+class PasswordHashingStatsView(APIView):
+    permission_classes = (permissions.IsAdminUser,)
+
+    def get(self, request):
+        return Response(get_pool().stats())